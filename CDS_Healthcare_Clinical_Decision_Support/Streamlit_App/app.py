@@ -1,15 +1,20 @@
-import streamlit as st
-import pandas as pd
-import altair as alt
 import time
-import json
-import re
-from datetime import datetime
-from snowflake.snowpark.context import get_active_session
+
+# Startup profiler - everything below is timed from here
+SCRIPT_STARTED = time.perf_counter()
+
+import base64
+import os
+import streamlit as st
+
+# Header logo - bundled in the app's images folder, so the header makes no remote request
+LOGO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images", "fivetran_logo.png")
+with open(LOGO_PATH, "rb") as logo_file:
+    LOGO_DATA_URI = "data:image/png;base64," + base64.b64encode(logo_file.read()).decode()
 
 st.set_page_config(
     page_title="medmind_–_ai_driven_clinical_decision_support",
-    page_icon="https://i.imgur.com/Og6gFnB.png",
+    page_icon=LOGO_PATH,
     layout="wide",
     initial_sidebar_state="expanded"
 )
@@ -53,7 +58,7 @@ solution_content = '''Solution 1: MedMind – AI-driven Clinical Decision Suppor
 # Display logo and title inline
 st.markdown(f'''
 <div style="display:flex; align-items:center; margin-bottom:15px">
-    <img src="https://i.imgur.com/Og6gFnB.png" width="100" style="margin-right:15px">
+    <img src="{LOGO_DATA_URI}" width="100" style="margin-right:15px">
     <div>
         <h1 style="font-size:2.2rem; margin:0; padding:0">{solution_name_clean.replace('_', ' ').title()}</h1>
         <p style="font-size:1.1rem; color:gray; margin:0; padding:0">Fivetran and Cortex-powered Streamlit in Snowflake data application for Healthcare</p>
@@ -61,6 +66,19 @@ st.markdown(f'''
 </div>
 ''', unsafe_allow_html=True)
 
+# The header is drawn before pandas, altair and Snowpark are imported
+FIRST_PAINT_SECONDS = time.perf_counter() - SCRIPT_STARTED
+
+import pandas as pd
+import altair as alt
+from snowflake.snowpark.context import get_active_session
+
+IMPORT_SECONDS = time.perf_counter() - SCRIPT_STARTED - FIRST_PAINT_SECONDS
+
+# Startup profile - recorded once per browser session
+if 'startup_profile' not in st.session_state:
+    st.session_state.startup_profile = {"imports": IMPORT_SECONDS, "first_paint": FIRST_PAINT_SECONDS, "full_run": None}
+
 # Define available models as strings
 MODELS = [
     "claude-4-sonnet", "claude-3-7-sonnet", "claude-3-5-sonnet", "llama3.1-8b", "llama3.1-70b", "llama4-maverick", "llama4-scout", "llama3.2-1b", "snowflake-llama-3.1-405b", "snowflake-llama-3.3-70b", "mistral-large2", "mistral-7b", "deepseek-r1", "snowflake-arctic", "reka-flash", "jamba-instruct", "gemma-7b"
@@ -542,4 +560,12 @@ with tabs[3]:
     start = (page - 1) * rows_per_page
     end = min(start + rows_per_page, len(data))
     st.dataframe(data.iloc[start:end], use_container_width=True)
-    st.caption(f"Showing rows {start + 1}–{end} of {len(data)}")
\ No newline at end of file
+    st.caption(f"Showing rows {start + 1}–{end} of {len(data)}")
+
+# Startup profile - the first run of each browser session
+if st.session_state.startup_profile["full_run"] is None:
+    st.session_state.startup_profile["full_run"] = time.perf_counter() - SCRIPT_STARTED
+
+with st.sidebar.expander("⏱ Startup Profile"):
+    startup = st.session_state.startup_profile
+    st.caption(f"Imports {startup['imports']:.2f}s · first paint {startup['first_paint']:.2f}s · full run {startup['full_run']:.2f}s")
@@ -75,7 +75,7 @@ InsightEdge employs a sophisticated multi-agent architecture designed specifical
 
 1. **Agent Initialization** - User selects focus area and AI model, triggering specialized agent activation
 2. **Data Context Loading** - Agent accesses consumer feedback data, market research, and social media sentiment metrics
-3. **Step-by-Step Processing** - Agent executes sequential workflow steps with real-time progress visualization
+3. **Step-by-Step Processing** - Agent executes sequential workflow steps with real-time progress visualization. Each completed step shows what it measured and how long it took: the records in use, the metrics, categories and correlations summarised, the prompt size against its token budget, the model that answered, and the size of the report
 4. **Consumer Intelligence Integration** - Selected Snowflake Cortex model processes CPG context with specialized prompting
 5. **Results Compilation** - Agent generates comprehensive consumer insights analysis with actionable marketing recommendations
 6. **Report Delivery** - Professional CPG report delivered with implementation roadmap and success metrics
@@ -137,7 +137,67 @@ Each focus area includes:
 Access previously generated agent-driven insights for reference and comparison, including agent execution details and model selection.
 
 ### Data Explorer
-Explore the underlying data with pagination controls.
+Explore the full table directly in Snowflake. Pages are fetched with keyset pagination on `record_id`, with server-side filtering, sorting and column selection; the next page is prefetched and recently viewed pages are cached for the session. A filter on a numeric column needs a number; any other value shows an error instead of being ignored.
+
+### KPI Materialization
+Headline KPIs and category counts on the Metrics tab are read from `CPG_RECORDS_KPI_SUMMARY`, a summary table the app creates next to `CPG_RECORDS`. It is a dynamic table where the role is allowed to create one, otherwise a plain table. The app refreshes it only when the data version shows that a new sync has landed. A dynamic table refreshes incrementally. The plain table cannot: each refresh rebuilds it with `INSERT OVERWRITE`, a full scan of `CPG_RECORDS`. Grant the role `CREATE DYNAMIC TABLE` on the schema to avoid that cost on large tables.
+
+### Full-Table Statistics
+The Metrics tab ends with an expander of approximate statistics over the whole table, not just the 1,000-row sample. Quartiles come from `APPROX_PERCENTILE` (t-digest), distinct counts from `APPROX_COUNT_DISTINCT` (HyperLogLog) and top values from `APPROX_TOP_K` (space-saving). The error bound of each is shown next to the numbers. The same top values are added to the AI prompts.
+
+### Response Cache
+Cortex responses are cached by model and normalized prompt. The cache lives in memory and in `CPG_RECORDS_LLM_CACHE`, a table the app creates next to the source table. An entry expires after 24 hours, or as soon as a new sync changes the data snapshot. Repeating an analysis returns the cached report without a new Cortex call.
+
+### Generate All Focus Areas
+**⚡ Generate All Focus Areas** on the AI Insights tab starts the Cortex calls for all four focus areas at once, as Snowpark async jobs. Each report appears and is saved to Insights History as soon as its call finishes. A full report takes about as long as the slowest single call.
+
+### Segment Reports
+The AI Insights tab can also produce the selected focus area once for each of the top `product_category` values. All segment prompts go to `SNOWFLAKE.CORTEX.COMPLETE` in one set-based query over a `VALUES` list, so the warehouse runs them in parallel instead of the app making one round trip per segment.
+
+### Streaming Reports
+Tick **Stream the report as it is generated** before starting the agent to see the report appear token by token, rendered with `st.write_stream`. Live token streaming uses `snowflake.cortex.Complete(..., stream=True)`, so add the `snowflake-ml-python` package to the app. Without it, the app falls back to the SQL `COMPLETE` call and replays the answer progressively. In both cases the full report is saved to Insights History.
+
+### Prompt Budgeting
+Prompts are assembled from sections and compacted before they are sent to Cortex. The static solution context is deduplicated once and placed first, so every prompt shares the same prefix. Each model has a token budget of 3,000 tokens, which caps the input cost of a call. A model whose context window cannot hold that plus about 2,000 tokens for the report gets a smaller budget; `snowflake-arctic` (4,096-token window) gets 2,048. A typical prompt is about 1,500 to 1,900 tokens, so it is sent in full to every model, and trimming applies only to unusually large prompts. When a prompt is over budget, the lowest-value sections are summarized or dropped first: full-table statistics, then correlations, then solution context. Every report shows its estimated prompt token count and how many tokens were saved.
+
+### Model Routing
+Choose **auto (routed cascade)** in the model list to let the app pick the model. It starts with a small model (`llama3.1-8b` or `mistral-7b`). Financial and strategic analyses start at the 70B tier instead. Prompt size does not change the starting model, because each prompt is already fitted to the model's token budget. The app escalates to a larger model only when a report is too short, quotes no figures or misses most of the requested sections. Within a tier, models are ranked by their observed median latency. The per-model latency and token counts are listed under **Model Routing Stats**.
+
+### Ops View
+Every Cortex call adds one row to `CPG_RECORDS_LLM_TELEMETRY`: the model, focus area, call path (sql, stream, async or batch), cache hit, latency and estimated prompt and completion tokens. Rows are buffered in the session and written in batches of 20, or once a minute, with an asynchronous insert. The **🛠 Ops** tab shows p50/p95 latency, cache hit rate, errors and token totals per model and per focus area. The summary is read at most every 30 seconds and is otherwise served from the session; use **🔄 Refresh** to reload it sooner. Opening the tab does not wait for buffered rows to be written, so the latest calls appear on the next refresh. If the table cannot be created, the tab shows the current session's calls only.
+
+### Resilient Cortex Calls
+Each Cortex call has a 120 second deadline. Transient errors are retried up to twice with jittered backoff. Examples are throttling, timeouts and temporarily unavailable services. If a call takes longer than the model's observed p95 latency, the same prompt is also sent to the fastest small model. The first answer to arrive is used and the other query is cancelled. **Generate All Focus Areas** retries transient errors in the same way, and reports a focus area as failed when it passes the deadline. A streamed report must send its first words within 30 seconds and finish within the deadline. If the stream fails or stalls before any text is shown, the report is requested again through the SQL `COMPLETE` path, with its retries and hedging.
+
+### Semantic Cache
+When there is no exact cache match, the data part of the prompt is embedded with `SNOWFLAKE.CORTEX.EMBED_TEXT_768`. This covers the data summary, table sketch and correlations, but not the solution context and instructions, which are the same on every run. It is compared to the answers from the last hour for the same model and focus area, which are stored in `CPG_RECORDS_LLM_SEMANTIC_CACHE`. If the cosine similarity is above the threshold set on the AI Insights tab (default 0.97), the earlier answer is reused. The embedding is computed once per distinct data summary in the session and reused for the lookup and for storing the new answer, so most cache misses add no embedding call. The caption shows how old that answer is and whether it came from an earlier data snapshot. Set the threshold to 1.00 to turn the semantic cache off.
+
+### Downsampling
+Scatter charts draw every point up to 5,000 rows. Between 5,000 and 50,000 rows they show a stratified random sample. Every category keeps its share of the points, and each category keeps at least one. Above 50,000 rows the correlation charts on the Metrics tab switch to a 2D density heatmap. Quadrant views stay as sampled points so the quadrant colours are kept. Trend lines with more than 500 dates are reduced with Largest-Triangle-Three-Buckets (LTTB), which keeps peaks and dips. A caption under a chart says when sampling was applied.
+
+### Chart Spec Cache
+The Metrics tab charts are built once for each data snapshot. Their final Vega-Lite specs are kept in the session, keyed by snapshot and chart, with the title fixes already applied. Reruns caused by other widgets draw the stored specs with `st.vega_lite_chart` without rebuilding them. Examples are the Data Explorer slider and the focus area selector. The charts are rebuilt after a data sync changes the snapshot.
+
+### Persistent Insights History
+Every generated report is saved to `AI_INSIGHTS_HISTORY`, together with its vertical, focus area, model, timestamp and data snapshot. All verticals share this table. It is clustered on (vertical, focus, model, date), and full-text search optimization is enabled when the account supports it. The **Insights History** tab is searchable and filters by focus area and model. It loads one page of 10 reports at a time and pages with a keyset on the save time, so later pages cost no more than the first. Pages and match counts are cached for the session and refreshed when you save a report or click **🔄 Refresh**, which picks up reports saved by other sessions. Reports from earlier sessions stay available after a reload. If the table cannot be created, the tab shows the current session's reports only.
+
+### Local Deployment Sessions
+Inside Streamlit in Snowflake the app uses the active session. When you run it locally with `streamlit run`, it opens a pool of four Snowpark sessions from the `[connections.snowflake]` section of `.streamlit/secrets.toml`. The pool is opened once per server process. While it opens, it resumes the warehouse and runs the first render's queries to seed the result cache: the 1,000-row sample, the data version probe and the delta watermark. They are built by the same functions the app uses, so the text matches and the first render hits the cache. Independent queries run on separate sessions at the same time, such as a Data Explorer page and its row count. The **🛠 Ops** tab shows the pool size, the cold-start time (connect and warm-up) and the p50/p95 rerun latency.
+
+### Startup Profile
+The app draws its header first, and only then imports pandas, Altair, NumPy, Snowpark and the shared engine. Only the import order changed. Nothing is imported lazily: every tab runs on each rerun, so the first run still imports every module. The header is sent to the browser before those imports start, and its logo is read from `images/fivetran_logo.png` rather than fetched from a remote host. The **🛠 Ops** tab shows how long the first paint (header), the imports after it and the first full run took for this browser session.
+
+### Vertical Descriptor
+All the settings specific to this solution live in one `VERTICAL` dictionary near the top of `app_agent.py`. It holds the source table, the key metrics and categorical columns, the headline KPIs, the chart aggregates, the segment column, the per-focus-area analysis instructions, the insight labels and the agent step text. The data, caching, prompt and Cortex code is shared by every solution app and lives in `solution_engine.py` at the repository root. `app_agent.py` passes its descriptor to `configure(VERTICAL)`, and the engine reads these settings only from `VERTICAL`. The app itself keeps only the descriptor, the Metrics tab and the agent step narratives. To adapt the app to another table, edit the descriptor.
+
+### Data Version
+At most once a minute the app reads a data version for the source table: `MAX(_fivetran_synced)` and the row count. If the table has no `_fivetran_synced` column, it uses `MAX(last_updated_epoch)` instead. Snowflake answers both from table metadata, so the check does not scan the table. The resulting snapshot id keys every cache in the app: the loaded sample, the dataset profile, the KPI summary, the full-table sketches, the chart specs and the Cortex response caches. Data Explorer pages and row counts are cleared when it changes. Caches stay valid until the next sync lands and are refreshed after it.
+
+### Live Refresh
+A small background fragment above the tabs checks the data version once a minute, without rerunning the page. When a new sync lands, it reruns the app once. The sample, profile, KPI summary, sketches and charts are then rebuilt for the new snapshot. Generated reports and the insights history are not regenerated. The caption under the header shows the current snapshot and the time of the last check. Set `DATA_VERSION_AUTO_REFRESH = False` to turn the background check off. This needs Streamlit 1.37 or later, which you select in the Streamlit in Snowflake app settings.
+
+### Delta Loading
+After a sync, the app does not reload the 1,000-row sample. It fetches only the rows whose `last_updated_epoch` is at or after the table-wide watermark recorded at the last load, up to 5,000 rows. Rows at the watermark itself are read again, so rows committed later with the same `last_updated_epoch` are not missed. Only the newest version of each `record_id` is kept. It merges them into the cached sample by `record_id`: changed rows are replaced and new rows are added. The least recently updated rows are dropped to keep the sample at 1,000 rows. The dataset profile is updated from the same delta, without rescanning the sample. The app reloads the whole sample instead when the row count has dropped (rows were deleted), when the delta is larger than 5,000 rows, or when the table has no `last_updated_epoch` or `record_id` column.
 
 ## Setup Instructions
 
@@ -148,6 +208,8 @@ Explore the underlying data with pagination controls.
    - Name your application
    - **IMPORTANT:** Set the database context
    - **IMPORTANT:** Set the schema context
+5. Upload `solution_engine.py` from the repository root to the same stage folder as `app_agent.py`
+6. Upload `images/fivetran_logo.png` to an `images` folder next to `app_agent.py`; the header logo is loaded from that file
 
 ### Fivetran Data Movement Setup
 
@@ -1,72 +1,28 @@
-import streamlit as st
-import pandas as pd
-import altair as alt
 import time
-import json
-import re
-from datetime import datetime
-from snowflake.snowpark.context import get_active_session
+
+# Startup profiler - everything below is timed from here
+SCRIPT_STARTED = time.perf_counter()
+
+import base64
+import os
+import sys
+import streamlit as st
+
+# Script start - used to measure how long each rerun takes
+RUN_STARTED = time.time()
+
+# Header logo - bundled in the app's images folder, so the header makes no remote request
+LOGO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images", "fivetran_logo.png")
+with open(LOGO_PATH, "rb") as logo_file:
+    LOGO_DATA_URI = "data:image/png;base64," + base64.b64encode(logo_file.read()).decode()
 
 st.set_page_config(
     page_title="finmatch_–_ai_driven_financial_product_matching",
-    page_icon="https://i.imgur.com/Og6gFnB.png",
+    page_icon=LOGO_PATH,
     layout="wide",
     initial_sidebar_state="expanded"
 )
 
-# Add CSS for agent progress styling
-st.markdown("""
-<style>
-.agent-current {
-    background-color: #e3f2fd;
-    border-left: 4px solid #2196f3;
-    padding: 10px;
-    margin: 5px 0;
-    border-radius: 5px;
-    font-weight: 500;
-}
-
-.agent-completed {
-    background-color: #e8f5e8;
-    border-left: 4px solid #4caf50;
-    padding: 8px;
-    margin: 3px 0;
-    border-radius: 5px;
-    font-size: 0.9em;
-    color: #2e7d32;
-}
-
-.agent-container {
-    background-color: #f8f9fa;
-    padding: 15px;
-    border-radius: 10px;
-    margin: 10px 0;
-    border: 1px solid #e0e0e0;
-}
-
-.agent-status-active {
-    color: #4CAF50;
-    font-weight: bold;
-    font-size: 1.1em;
-}
-
-.agent-button-container {
-    display: flex;
-    gap: 10px;
-    align-items: center;
-    margin: 10px 0;
-}
-
-.agent-report-header {
-    background-color: #f8f9fa;
-    padding: 10px;
-    border-radius: 5px;
-    margin: 10px 0;
-    border-left: 4px solid #2196F3;
-}
-</style>
-""", unsafe_allow_html=True)
-
 solution_name = '''Solution 1: FinMatch – AI-driven Financial Product Matching'''
 solution_name_clean = '''finmatch_–_ai_driven_financial_product_matching'''
 table_name = '''FPR_RECORDS'''
@@ -106,7 +62,7 @@ solution_content = '''Solution 1: FinMatch – AI-driven Financial Product Match
 # Display logo and title inline
 st.markdown(f'''
 <div style="display:flex; align-items:center; margin-bottom:15px">
-    <img src="https://i.imgur.com/Og6gFnB.png" width="100" style="margin-right:15px">
+    <img src="{LOGO_DATA_URI}" width="100" style="margin-right:15px">
     <div>
         <h1 style="font-size:2.2rem; margin:0; padding:0">{solution_name_clean.replace('_', ' ').title()}</h1>
         <p style="font-size:1.1rem; color:gray; margin:0; padding:0">Fivetran and Cortex-powered Streamlit in Snowflake data application for Financial Services</p>
@@ -114,229 +70,99 @@ st.markdown(f'''
 </div>
 ''', unsafe_allow_html=True)
 
-# Define available models as strings
-MODELS = [
-    "openai-gpt-oss-120b", "openai-gpt-4.1", "openai-gpt-5", "openai-gpt-5-mini", "openai-gpt-5-nano", "openai-gpt-5-chat", "claude-4-sonnet", "claude-3-7-sonnet", "claude-3-5-sonnet", "llama3.1-8b", "llama3.1-70b", "llama4-maverick", "llama4-scout", "llama3.2-1b", "snowflake-llama-3.1-405b", "snowflake-llama-3.3-70b", "mistral-large2", "mistral-7b", "deepseek-r1", "snowflake-arctic", "reka-flash", "jamba-instruct", "gemma-7b"
-]
-
-if 'insights_history' not in st.session_state:
-    st.session_state.insights_history = []
-
-if 'data_cache' not in st.session_state:
-    st.session_state.data_cache = {}
-
-# Initialize completed steps for each focus area
-focus_areas = ["Overall Performance", "Optimization Opportunities", "Financial Impact", "Strategic Recommendations"]
-for area in focus_areas:
-    if f'{area.lower().replace(" ", "_")}_completed_steps' not in st.session_state:
-        st.session_state[f'{area.lower().replace(" ", "_")}_completed_steps'] = []
-
-try:
-    session = get_active_session()
-except Exception as e:
-    st.error(f"❌ Error connecting to Snowflake: {str(e)}")
-    st.stop()
-
-def query_snowflake(query):
-    try:
-        return session.sql(query).to_pandas()
-    except Exception as e:
-        st.error(f"Query failed: {str(e)}")
-        return pd.DataFrame()
-
-def load_data():
-    query = f"SELECT * FROM {table_name} LIMIT 1000"
-    df = query_snowflake(query)
-    df.columns = [col.lower() for col in df.columns]
-    return df
-
-def call_cortex_model(prompt, model_name):
-    try:
-        cortex_query = "SELECT SNOWFLAKE.CORTEX.COMPLETE(?, ?) AS response"
-        response = session.sql(cortex_query, params=[model_name, prompt]).collect()[0][0]
-        return response
-    except Exception as e:
-        st.error(f"❌ Cortex error: {str(e)}")
-        return None
-
-def get_focus_area_info(focus_area):
-    """Get business challenge and agent solution for each focus area"""
-    
-    focus_info = {
-        "Overall Performance": {
-            "challenge": "Retail banking managers manually review thousands of customer profiles and transaction histories daily, spending 3+ hours analyzing customer data to identify appropriate financial product recommendations and cross-selling opportunities.",
-            "solution": "Autonomous financial product matching workflow that analyzes customer transaction patterns, account balances, and lifecycle stages to generate personalized product recommendations with real-time affinity scoring and conversion predictions."
-        },
-        "Optimization Opportunities": {
-            "challenge": "Product managers spend 4+ hours daily manually identifying inefficiencies in customer segmentation, product affinity analysis, and recommendation delivery across diverse banking customer portfolios.",
-            "solution": "AI-powered banking optimization analysis that automatically detects customer targeting gaps, product positioning inefficiencies, and recommendation delivery improvements with specific implementation strategies for core banking systems."
-        },
-        "Financial Impact": {
-            "challenge": "Banking financial analysts manually calculate complex ROI metrics across product lines and customer segments, requiring 3+ hours of financial modeling to assess product matching impact on revenue and customer lifetime value.",
-            "solution": "Automated banking financial analysis that calculates comprehensive ROI, identifies cross-selling revenue opportunities across customer segments, and projects customer lifetime value benefits with detailed banking portfolio forecasting."
-        },
-        "Strategic Recommendations": {
-            "challenge": "Chief Customer Officers spend hours manually analyzing competitive positioning and developing strategic roadmaps for personalized banking services advancement and digital transformation initiatives.",
-            "solution": "Strategic banking intelligence workflow that analyzes competitive advantages against traditional financial institutions, identifies emerging FinTech integration opportunities with blockchain/IoT, and creates prioritized digital banking transformation roadmaps."
-        }
-    }
-    
-    return focus_info.get(focus_area, {"challenge": "", "solution": ""})
+# The header is drawn before pandas, altair, numpy and Snowpark are imported
+FIRST_PAINT_SECONDS = time.perf_counter() - SCRIPT_STARTED
 
-def generate_insights_with_agent_workflow(data, focus_area, model_name, progress_placeholder=None):
-    """Generate insights using AI agent workflow - Financial Services focused version"""
-    
-    try:
-        # FIRST: Generate the actual insights (behind the scenes)
-        insights = generate_insights(data, focus_area, model_name)
-        
-        # THEN: Prepare for animation
-        session_key = f'{focus_area.lower().replace(" ", "_")}_completed_steps'
-        st.session_state[session_key] = []
-        
-        def update_progress(step_name, progress_percent, details, results):
-            """Update progress display with completed steps"""
-            if progress_placeholder:
-                with progress_placeholder.container():
-                    # Progress bar
-                    st.progress(progress_percent / 100)
-                    st.write(f"**{step_name} ({progress_percent}%)**")
-                    
-                    if details:
-                        st.markdown(f'<div class="agent-current">{details}</div>', unsafe_allow_html=True)
-                    
-                    if results:
-                        st.session_state[session_key].append((step_name, results))
-                        
-                    # Display completed steps
-                    for completed_step, completed_result in st.session_state[session_key]:
-                        st.markdown(f'<div class="agent-completed">✅ {completed_step}: {completed_result}</div>', unsafe_allow_html=True)
-        
-        # Calculate real data for enhanced context
-        total_customers = len(data)
-        key_metrics = ["account_balance", "recommendation_score", "customer_transaction_value", "customer_satisfaction_score", "customer_churn_probability"]
-        available_metrics = [col for col in key_metrics if col in data.columns]
-        
-        # Calculate enhanced banking data insights
-        avg_recommendation_score = data['recommendation_score'].mean() if 'recommendation_score' in data.columns else 0
-        avg_satisfaction = data['customer_satisfaction_score'].mean() if 'customer_satisfaction_score' in data.columns else 0
-        product_types = len(data['product_type'].unique()) if 'product_type' in data.columns else 0
-        customer_segments = len(data['customer_segment'].unique()) if 'customer_segment' in data.columns else 0
-        accepted_recommendations = len(data[data['product_recommendation_status'] == 'Accepted']) if 'product_recommendation_status' in data.columns else 0
-        
-        # Define enhanced agent workflows for each focus area
-        if focus_area == "Overall Performance":
-            steps = [
-                ("Banking Customer Data Initialization", 15, f"Loading comprehensive customer banking dataset with enhanced validation across {total_customers} customers and {product_types} financial product types", f"Connected to {len(available_metrics)} banking metrics across {len(data.columns)} total financial data dimensions"),
-                ("Product Matching Performance Assessment", 35, f"Advanced calculation of financial product recommendation indicators with customer affinity analysis (avg recommendation score: {avg_recommendation_score:.3f})", f"Computed banking metrics: {avg_recommendation_score:.3f} avg recommendation score, {avg_satisfaction:.3f} customer satisfaction, {accepted_recommendations} accepted recommendations"),
-                ("Banking Pattern Recognition", 55, f"Sophisticated identification of customer financial behavior patterns with transaction correlation analysis across {product_types} product categories", f"Detected significant patterns in {len(data['customer_lifecycle_stage'].unique()) if 'customer_lifecycle_stage' in data.columns else 'N/A'} lifecycle stages with product affinity analysis completed"),
-                ("AI Banking Intelligence Processing", 75, f"Processing comprehensive banking data through {model_name} with advanced reasoning for financial product matching insights", f"Enhanced AI analysis of product recommendation effectiveness across {total_customers} banking customers completed"),
-                ("Financial Services Report Compilation", 100, f"Professional banking performance analysis with evidence-based recommendations and actionable product matching insights ready", f"Comprehensive banking performance report with {len(available_metrics)} financial metrics analysis and product recommendation improvements generated")
-            ]
-            
-        elif focus_area == "Optimization Opportunities":
-            conversion_rate = (accepted_recommendations / total_customers) * 100 if total_customers > 0 else 0
-            
-            steps = [
-                ("Banking Optimization Data Preparation", 12, f"Advanced loading of customer financial behavior data with enhanced validation across {total_customers} customers for product matching improvement identification", f"Prepared {product_types} product types, {customer_segments} customer segments for optimization analysis with {conversion_rate:.1f}% recommendation acceptance rate"),
-                ("Financial Product Inefficiency Detection", 28, f"Sophisticated analysis of customer segmentation and product affinity targeting with evidence-based inefficiency identification", f"Identified optimization opportunities across {product_types} product categories with customer targeting and product positioning gaps"),
-                ("Banking Correlation Analysis", 45, f"Enhanced examination of relationships between customer lifecycle stages, transaction patterns, and product acceptance rates", f"Analyzed correlations between customer behavior and recommendation acceptance across {total_customers} banking relationships"),
-                ("Core Banking System Integration Optimization", 65, f"Comprehensive evaluation of product matching integration with existing FIS, Fiserv, and Temenos core banking platforms", f"Assessed integration opportunities across {len(data.columns)} data points and core banking system optimization needs"),
-                ("AI Banking Optimization Intelligence", 85, f"Generating advanced financial product targeting recommendations using {model_name} with banking reasoning and implementation strategies", f"AI-powered banking optimization strategy across {product_types} product areas and customer matching improvements completed"),
-                ("Banking Strategy Finalization", 100, f"Professional banking optimization report with prioritized implementation roadmap and financial product matching impact analysis ready", f"Comprehensive optimization strategy with {len(available_metrics)} performance improvement areas and banking implementation plan generated")
-            ]
-            
-        elif focus_area == "Financial Impact":
-            avg_transaction_value = data['customer_transaction_value'].mean() if 'customer_transaction_value' in data.columns else 0
-            total_sales_amount = data['product_sales_amount'].sum() if 'product_sales_amount' in data.columns else 0
-            
-            steps = [
-                ("Banking Financial Data Integration", 15, f"Advanced loading of customer financial data and banking revenue metrics with enhanced validation across {total_customers} customers", f"Integrated banking financial data: ${avg_transaction_value:,.0f} avg transaction value, ${total_sales_amount:,.0f} total product sales across customer portfolio"),
-                ("Banking Revenue Impact Calculation", 30, f"Sophisticated ROI metrics calculation with product sales analysis and customer lifetime value enhancement", f"Computed comprehensive financial analysis: banking revenue impact, customer retention value, and ${total_sales_amount:,.0f} total product sales optimization"),
-                ("Customer Lifetime Value Impact Assessment", 50, f"Enhanced analysis of banking revenue impact with customer retention metrics and product cross-selling correlation analysis", f"Assessed financial implications: {avg_satisfaction:.1%} satisfaction rate with {accepted_recommendations} successful product matches driving revenue growth"),
-                ("Banking Portfolio Efficiency Analysis", 70, f"Comprehensive evaluation of financial resource allocation efficiency across customer segments with product profitability optimization", f"Analyzed banking efficiency: {customer_segments} customer segments with product recommendation revenue optimization opportunities identified"),
-                ("AI Banking Financial Modeling", 90, f"Advanced financial product revenue projections and customer value calculations using {model_name} with comprehensive banking cost-benefit analysis", f"Enhanced financial impact analysis and forecasting across {len(available_metrics)} banking revenue metrics completed"),
-                ("Banking Economics Report Generation", 100, f"Professional banking financial impact analysis with detailed product recommendation ROI calculations and customer value forecasting ready", f"Comprehensive banking financial report with ${total_sales_amount:,.0f} revenue analysis and customer lifetime value optimization strategy generated")
-            ]
-            
-        elif focus_area == "Strategic Recommendations":
-            digital_banking_score = avg_recommendation_score * 100 if avg_recommendation_score > 0 else 0
-            
-            steps = [
-                ("Banking Technology Assessment", 15, f"Advanced loading of digital banking context with competitive positioning analysis across {total_customers} customers and {product_types} financial products", f"Analyzed banking technology landscape: {product_types} product categories, {customer_segments} customer segments, comprehensive digital banking transformation assessment completed"),
-                ("Financial Services Competitive Advantage Analysis", 30, f"Sophisticated evaluation of competitive positioning against traditional banking recommendation approaches with AI-powered personalization effectiveness", f"Assessed competitive advantages: {digital_banking_score:.1f}% recommendation effectiveness, {avg_satisfaction:.1%} satisfaction improvement vs traditional banking methods"),
-                ("Emerging FinTech Integration", 50, f"Enhanced analysis of integration opportunities with blockchain, IoT, and open banking technologies across {len(data.columns)} banking data dimensions", f"Identified strategic technology integration: blockchain security, IoT transaction monitoring, open banking API opportunities"),
-                ("Digital Banking Strategy Development", 70, f"Comprehensive development of prioritized digital transformation roadmap with evidence-based personalized banking adoption strategies", f"Created sequenced implementation plan across {product_types} product areas with emerging financial technology integration opportunities"),
-                ("AI Banking Strategic Processing", 85, f"Advanced digital banking recommendations using {model_name} with long-term competitive positioning and financial services analysis", f"Enhanced strategic analysis with banking competitive positioning and FinTech integration roadmap completed"),
-                ("Digital Banking Report Generation", 100, f"Professional digital banking transformation roadmap with competitive analysis and financial product innovation plan ready for CCO executive review", f"Comprehensive strategic report with {product_types}-product implementation plan and banking competitive advantage analysis generated")
-            ]
-        
-        # NOW: Animate the progress with pre-calculated results
-        for step_name, progress_percent, details, results in steps:
-            update_progress(step_name, progress_percent, details, results)
-            time.sleep(1.2)
-        
-        return insights
-        
-    except Exception as e:
-        if progress_placeholder:
-            progress_placeholder.error(f"❌ Enhanced Agent Analysis failed: {str(e)}")
-        return f"Enhanced Agent Analysis failed: {str(e)}"
-
-def generate_insights(data, focus_area, model_name):
-    data_summary = f"Table: {table_name}\n"
-    data_summary += f"Description: {table_description}\n"
-    data_summary += f"Records analyzed: {len(data)}\n"
-
-    # Calculate basic statistics for numeric columns
-    numeric_stats = {}
-    key_metrics = ["account_balance", "recommendation_score", "customer_transaction_value", "customer_transaction_count", "customer_product_affinity", "product_sales_amount", "customer_satisfaction_score", "customer_churn_probability"]
-    for col in key_metrics:
-        if col in data.columns:
-            numeric_stats[col] = {
-                "mean": data[col].mean(),
-                "min": data[col].min(),
-                "max": data[col].max(),
-                "std": data[col].std()
-            }
-            data_summary += f"- {col} (avg: {data[col].mean():.2f}, min: {data[col].min():.2f}, max: {data[col].max():.2f})\n"
-
-    # Get top values for categorical columns
-    categorical_stats = {}
-    categorical_options = ["customer_id", "customer_name", "customer_email", "transaction_history", "product_id", "product_name", "product_type", "product_terms", "product_recommendation", "customer_segment", "customer_lifecycle_stage", "customer_product_usage", "customer_product_interests", "product_recommendation_status", "customer_product_usage_trend", "customer_product_affinity_trend"]
-    for cat_col in categorical_options:
-        if cat_col in data.columns:
-            top = data[cat_col].value_counts().head(3)
-            categorical_stats[cat_col] = top.to_dict()
-            data_summary += f"\nTop {cat_col} values:\n" + "\n".join(f"- {k}: {v}" for k, v in top.items())
-
-    # Calculate correlations if enough numeric columns available
-    correlation_info = ""
-    if len(key_metrics) >= 2:
-        try:
-            correlations = data[key_metrics].corr()
-            # Get the top 3 strongest correlations (absolute value)
-            corr_pairs = []
-            for i in range(len(correlations.columns)):
-                for j in range(i+1, len(correlations.columns)):
-                    col1 = correlations.columns[i]
-                    col2 = correlations.columns[j]
-                    corr_value = correlations.iloc[i, j]
-                    corr_pairs.append((col1, col2, abs(corr_value), corr_value))
-
-            # Sort by absolute correlation value
-            corr_pairs.sort(key=lambda x: x[2], reverse=True)
-
-            # Add top correlations to the summary
-            if corr_pairs:
-                correlation_info = "Top correlations between metrics:\n"
-                for col1, col2, _, corr_value in corr_pairs[:3]:
-                    correlation_info += f"- {col1} and {col2}: r = {corr_value:.2f}\n"
-        except:
-            correlation_info = "Could not calculate correlations between metrics.\n"
-
-    # Define specific instructions for each focus area
-    focus_area_instructions = {
+import pandas as pd
+import altair as alt
+
+# Shared engine - deployed next to this file on the stage; a checkout imports it from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from solution_engine import (
+    configure, finish_run, kpi_value, load_dataset, mark_first_paint, materialized_value_counts, metrics_chart_specs,
+    render_explorer_tab, render_history_tab, render_insights_tab, render_ops_tab, render_table_sketch
+)
+
+IMPORT_SECONDS = time.perf_counter() - SCRIPT_STARTED - FIRST_PAINT_SECONDS
+
+def agent_steps(data, focus_area, model_name, profile):
+    """Name, progress and details of each agent workflow step for a focus area; the results come from the work itself"""
+
+    # Calculate real data for enhanced context
+    total_customers = len(data)
+
+    # Calculate enhanced banking data insights
+    avg_recommendation_score = profile['means']['recommendation_score'] if 'recommendation_score' in data.columns else 0
+    product_types = profile['distinct']['product_type'] if 'product_type' in data.columns else 0
+
+    # Define enhanced agent workflows for each focus area
+    if focus_area == "Overall Performance":
+        steps = [
+            ("Banking Customer Data Initialization", 15, f"Loading comprehensive customer banking dataset with enhanced validation across {total_customers} customers and {product_types} financial product types"),
+            ("Product Matching Performance Assessment", 35, f"Advanced calculation of financial product recommendation indicators with customer affinity analysis (avg recommendation score: {avg_recommendation_score:.3f})"),
+            ("Banking Pattern Recognition", 55, f"Sophisticated identification of customer financial behavior patterns with transaction correlation analysis across {product_types} product categories"),
+            ("AI Banking Intelligence Processing", 75, f"Processing comprehensive banking data through {model_name} with advanced reasoning for financial product matching insights"),
+            ("Financial Services Report Compilation", 100, f"Professional banking performance analysis with evidence-based recommendations and actionable product matching insights ready")
+        ]
+
+    elif focus_area == "Optimization Opportunities":
+        steps = [
+            ("Banking Optimization Data Preparation", 12, f"Advanced loading of customer financial behavior data with enhanced validation across {total_customers} customers for product matching improvement identification"),
+            ("Financial Product Inefficiency Detection", 28, f"Sophisticated analysis of customer segmentation and product affinity targeting with evidence-based inefficiency identification"),
+            ("Banking Correlation Analysis", 45, f"Enhanced examination of relationships between customer lifecycle stages, transaction patterns, and product acceptance rates"),
+            ("Core Banking System Integration Optimization", 65, f"Comprehensive evaluation of product matching integration with existing FIS, Fiserv, and Temenos core banking platforms"),
+            ("AI Banking Optimization Intelligence", 85, f"Generating advanced financial product targeting recommendations using {model_name} with banking reasoning and implementation strategies"),
+            ("Banking Strategy Finalization", 100, f"Professional banking optimization report with prioritized implementation roadmap and financial product matching impact analysis ready")
+        ]
+
+    elif focus_area == "Financial Impact":
+        steps = [
+            ("Banking Financial Data Integration", 15, f"Advanced loading of customer financial data and banking revenue metrics with enhanced validation across {total_customers} customers"),
+            ("Banking Revenue Impact Calculation", 30, f"Sophisticated ROI metrics calculation with product sales analysis and customer lifetime value enhancement"),
+            ("Customer Lifetime Value Impact Assessment", 50, f"Enhanced analysis of banking revenue impact with customer retention metrics and product cross-selling correlation analysis"),
+            ("Banking Portfolio Efficiency Analysis", 70, f"Comprehensive evaluation of financial resource allocation efficiency across customer segments with product profitability optimization"),
+            ("AI Banking Financial Modeling", 90, f"Advanced financial product revenue projections and customer value calculations using {model_name} with comprehensive banking cost-benefit analysis"),
+            ("Banking Economics Report Generation", 100, f"Professional banking financial impact analysis with detailed product recommendation ROI calculations and customer value forecasting ready")
+        ]
+
+    elif focus_area == "Strategic Recommendations":
+        steps = [
+            ("Banking Technology Assessment", 15, f"Advanced loading of digital banking context with competitive positioning analysis across {total_customers} customers and {product_types} financial products"),
+            ("Financial Services Competitive Advantage Analysis", 30, f"Sophisticated evaluation of competitive positioning against traditional banking recommendation approaches with AI-powered personalization effectiveness"),
+            ("Emerging FinTech Integration", 50, f"Enhanced analysis of integration opportunities with blockchain, IoT, and open banking technologies across {len(data.columns)} banking data dimensions"),
+            ("Digital Banking Strategy Development", 70, f"Comprehensive development of prioritized digital transformation roadmap with evidence-based personalized banking adoption strategies"),
+            ("AI Banking Strategic Processing", 85, f"Advanced digital banking recommendations using {model_name} with long-term competitive positioning and financial services analysis"),
+            ("Digital Banking Report Generation", 100, f"Professional digital banking transformation roadmap with competitive analysis and financial product innovation plan ready for CCO executive review")
+        ]
+
+    return steps
+
+# Vertical descriptor - the columns, KPIs, segments and prompts specific to this solution;
+# the shared engine in solution_engine.py reads vertical specifics only from here
+VERTICAL = {
+    "code": "FPR",
+    "table": table_name,
+    "table_description": table_description,
+    "solution_name": solution_name,
+    "solution_content": solution_content,
+    "key_metrics": ["account_balance", "recommendation_score", "customer_transaction_value", "customer_transaction_count", "customer_product_affinity", "product_sales_amount", "customer_satisfaction_score", "customer_churn_probability"],
+    "categorical_options": ["customer_id", "customer_name", "customer_email", "transaction_history", "product_id", "product_name", "product_type", "product_terms", "product_recommendation", "customer_segment", "customer_lifecycle_stage", "customer_product_usage", "customer_product_interests", "product_recommendation_status", "customer_product_usage_trend", "customer_product_affinity_trend"],
+    "headline_metrics": ["account_balance", "recommendation_score", "customer_transaction_value", "customer_satisfaction_score", "customer_churn_probability"],
+    "kpis": {
+        "avg_recommendation_score": ("recommendation_score", "mean"),
+        "avg_customer_satisfaction_score": ("customer_satisfaction_score", "mean"),
+        "avg_customer_churn_probability": ("customer_churn_probability", "mean"),
+        "total_product_sales_amount": ("product_sales_amount", "sum"),
+        "avg_customer_transaction_value": ("customer_transaction_value", "mean"),
+        "avg_account_balance": ("account_balance", "mean"),
+        "avg_customer_transaction_count": ("customer_transaction_count", "mean")
+    },
+    "chart_aggregates": ["product_recommendation_status", "customer_lifecycle_stage", "product_type", "customer_segment"],
+    "segment_column": "customer_segment",
+    "analyst_domain": None,
+    "prompt_context": None,
+    "correlation_heading": "Top correlations between metrics:",
+    "focus_instructions": {
         "Overall Performance": """
         For the Overall Performance analysis of FinMatch:
         1. Provide a comprehensive analysis of the financial product matching system using recommendation scores, customer satisfaction, and product sales metrics
@@ -399,56 +225,190 @@ def generate_insights(data, focus_area, model_name):
         - Future FinTech Integration Vision (how to evolve FinMatch with blockchain, IoT, and open banking over 1-3 years)
         - Digital Banking Transformation Roadmap (sequenced steps for enterprise-wide adoption and expansion)
         """
-    }
+    },
+    "insights_labels": {
+        "intro": "financial product matching analysis",
+        "completed": "banking data",
+        "report": "Financial Services Data",
+        "analysis": "Banking Analysis",
+        "source": "Banking Analysis"
+    },
+    "focus_info": {
+        "Overall Performance": {
+            "challenge": "Retail banking managers manually review thousands of customer profiles and transaction histories daily, spending 3+ hours analyzing customer data to identify appropriate financial product recommendations and cross-selling opportunities.",
+            "solution": "Autonomous financial product matching workflow that analyzes customer transaction patterns, account balances, and lifecycle stages to generate personalized product recommendations with real-time affinity scoring and conversion predictions."
+        },
+        "Optimization Opportunities": {
+            "challenge": "Product managers spend 4+ hours daily manually identifying inefficiencies in customer segmentation, product affinity analysis, and recommendation delivery across diverse banking customer portfolios.",
+            "solution": "AI-powered banking optimization analysis that automatically detects customer targeting gaps, product positioning inefficiencies, and recommendation delivery improvements with specific implementation strategies for core banking systems."
+        },
+        "Financial Impact": {
+            "challenge": "Banking financial analysts manually calculate complex ROI metrics across product lines and customer segments, requiring 3+ hours of financial modeling to assess product matching impact on revenue and customer lifetime value.",
+            "solution": "Automated banking financial analysis that calculates comprehensive ROI, identifies cross-selling revenue opportunities across customer segments, and projects customer lifetime value benefits with detailed banking portfolio forecasting."
+        },
+        "Strategic Recommendations": {
+            "challenge": "Chief Customer Officers spend hours manually analyzing competitive positioning and developing strategic roadmaps for personalized banking services advancement and digital transformation initiatives.",
+            "solution": "Strategic banking intelligence workflow that analyzes competitive advantages against traditional financial institutions, identifies emerging FinTech integration opportunities with blockchain/IoT, and creates prioritized digital banking transformation roadmaps."
+        }
+    },
+    "agent_steps": agent_steps
+}
+
+configure(VERTICAL)
+
+# Startup profile - recorded once per browser session
+mark_first_paint(IMPORT_SECONDS, FIRST_PAINT_SECONDS)
+
+# Sampling notes shown under the charts they apply to, keyed by chart id
+chart_notes = {}
+
+def create_metrics_charts(data):
+    """Metrics tab charts as (chart id, chart) pairs; the tab places each one by its id"""
+    charts = []
+
+    # Recommendation Status Distribution
+    if 'product_recommendation_status' in data.columns:
+        status_counts = materialized_value_counts('product_recommendation_status').reset_index()
+        status_counts.columns = ['status', 'count']
+
+        # Status colors
+        colors = {
+            'Accepted': '#52BE80',  # Green
+            'Pending': '#F4D03F',   # Yellow
+            'In Progress': '#5DADE2',  # Blue
+            'Declined': '#E74C3C'   # Red
+        }
+
+        # Recommendation Status Distribution Chart
+        chart = alt.Chart(status_counts).mark_bar().encode(
+            x=alt.X('status:N', title='Recommendation Status', axis=alt.Axis(labelAngle=0)),
+            y=alt.Y('count:Q', title='Number of Customers'),
+            color=alt.Color('status:N', scale=alt.Scale(domain=list(colors.keys()), range=list(colors.values())))
+        )
+
+        text = chart.mark_text(
+            align='center',
+            baseline='bottom',
+            dy=-15  # Increased space above bars
+        ).encode(
+            text='count:Q'
+        )
+
+        # Use the same approach for both charts
+        charts.append(('Recommendation Status Distribution', (chart + text).properties(height=300, width=500)))
+
+    # Product Affinity Distribution
+    if 'customer_product_affinity' in data.columns:
+        # Create bins for affinity scores
+        bins = [0, 0.25, 0.5, 0.75, 1.0]
+        labels = ['Low (0-0.25)', 'Medium-Low (0.25-0.5)', 'Medium-High (0.5-0.75)', 'High (0.75-1.0)']
+        affinity_category = pd.cut(data['customer_product_affinity'], bins=bins, labels=labels, include_lowest=True)
+
+        affinity_counts = affinity_category.value_counts().reset_index()
+        affinity_counts.columns = ['category', 'count']
+
+        # Product Affinity Distribution Chart
+        chart = alt.Chart(affinity_counts).mark_bar().encode(
+            x=alt.X('category:N', title='Affinity Level', sort=None, axis=alt.Axis(labelAngle=0)),
+            y=alt.Y('count:Q', title='Number of Customers'),
+            color=alt.Color('category:N', scale=alt.Scale(domain=labels, range=['#E74C3C', '#F4D03F', '#5DADE2', '#52BE80']))
+        )
+
+        text = chart.mark_text(
+            align='center',
+            baseline='bottom',
+            dy=-15  # Increased space above bars
+        ).encode(
+            text='count:Q'
+        )
+        charts.append(('Product Affinity Distribution', (chart + text).properties(height=300, width=500)))
 
-    # Get the specific instructions for the selected focus area
-    selected_focus_instructions = focus_area_instructions.get(focus_area, "")
+    # Customer Lifecycle Stage Distribution
+    if 'customer_lifecycle_stage' in data.columns:
+        lifecycle_counts = materialized_value_counts('customer_lifecycle_stage').reset_index()
+        lifecycle_counts.columns = ['stage', 'count']
 
-    prompt = f'''
-    You are an expert data analyst specializing in {focus_area.lower()} analysis.
+        # Define lifecycle stage colors
+        lifecycle_colors = {
+            'Lead': '#F4D03F',      # Yellow
+            'Onboarding': '#5DADE2', # Blue
+            'Engaged': '#52BE80',    # Green
+            'Converted': '#8E44AD'   # Purple
+        }
 
-    SOLUTION CONTEXT:
-    {solution_name}
+        # Customer Lifecycle Stage Chart
+        chart = alt.Chart(lifecycle_counts).mark_bar().encode(
+            x=alt.X('stage:N', title='Lifecycle Stage', axis=alt.Axis(labelAngle=0)),
+            y=alt.Y('count:Q', title='Number of Customers'),
+            color=alt.Color('stage:N', scale=alt.Scale(domain=list(lifecycle_colors.keys()), range=list(lifecycle_colors.values())))
+        )
 
-    {solution_content}
+        text = chart.mark_text(
+            align='center',
+            baseline='bottom',
+            dy=-15  # Increased space above bars
+        ).encode(
+            text='count:Q'
+        )
+        charts.append(('Customer Lifecycle Stage Distribution', (chart + text).properties(height=300, width=500)))
 
-    DATA SUMMARY:
-    {data_summary}
+    # Top Product Types
+    if 'product_type' in data.columns:
+        product_counts = materialized_value_counts('product_type').head(5).reset_index()
+        product_counts.columns = ['product_type', 'count']
+
+        # Top Product Types Chart
+        chart = alt.Chart(product_counts).mark_bar().encode(
+            y=alt.Y('product_type:N', title='Product Type', sort='-x'),
+            x=alt.X('count:Q', title='Number of Customers'),
+            color=alt.Color('product_type:N', legend=None)
+        )
 
-    {correlation_info}
+        text = chart.mark_text(
+            align='left',
+            baseline='middle',
+            dx=3
+        ).encode(
+            text='count:Q'
+        )
+        charts.append(('Top Product Types', (chart + text).properties(height=300)))
 
-    ANALYSIS INSTRUCTIONS:
-    {selected_focus_instructions}
+    # Top Customer Segments
+    if 'customer_segment' in data.columns:
+        segment_counts = materialized_value_counts('customer_segment').head(5).reset_index()
+        segment_counts.columns = ['segment', 'count']
+
+        # Top Customer Segments Chart
+        chart = alt.Chart(segment_counts).mark_bar().encode(
+            y=alt.Y('segment:N', title='Customer Segment', sort='-x'),
+            x=alt.X('count:Q', title='Number of Customers'),
+            color=alt.Color('segment:N', legend=None)
+        )
 
-    IMPORTANT GUIDELINES:
-    - Base all insights directly on the data provided
-    - Use specific metrics and numbers from the data in your analysis
-    - Maintain a professional, analytical tone
-    - Be concise but thorough in your analysis
-    - Focus specifically on {focus_area} as defined in the instructions
-    - Ensure your response is unique and tailored to this specific focus area
-    - Include a mix of observations, analysis, and actionable recommendations
-    - Use bullet points and clear section headers for readability
-    '''
+        text = chart.mark_text(
+            align='left',
+            baseline='middle',
+            dx=3
+        ).encode(
+            text='count:Q'
+        )
+        charts.append(('Top Customer Segments', (chart + text).properties(height=300)))
 
-    return call_cortex_model(prompt, model_name)
+    return charts
 
-data = load_data()
-if data.empty:
-    st.error("No data found.")
-    st.stop()
+data, dataset_profile = load_dataset()
 
 categorical_cols = [col for col in ["customer_id", "customer_name", "customer_email", "transaction_history", "product_id", "product_name", "product_type", "product_terms", "product_recommendation", "customer_segment", "customer_lifecycle_stage", "customer_product_usage", "customer_product_interests", "product_recommendation_status", "customer_product_usage_trend", "customer_product_affinity_trend"] if col in data.columns]
 numeric_cols = [col for col in ["account_balance", "recommendation_score", "customer_transaction_value", "customer_transaction_count", "customer_product_affinity", "product_sales_amount", "customer_satisfaction_score", "customer_churn_probability"] if col in data.columns]
 date_cols = [col for col in ["product_sales_date", "customer_lifecycle_stage_transition_date", "product_recommendation_date"] if col in data.columns]
 
 sample_cols = data.columns.tolist()
-numeric_candidates = [col for col in sample_cols if data[col].dtype in ['float64', 'int64'] and 'id' not in col.lower()]
+numeric_candidates = dataset_profile["numeric_candidates"]
 date_candidates = [col for col in sample_cols if 'date' in col.lower() or 'timestamp' in col.lower()]
-cat_candidates = [col for col in sample_cols if data[col].dtype == 'object' and data[col].nunique() < 1000]
+cat_candidates = dataset_profile["cat_candidates"]
 
-# Four tabs - with Metrics as the first tab (Tab 0)
-tabs = st.tabs(["📊 Metrics", "✨ AI Insights", "📁 Insights History", "🔍 Data Explorer"])
+# Five tabs - with Metrics as the first tab (Tab 0)
+tabs = st.tabs(["📊 Metrics", "✨ AI Insights", "📁 Insights History", "🔍 Data Explorer", "🛠 Ops"])
 
 # Metrics Tab (Tab 0)
 with tabs[0]:
@@ -459,10 +419,10 @@ with tabs[0]:
     col1, col2, col3, col4 = st.columns(4)
     
     # Calculate metrics from the data
-    avg_recommendation_score = data['recommendation_score'].mean() if 'recommendation_score' in data.columns else 0
-    avg_satisfaction_score = data['customer_satisfaction_score'].mean() if 'customer_satisfaction_score' in data.columns else 0
-    avg_churn_probability = data['customer_churn_probability'].mean() if 'customer_churn_probability' in data.columns else 0
-    total_sales_amount = data['product_sales_amount'].sum() if 'product_sales_amount' in data.columns else 0
+    avg_recommendation_score = kpi_value('avg_recommendation_score')
+    avg_satisfaction_score = kpi_value('avg_customer_satisfaction_score')
+    avg_churn_probability = kpi_value('avg_customer_churn_probability')
+    total_sales_amount = kpi_value('total_product_sales_amount')
     
     with col1:
         with st.container(border=True):
@@ -505,19 +465,22 @@ with tabs[0]:
     
     with col1:
         with st.container(border=True):
-            avg_transaction_value = data['customer_transaction_value'].mean() if 'customer_transaction_value' in data.columns else 0
+            avg_transaction_value = kpi_value('avg_customer_transaction_value')
             st.metric("Avg Transaction Value", f"${avg_transaction_value:,.2f}")
         
     with col2:
         with st.container(border=True):
-            avg_account_balance = data['account_balance'].mean() if 'account_balance' in data.columns else 0
+            avg_account_balance = kpi_value('avg_account_balance')
             st.metric("Avg Account Balance", f"${avg_account_balance:,.2f}")
         
     with col3:
         with st.container(border=True):
-            avg_transaction_count = data['customer_transaction_count'].mean() if 'customer_transaction_count' in data.columns else 0
+            avg_transaction_count = kpi_value('avg_customer_transaction_count')
             st.metric("Avg Transaction Count", f"{avg_transaction_count:.1f}")
     
+    # Reruns reuse the finished Vega-Lite specs until the data snapshot changes
+    metrics_specs = metrics_chart_specs(create_metrics_charts, data, chart_notes)
+
     # Create two columns for charts
     col1, col2 = st.columns(2)
     
@@ -526,34 +489,7 @@ with tabs[0]:
         st.subheader("Recommendation Status Distribution")
         
         if 'product_recommendation_status' in data.columns:
-            status_counts = data['product_recommendation_status'].value_counts().reset_index()
-            status_counts.columns = ['status', 'count']
-            
-            # Status colors
-            colors = {
-                'Accepted': '#52BE80',  # Green
-                'Pending': '#F4D03F',   # Yellow
-                'In Progress': '#5DADE2',  # Blue
-                'Declined': '#E74C3C'   # Red
-            }
-            
-            # Recommendation Status Distribution Chart
-            chart = alt.Chart(status_counts).mark_bar().encode(
-                x=alt.X('status:N', title='Recommendation Status', axis=alt.Axis(labelAngle=0)),
-                y=alt.Y('count:Q', title='Number of Customers'),
-                color=alt.Color('status:N', scale=alt.Scale(domain=list(colors.keys()), range=list(colors.values())))
-            )
-            
-            text = chart.mark_text(
-                align='center',
-                baseline='bottom',
-                dy=-15  # Increased space above bars
-            ).encode(
-                text='count:Q'
-            )
-            
-            # Use the same approach for both charts
-            st.altair_chart((chart + text).properties(height=300, width=500), use_container_width=True)
+            st.vega_lite_chart(metrics_specs['Recommendation Status Distribution'], use_container_width=True)
         else:
             st.write("Recommendation status data not available")
     
@@ -562,30 +498,7 @@ with tabs[0]:
         st.subheader("Product Affinity Distribution")
         
         if 'customer_product_affinity' in data.columns:
-            # Create bins for affinity scores
-            bins = [0, 0.25, 0.5, 0.75, 1.0]
-            labels = ['Low (0-0.25)', 'Medium-Low (0.25-0.5)', 'Medium-High (0.5-0.75)', 'High (0.75-1.0)']
-            data['affinity_category'] = pd.cut(data['customer_product_affinity'], bins=bins, labels=labels, include_lowest=True)
-            
-            affinity_counts = data['affinity_category'].value_counts().reset_index()
-            affinity_counts.columns = ['category', 'count']
-            
-            # Product Affinity Distribution Chart
-            chart = alt.Chart(affinity_counts).mark_bar().encode(
-                x=alt.X('category:N', title='Affinity Level', sort=None, axis=alt.Axis(labelAngle=0)),
-                y=alt.Y('count:Q', title='Number of Customers'),
-                color=alt.Color('category:N', scale=alt.Scale(domain=labels, range=['#E74C3C', '#F4D03F', '#5DADE2', '#52BE80']))
-            )
-            
-            text = chart.mark_text(
-                align='center',
-                baseline='bottom',
-                dy=-15  # Increased space above bars
-            ).encode(
-                text='count:Q'
-            )
-            
-            st.altair_chart((chart + text).properties(height=300, width=500), use_container_width=True)
+            st.vega_lite_chart(metrics_specs['Product Affinity Distribution'], use_container_width=True)
         else:
             st.write("Customer product affinity data not available")
     
@@ -593,33 +506,7 @@ with tabs[0]:
     st.subheader("Customer Lifecycle Stage Distribution")
     
     if 'customer_lifecycle_stage' in data.columns:
-        lifecycle_counts = data['customer_lifecycle_stage'].value_counts().reset_index()
-        lifecycle_counts.columns = ['stage', 'count']
-        
-        # Define lifecycle stage colors
-        lifecycle_colors = {
-            'Lead': '#F4D03F',      # Yellow
-            'Onboarding': '#5DADE2', # Blue
-            'Engaged': '#52BE80',    # Green
-            'Converted': '#8E44AD'   # Purple
-        }
-        
-        # Customer Lifecycle Stage Chart
-        chart = alt.Chart(lifecycle_counts).mark_bar().encode(
-            x=alt.X('stage:N', title='Lifecycle Stage', axis=alt.Axis(labelAngle=0)),
-            y=alt.Y('count:Q', title='Number of Customers'),
-            color=alt.Color('stage:N', scale=alt.Scale(domain=list(lifecycle_colors.keys()), range=list(lifecycle_colors.values())))
-        )
-        
-        text = chart.mark_text(
-            align='center',
-            baseline='bottom',
-            dy=-15  # Increased space above bars
-        ).encode(
-            text='count:Q'
-        )
-        
-        st.altair_chart((chart + text).properties(height=300, width=500), use_container_width=True)
+        st.vega_lite_chart(metrics_specs['Customer Lifecycle Stage Distribution'], use_container_width=True)
     else:
         st.write("Customer lifecycle stage data not available")
     
@@ -634,25 +521,7 @@ with tabs[0]:
         st.subheader("Top Product Types")
         
         if 'product_type' in data.columns:
-            product_counts = data['product_type'].value_counts().head(5).reset_index()
-            product_counts.columns = ['product_type', 'count']
-            
-            # Top Product Types Chart
-            chart = alt.Chart(product_counts).mark_bar().encode(
-                y=alt.Y('product_type:N', title='Product Type', sort='-x'),
-                x=alt.X('count:Q', title='Number of Customers'),
-                color=alt.Color('product_type:N', legend=None)
-            )
-            
-            text = chart.mark_text(
-                align='left',
-                baseline='middle',
-                dx=3
-            ).encode(
-                text='count:Q'
-            )
-            
-            st.altair_chart((chart + text).properties(height=300), use_container_width=True)
+            st.vega_lite_chart(metrics_specs['Top Product Types'], use_container_width=True)
         else:
             st.write("Product type data not available")
     
@@ -661,128 +530,27 @@ with tabs[0]:
         st.subheader("Top Customer Segments")
         
         if 'customer_segment' in data.columns:
-            segment_counts = data['customer_segment'].value_counts().head(5).reset_index()
-            segment_counts.columns = ['segment', 'count']
-            
-            # Top Customer Segments Chart
-            chart = alt.Chart(segment_counts).mark_bar().encode(
-                y=alt.Y('segment:N', title='Customer Segment', sort='-x'),
-                x=alt.X('count:Q', title='Number of Customers'),
-                color=alt.Color('segment:N', legend=None)
-            )
-            
-            text = chart.mark_text(
-                align='left',
-                baseline='middle',
-                dx=3
-            ).encode(
-                text='count:Q'
-            )
-            
-            st.altair_chart((chart + text).properties(height=300), use_container_width=True)
+            st.vega_lite_chart(metrics_specs['Top Customer Segments'], use_container_width=True)
         else:
             st.write("Customer segment data not available")
 
+    # Full-table statistics from warehouse sketches, with their error bounds
+    render_table_sketch()
+
 # AI Insights tab
 with tabs[1]:
-    st.subheader("✨ AI-Powered Insights with Agent Workflows")
-    st.markdown("**Experience behind-the-scenes AI agent processing for each financial product matching analysis focus area**")
-    
-    focus_area = st.radio("Focus Area", [
-        "Overall Performance", 
-        "Optimization Opportunities", 
-        "Financial Impact", 
-        "Strategic Recommendations"
-    ])
-    
-    # Show business challenge and solution
-    focus_info = get_focus_area_info(focus_area)
-    if focus_info["challenge"]:
-        st.markdown("#### Business Challenge")
-        st.info(focus_info["challenge"])
-        st.markdown("#### Agent Solution")
-        st.success(focus_info["solution"])
-    
-    st.markdown("**Select Snowflake Cortex Model for Analysis:**")
-    selected_model = st.selectbox("", MODELS, index=0, label_visibility="collapsed")
-
-    # Agent control buttons and status
-    col1, col2, col3 = st.columns([2, 1, 1])
-    
-    agent_running_key = f"{focus_area}_agent_running"
-    if agent_running_key not in st.session_state:
-        st.session_state[agent_running_key] = False
-    
-    with col1:
-        if st.button("🚀 Start Agent"):
-            st.session_state[agent_running_key] = True
-            st.rerun()
-    
-    with col2:
-        if st.button("⏹ Stop Agent"):
-            st.session_state[agent_running_key] = False
-            st.rerun()
-    
-    with col3:
-        st.markdown("**Status**")
-        if st.session_state[agent_running_key]:
-            st.markdown('<div class="agent-status-active">✅ Active</div>', unsafe_allow_html=True)
-        else:
-            st.markdown("⏸ Ready")
-
-    # Progress placeholder
-    progress_placeholder = st.empty()
-    
-    # Run agent if active
-    if st.session_state[agent_running_key]:
-        with st.spinner("Agent Running..."):
-            insights = generate_insights_with_agent_workflow(data, focus_area, selected_model, progress_placeholder)
-            
-            if insights:
-                # Show completion message
-                st.success(f"🎉 {focus_area} Agent completed with real banking data analysis!")
-                
-                # Show report in expandable section
-                with st.expander(f"📋 Generated {focus_area} Report (Real Financial Services Data)", expanded=True):
-                    st.markdown(f"""
-                    <div class="agent-report-header">
-                        <strong>{focus_area} Report - AI-Generated Banking Analysis</strong><br>
-                        <small>Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}</small><br>
-                        <small>Data Source: Live Snowflake Banking Analysis</small><br>
-                        <small>AI Model: {selected_model}</small>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    st.markdown(insights)
-                
-                # Save to history
-                timestamp = pd.Timestamp.now().strftime("%Y-%m-%d %H:%M")
-                st.session_state.insights_history.append({
-                    "timestamp": timestamp,
-                    "focus": focus_area,
-                    "insights": insights,
-                    "model": selected_model
-                })
-                
-                # Stop the agent after completion
-                st.session_state[agent_running_key] = False
+    render_insights_tab(data, dataset_profile)
 
 # Insights History tab
 with tabs[2]:
-    st.subheader("📁 Insights History")
-    if st.session_state.insights_history:
-        for i, item in enumerate(reversed(st.session_state.insights_history)):
-            with st.expander(f"{item['timestamp']} - {item['focus']} ({item['model']})", expanded=False):
-                st.markdown(item["insights"])
-    else:
-        st.info("No insights generated yet. Go to the AI Insights tab to generate some insights.")
+    render_history_tab()
 
-# Data Explorer tab
+# Data Explorer tab (fourth)
 with tabs[3]:
-    st.subheader("🔍 Data Explorer")
-    rows_per_page = st.slider("Rows per page", 5, 50, 10)
-    page = st.number_input("Page", min_value=1, value=1)
-    start = (page - 1) * rows_per_page
-    end = min(start + rows_per_page, len(data))
-    st.dataframe(data.iloc[start:end], use_container_width=True)
-    st.caption(f"Showing rows {start + 1}–{end} of {len(data)}")
+    render_explorer_tab(data)
+
+# Ops tab - LLM latency, cache and error telemetry
+with tabs[4]:
+    render_ops_tab()
+
+finish_run(SCRIPT_STARTED, RUN_STARTED)
@@ -1,72 +1,28 @@
-import streamlit as st
-import pandas as pd
-import altair as alt
 import time
-import json
-import re
-from datetime import datetime
-from snowflake.snowpark.context import get_active_session
+
+# Startup profiler - everything below is timed from here
+SCRIPT_STARTED = time.perf_counter()
+
+import base64
+import os
+import sys
+import streamlit as st
+
+# Script start - used to measure how long each rerun takes
+RUN_STARTED = time.time()
+
+# Header logo - bundled in the app's images folder, so the header makes no remote request
+LOGO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images", "fivetran_logo.png")
+with open(LOGO_PATH, "rb") as logo_file:
+    LOGO_DATA_URI = "data:image/png;base64," + base64.b64encode(logo_file.read()).decode()
 
 st.set_page_config(
     page_title="studentsuccess_–_ai_driven_freshman_retention_insights",
-    page_icon="https://i.imgur.com/Og6gFnB.png",
+    page_icon=LOGO_PATH,
     layout="wide",
     initial_sidebar_state="expanded"
 )
 
-# Add CSS for agent progress styling
-st.markdown("""
-<style>
-.agent-current {
-    background-color: #e3f2fd;
-    border-left: 4px solid #2196f3;
-    padding: 10px;
-    margin: 5px 0;
-    border-radius: 5px;
-    font-weight: 500;
-}
-
-.agent-completed {
-    background-color: #e8f5e8;
-    border-left: 4px solid #4caf50;
-    padding: 8px;
-    margin: 3px 0;
-    border-radius: 5px;
-    font-size: 0.9em;
-    color: #2e7d32;
-}
-
-.agent-container {
-    background-color: #f8f9fa;
-    padding: 15px;
-    border-radius: 10px;
-    margin: 10px 0;
-    border: 1px solid #e0e0e0;
-}
-
-.agent-status-active {
-    color: #4CAF50;
-    font-weight: bold;
-    font-size: 1.1em;
-}
-
-.agent-button-container {
-    display: flex;
-    gap: 10px;
-    align-items: center;
-    margin: 10px 0;
-}
-
-.agent-report-header {
-    background-color: #f8f9fa;
-    padding: 10px;
-    border-radius: 5px;
-    margin: 10px 0;
-    border-left: 4px solid #2196F3;
-}
-</style>
-""", unsafe_allow_html=True)
-
 solution_name = '''Solution 1: StudentSuccess – AI-driven Freshman Retention Insights'''
 solution_name_clean = '''studentsuccess_–_ai_driven_freshman_retention_insights'''
 table_name = '''HED_RECORDS'''
@@ -136,7 +92,7 @@ Over the next 3-5 years, StudentSuccess will expand to include predictive analyt
 # Display logo and title inline
 st.markdown(f'''
 <div style="display:flex; align-items:center; margin-bottom:15px">
-    <img src="https://i.imgur.com/Og6gFnB.png" width="100" style="margin-right:15px">
+    <img src="{LOGO_DATA_URI}" width="100" style="margin-right:15px">
     <div>
         <h1 style="font-size:2.2rem; margin:0; padding:0">{solution_name_clean.replace('_', ' ').title()}</h1>
         <p style="font-size:1.1rem; color:gray; margin:0; padding:0">Fivetran and Cortex-powered Streamlit in Snowflake data application for Higher Education</p>
@@ -144,55 +100,169 @@ st.markdown(f'''
 </div>
 ''', unsafe_allow_html=True)
 
-# Define available models as strings
-MODELS = [
-    "openai-gpt-oss-120b", "openai-gpt-4.1", "openai-gpt-5", "openai-gpt-5-mini", "openai-gpt-5-nano", "openai-gpt-5-chat", "claude-4-sonnet", "claude-3-7-sonnet", "claude-3-5-sonnet", "llama3.1-8b", "llama3.1-70b", "llama4-maverick", "llama4-scout", "llama3.2-1b", "snowflake-llama-3.1-405b", "snowflake-llama-3.3-70b", "mistral-large2", "mistral-7b", "deepseek-r1", "snowflake-arctic", "reka-flash", "jamba-instruct", "gemma-7b"
-]
-
-if 'insights_history' not in st.session_state:
-    st.session_state.insights_history = []
-
-if 'data_cache' not in st.session_state:
-    st.session_state.data_cache = {}
-
-# Initialize completed steps for each focus area
-focus_areas = ["Overall Performance", "Optimization Opportunities", "Financial Impact", "Strategic Recommendations"]
-for area in focus_areas:
-    if f'{area.lower().replace(" ", "_")}_completed_steps' not in st.session_state:
-        st.session_state[f'{area.lower().replace(" ", "_")}_completed_steps'] = []
-
-try:
-    session = get_active_session()
-except Exception as e:
-    st.error(f"❌ Error connecting to Snowflake: {str(e)}")
-    st.stop()
-
-def query_snowflake(query):
-    try:
-        return session.sql(query).to_pandas()
-    except Exception as e:
-        st.error(f"Query failed: {str(e)}")
-        return pd.DataFrame()
-
-def load_data():
-    query = f"SELECT * FROM {table_name} LIMIT 1000"
-    df = query_snowflake(query)
-    df.columns = [col.lower() for col in df.columns]
-    return df
-
-def call_cortex_model(prompt, model_name):
-    try:
-        cortex_query = "SELECT SNOWFLAKE.CORTEX.COMPLETE(?, ?) AS response"
-        response = session.sql(cortex_query, params=[model_name, prompt]).collect()[0][0]
-        return response
-    except Exception as e:
-        st.error(f"❌ Cortex error: {str(e)}")
-        return None
-
-def get_focus_area_info(focus_area):
-    """Get business challenge and agent solution for each focus area"""
-    
-    focus_info = {
+# The header is drawn before pandas, altair, numpy and Snowpark are imported
+FIRST_PAINT_SECONDS = time.perf_counter() - SCRIPT_STARTED
+
+import pandas as pd
+import altair as alt
+
+# Shared engine - deployed next to this file on the stage; a checkout imports it from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from solution_engine import (
+    boxplot_chart, boxplot_data, configure, density_chart, finish_run, grouped_mean_data, histogram_data, kpi_value,
+    load_dataset, mark_first_paint, materialized_value_counts, metrics_chart_specs, render_explorer_tab,
+    render_history_tab, render_insights_tab, render_ops_tab, render_table_sketch, scatter_rows
+)
+
+IMPORT_SECONDS = time.perf_counter() - SCRIPT_STARTED - FIRST_PAINT_SECONDS
+
+def agent_steps(data, focus_area, model_name, profile):
+    """Name, progress and details of each agent workflow step for a focus area; the results come from the work itself"""
+
+    # Calculate real data for enhanced context
+    total_students = len(data)
+
+    # Calculate enhanced higher education data insights
+    avg_gpa = profile['means']['current_gpa'] if 'current_gpa' in data.columns else 0
+    major_count = profile['distinct']['major_code'] if 'major_code' in data.columns else 0
+
+    # Define enhanced agent workflows for each focus area
+    if focus_area == "Overall Performance":
+        steps = [
+            ("Student Success Data Initialization", 15, f"Loading comprehensive student academic dataset with enhanced validation across {total_students} student records and {major_count} academic programs"),
+            ("Academic Performance Assessment", 35, f"Advanced calculation of retention indicators with GPA analysis (avg GPA: {avg_gpa:.3f})"),
+            ("Student Engagement Pattern Recognition", 55, f"Sophisticated identification of engagement performance patterns with academic correlation analysis across {major_count} academic majors"),
+            ("AI Student Success Intelligence Processing", 75, f"Processing comprehensive student data through {model_name} with advanced reasoning for retention efficiency insights"),
+            ("Academic Performance Report Compilation", 100, f"Professional student success analysis with evidence-based recommendations and actionable retention insights ready")
+        ]
+
+    elif focus_area == "Optimization Opportunities":
+        steps = [
+            ("Student Success Optimization Data Preparation", 12, f"Advanced loading of academic performance data with enhanced validation across {total_students} students for retention improvement identification"),
+            ("Academic Advising Inefficiency Detection", 28, f"Sophisticated analysis of advising scheduling and student engagement with evidence-based inefficiency identification"),
+            ("Student Success Correlation Analysis", 45, f"Enhanced examination of relationships between academic standing, engagement scores, and intervention effectiveness"),
+            ("SIS/LMS Integration Optimization", 65, f"Comprehensive evaluation of student success integration with existing Banner, Canvas, and Turnitin systems"),
+            ("AI Student Success Intelligence", 85, f"Generating advanced retention optimization recommendations using {model_name} with higher education reasoning and implementation strategies"),
+            ("Student Success Strategy Finalization", 100, f"Professional student success optimization report with prioritized implementation roadmap and retention impact analysis ready")
+        ]
+
+    elif focus_area == "Financial Impact":
+        steps = [
+            ("Higher Education Financial Data Integration", 15, f"Advanced loading of student success financial data and tuition revenue metrics with enhanced validation across {total_students} students"),
+            ("Retention Revenue Calculation", 30, f"Sophisticated ROI metrics calculation with tuition revenue analysis and retention cost optimization"),
+            ("Student Success Investment Assessment", 50, f"Enhanced analysis of retention revenue impact with student success metrics and tuition revenue correlation analysis"),
+            ("Academic Resource Efficiency Analysis", 70, f"Comprehensive evaluation of resource allocation efficiency across academic programs with student lifecycle revenue optimization"),
+            ("AI Higher Education Financial Modeling", 90, f"Advanced student success financial projections and retention ROI calculations using {model_name} with comprehensive higher education cost-benefit analysis"),
+            ("Student Success Economics Report Generation", 100, f"Professional higher education financial impact analysis with detailed retention ROI calculations and tuition revenue forecasting ready")
+        ]
+
+    elif focus_area == "Strategic Recommendations":
+        steps = [
+            ("Higher Education Technology Assessment", 15, f"Advanced loading of student success digital context with competitive positioning analysis across {total_students} students and {major_count} academic programs"),
+            ("Student Success Competitive Advantage Analysis", 30, f"Sophisticated evaluation of competitive positioning against traditional reactive academic advising with AI-powered retention prediction effectiveness"),
+            ("Advanced Academic Technology Integration", 50, f"Enhanced analysis of integration opportunities with predictive analytics, personalized learning, and digital student success technologies across {len(data.columns)} academic data dimensions"),
+            ("Digital Student Success Strategy Development", 70, f"Comprehensive development of prioritized digital transformation roadmap with evidence-based academic technology adoption strategies"),
+            ("AI Higher Education Strategic Processing", 85, f"Advanced student success strategic recommendations using {model_name} with long-term competitive positioning and higher education technology analysis"),
+            ("Digital Academic Transformation Report Generation", 100, f"Professional digital higher education transformation roadmap with competitive analysis and academic technology implementation plan ready for Provost executive review")
+        ]
+
+    return steps
+
+# Vertical descriptor - the columns, KPIs, segments and prompts specific to this solution;
+# the shared engine in solution_engine.py reads vertical specifics only from here
+VERTICAL = {
+    "code": "HED",
+    "table": table_name,
+    "table_description": table_description,
+    "solution_name": solution_name,
+    "solution_content": solution_content,
+    "key_metrics": ["current_gpa", "credit_hours_attempted", "credit_hours_earned", "financial_aid_amount", "total_course_views", "assignment_submissions", "discussion_posts", "avg_assignment_score", "course_completion_rate", "plagiarism_incidents", "writing_quality_score", "engagement_score", "intervention_count"],
+    "categorical_options": ["academic_standing", "major_code", "at_risk_flag"],
+    "headline_metrics": ["current_gpa", "course_completion_rate", "engagement_score", "intervention_count"],
+    "summary_metrics": ["current_gpa", "course_completion_rate", "engagement_score", "avg_assignment_score"],
+    "kpis": {
+        "avg_current_gpa": ("current_gpa", "mean"),
+        "avg_course_completion_rate": ("course_completion_rate", "mean"),
+        "avg_engagement_score": ("engagement_score", "mean"),
+        "at_risk_share": ("at_risk_flag", "share_true")
+    },
+    "chart_aggregates": ["at_risk_flag"],
+    "segment_column": "major_code",
+    "analyst_domain": "higher education student success and retention",
+    "prompt_context": "higher education student success and freshman retention",
+    "correlation_heading": "Top correlations between student metrics:",
+    "focus_instructions": {
+        "Overall Performance": """
+        For the Overall Performance analysis of StudentSuccess:
+        1. Provide a comprehensive analysis of freshman retention using GPA, credit hours, engagement scores, and at-risk indicators
+        2. Identify significant patterns in academic performance, student engagement, and retention risk across different majors and academic standings
+        3. Highlight 3-5 key academic metrics that best indicate student success likelihood (GPA trends, course completion rates, engagement scores)
+        4. Discuss both strengths and areas for improvement in the AI-powered student success prediction system
+        5. Include 3-5 actionable insights for improving freshman retention based on the student data
+        
+        Structure your response with these higher education focused sections:
+        - Academic Performance Insights (5 specific insights with supporting GPA, credit hours, and engagement data)
+        - Student Engagement Trends (3-4 significant trends in course views, assignments, and discussion participation)
+        - Retention Risk Recommendations (3-5 data-backed recommendations for improving student success interventions)
+        - Implementation Steps (3-5 concrete next steps for advisors and student success coordinators)
+        """,
+        
+        "Optimization Opportunities": """
+        For the Optimization Opportunities analysis of StudentSuccess:
+        1. Focus specifically on areas where student success interventions and retention efforts can be improved
+        2. Identify inefficiencies in academic advising, student engagement tracking, and early warning systems
+        3. Analyze correlations between engagement metrics, academic performance, and intervention effectiveness
+        4. Prioritize optimization opportunities based on potential impact on retention rates and student outcomes
+        5. Suggest specific technical or process improvements for integration with existing SIS and LMS systems
+        
+        Structure your response with these higher education focused sections:
+        - Student Success Optimization Priorities (3-5 areas with highest retention improvement potential)
+        - Academic Impact Analysis (quantified benefits of addressing each opportunity in terms of GPA and retention metrics)
+        - Advising Strategy Enhancement (specific steps for academic advisors to implement each optimization)
+        - System Integration Recommendations (specific technical changes needed for seamless integration with Banner, Canvas, and Turnitin)
+        - Student Support Risk Assessment (potential challenges for students and advisors and how to mitigate them)
+        """,
+        
+        "Financial Impact": """
+        For the Financial Impact analysis of StudentSuccess:
+        1. Focus on cost-benefit analysis and ROI in higher education terms (tuition revenue protection vs. intervention costs)
+        2. Quantify financial impacts through retention improvements, reduced dropout costs, and increased enrollment efficiency
+        3. Identify revenue protection opportunities across different student populations and academic programs
+        4. Analyze resource allocation efficiency across different advisors and intervention strategies
+        5. Project future financial outcomes based on improved retention rates and expanding to other student populations
+        
+        Structure your response with these higher education focused sections:
+        - Tuition Revenue Analysis (breakdown of revenue protection and potential gains by retention improvements)
+        - Student Success Investment Impact (how improved early warning affects institutional costs and student outcomes)
+        - Higher Education ROI Calculation (specific calculations showing return on investment in terms of retained tuition revenue)
+        - Intervention Cost-Effectiveness (specific areas to optimize intervention spending for maximum retention impact)
+        - Enrollment Revenue Forecasting (projections based on improved retention rate metrics)
+        """,
+        
+        "Strategic Recommendations": """
+        For the Strategic Recommendations analysis of StudentSuccess:
+        1. Focus on long-term strategic implications for digital transformation in higher education student success
+        2. Identify competitive advantages against traditional reactive advising approaches
+        3. Suggest new directions for AI integration with emerging educational technologies (e.g., adaptive learning, predictive analytics)
+        4. Connect recommendations to broader institutional goals of improving graduation rates and student satisfaction
+        5. Provide a student success roadmap with prioritized initiatives
+        
+        Structure your response with these higher education focused sections:
+        - Digital Student Success Context (how StudentSuccess fits into broader digital transformation in higher education)
+        - Institutional Competitive Advantage Analysis (how to maximize retention advantages compared to traditional reactive methods)
+        - Academic Technology Strategic Priorities (3-5 high-impact strategic initiatives for improving student outcomes)
+        - Advanced Analytics Integration Vision (how to evolve StudentSuccess with predictive learning analytics over 1-3 years)
+        - Student Success Transformation Roadmap (sequenced steps for expanding to degree completion prediction and personalized learning pathways)
+        """
+    },
+    "insights_labels": {
+        "intro": "student success analysis",
+        "completed": "student success data",
+        "report": "Higher Education Student Data",
+        "analysis": "Student Success Analysis",
+        "source": "Student Success Analysis"
+    },
+    "focus_info": {
         "Overall Performance": {
             "challenge": "Academic advisors manually review hundreds of student records daily, spending 3+ hours analyzing GPA trends, engagement metrics, and early warning indicators to identify at-risk freshmen and develop retention strategies.",
             "solution": "Autonomous student success workflow that analyzes academic performance, engagement patterns, and behavioral data to generate automated at-risk assessments, identify retention patterns, and produce prioritized intervention recommendations with predictive analytics."
@@ -209,111 +279,17 @@ def get_focus_area_info(focus_area):
             "challenge": "Provosts and VPs of Student Affairs spend hours manually analyzing digital transformation opportunities and developing strategic technology roadmaps for student success advancement and predictive analytics implementation.",
             "solution": "Strategic student success intelligence workflow that analyzes competitive advantages against traditional reactive methods, identifies predictive analytics and personalized learning integration opportunities, and creates prioritized digital transformation roadmaps."
         }
-    }
-    
-    return focus_info.get(focus_area, {"challenge": "", "solution": ""})
+    },
+    "agent_steps": agent_steps
+}
 
-def generate_insights_with_agent_workflow(data, focus_area, model_name, progress_placeholder=None):
-    """Generate insights using AI agent workflow - Higher Education Student Success focused version"""
-    
-    try:
-        # FIRST: Generate the actual insights (behind the scenes)
-        insights = generate_insights(data, focus_area, model_name)
-        
-        # THEN: Prepare for animation
-        session_key = f'{focus_area.lower().replace(" ", "_")}_completed_steps'
-        st.session_state[session_key] = []
-        
-        def update_progress(step_name, progress_percent, details, results):
-            """Update progress display with completed steps"""
-            if progress_placeholder:
-                with progress_placeholder.container():
-                    # Progress bar
-                    st.progress(progress_percent / 100)
-                    st.write(f"**{step_name} ({progress_percent}%)**")
-                    
-                    if details:
-                        st.markdown(f'<div class="agent-current">{details}</div>', unsafe_allow_html=True)
-                    
-                    if results:
-                        st.session_state[session_key].append((step_name, results))
-                        
-                    # Display completed steps
-                    for completed_step, completed_result in st.session_state[session_key]:
-                        st.markdown(f'<div class="agent-completed">✅ {completed_step}: {completed_result}</div>', unsafe_allow_html=True)
-        
-        # Calculate real data for enhanced context
-        total_students = len(data)
-        key_metrics = ["current_gpa", "course_completion_rate", "engagement_score", "intervention_count"]
-        available_metrics = [col for col in key_metrics if col in data.columns]
-        
-        # Calculate enhanced higher education data insights
-        avg_gpa = data['current_gpa'].mean() if 'current_gpa' in data.columns else 0
-        avg_completion_rate = data['course_completion_rate'].mean() if 'course_completion_rate' in data.columns else 0
-        major_count = len(data['major_code'].unique()) if 'major_code' in data.columns else 0
-        student_count = len(data['student_id'].unique()) if 'student_id' in data.columns else 0
-        avg_engagement = data['engagement_score'].mean() if 'engagement_score' in data.columns else 0
-        at_risk_count = len(data[data['at_risk_flag'] == True]) if 'at_risk_flag' in data.columns else 0
-        
-        # Define enhanced agent workflows for each focus area
-        if focus_area == "Overall Performance":
-            steps = [
-                ("Student Success Data Initialization", 15, f"Loading comprehensive student academic dataset with enhanced validation across {total_students} student records and {major_count} academic programs", f"Connected to {len(available_metrics)} academic metrics across {len(data.columns)} total student success data dimensions"),
-                ("Academic Performance Assessment", 35, f"Advanced calculation of retention indicators with GPA analysis (avg GPA: {avg_gpa:.3f})", f"Computed academic metrics: {avg_gpa:.3f} avg GPA, {avg_completion_rate:.1%} completion rate, {avg_engagement:.1f} avg engagement score"),
-                ("Student Engagement Pattern Recognition", 55, f"Sophisticated identification of engagement performance patterns with academic correlation analysis across {major_count} academic majors", f"Detected significant patterns in {len(data['academic_standing'].unique()) if 'academic_standing' in data.columns else 'N/A'} academic standings with student correlation analysis completed"),
-                ("AI Student Success Intelligence Processing", 75, f"Processing comprehensive student data through {model_name} with advanced reasoning for retention efficiency insights", f"Enhanced AI analysis of student retention prediction effectiveness across {total_students} academic records completed"),
-                ("Academic Performance Report Compilation", 100, f"Professional student success analysis with evidence-based recommendations and actionable retention insights ready", f"Comprehensive academic performance report with {len(available_metrics)} student metrics analysis and retention recommendations generated")
-            ]
-            
-        elif focus_area == "Optimization Opportunities":
-            completed_courses = len(data[data['course_completion_rate'] > 0.8]) if 'course_completion_rate' in data.columns else 0
-            success_rate = (completed_courses / total_students) * 100 if total_students > 0 else 0
-            
-            steps = [
-                ("Student Success Optimization Data Preparation", 12, f"Advanced loading of academic performance data with enhanced validation across {total_students} students for retention improvement identification", f"Prepared {major_count} academic programs, {student_count} students for optimization analysis with {success_rate:.1f}% high completion rate"),
-                ("Academic Advising Inefficiency Detection", 28, f"Sophisticated analysis of advising scheduling and student engagement with evidence-based inefficiency identification", f"Identified optimization opportunities across {major_count} academic programs with student performance and advising gaps"),
-                ("Student Success Correlation Analysis", 45, f"Enhanced examination of relationships between academic standing, engagement scores, and intervention effectiveness", f"Analyzed correlations between academic activities and student performance across {total_students} student records"),
-                ("SIS/LMS Integration Optimization", 65, f"Comprehensive evaluation of student success integration with existing Banner, Canvas, and Turnitin systems", f"Assessed integration opportunities across {len(data.columns)} data points and student success system optimization needs"),
-                ("AI Student Success Intelligence", 85, f"Generating advanced retention optimization recommendations using {model_name} with higher education reasoning and implementation strategies", f"AI-powered student success optimization strategy across {major_count} academic areas and engagement improvements completed"),
-                ("Student Success Strategy Finalization", 100, f"Professional student success optimization report with prioritized implementation roadmap and retention impact analysis ready", f"Comprehensive optimization strategy with {len(available_metrics)} performance improvement areas and student success implementation plan generated")
-            ]
-            
-        elif focus_area == "Financial Impact":
-            total_aid_amount = data['financial_aid_amount'].sum() if 'financial_aid_amount' in data.columns else 0
-            avg_aid = data['financial_aid_amount'].mean() if 'financial_aid_amount' in data.columns else 0
-            
-            steps = [
-                ("Higher Education Financial Data Integration", 15, f"Advanced loading of student success financial data and tuition revenue metrics with enhanced validation across {total_students} students", f"Integrated student financial data: ${avg_aid:,.0f} avg financial aid, {at_risk_count} at-risk students across enrollment portfolio"),
-                ("Retention Revenue Calculation", 30, f"Sophisticated ROI metrics calculation with tuition revenue analysis and retention cost optimization", f"Computed comprehensive cost analysis: retention expenses, intervention costs, and ${total_aid_amount:,.0f} total financial aid optimization potential"),
-                ("Student Success Investment Assessment", 50, f"Enhanced analysis of retention revenue impact with student success metrics and tuition revenue correlation analysis", f"Assessed financial implications: {at_risk_count} at-risk students with {student_count} total students requiring retention optimization"),
-                ("Academic Resource Efficiency Analysis", 70, f"Comprehensive evaluation of resource allocation efficiency across academic programs with student lifecycle revenue optimization", f"Analyzed resource efficiency: {major_count} academic programs with student retention revenue protection opportunities identified"),
-                ("AI Higher Education Financial Modeling", 90, f"Advanced student success financial projections and retention ROI calculations using {model_name} with comprehensive higher education cost-benefit analysis", f"Enhanced financial impact analysis and forecasting across {len(available_metrics)} academic cost metrics completed"),
-                ("Student Success Economics Report Generation", 100, f"Professional higher education financial impact analysis with detailed retention ROI calculations and tuition revenue forecasting ready", f"Comprehensive student success financial report with ${total_aid_amount:,.0f} revenue optimization analysis and academic efficiency strategy generated")
-            ]
-            
-        elif focus_area == "Strategic Recommendations":
-            automation_efficiency_score = avg_engagement * 1.2 if avg_engagement > 0 else 0
-            
-            steps = [
-                ("Higher Education Technology Assessment", 15, f"Advanced loading of student success digital context with competitive positioning analysis across {total_students} students and {major_count} academic programs", f"Analyzed higher education technology landscape: {major_count} academic programs, {student_count} students, comprehensive academic digitization assessment completed"),
-                ("Student Success Competitive Advantage Analysis", 30, f"Sophisticated evaluation of competitive positioning against traditional reactive academic advising with AI-powered retention prediction effectiveness", f"Assessed competitive advantages: {automation_efficiency_score:.1f}% automation efficiency, {avg_engagement:.1f} engagement score vs manual methods"),
-                ("Advanced Academic Technology Integration", 50, f"Enhanced analysis of integration opportunities with predictive analytics, personalized learning, and digital student success technologies across {len(data.columns)} academic data dimensions", f"Identified strategic technology integration: adaptive learning platforms, predictive retention algorithms, automated academic intervention opportunities"),
-                ("Digital Student Success Strategy Development", 70, f"Comprehensive development of prioritized digital transformation roadmap with evidence-based academic technology adoption strategies", f"Created sequenced implementation plan across {major_count} academic areas with advanced technology integration opportunities"),
-                ("AI Higher Education Strategic Processing", 85, f"Advanced student success strategic recommendations using {model_name} with long-term competitive positioning and higher education technology analysis", f"Enhanced strategic analysis with student success competitive positioning and digital transformation roadmap completed"),
-                ("Digital Academic Transformation Report Generation", 100, f"Professional digital higher education transformation roadmap with competitive analysis and academic technology implementation plan ready for Provost executive review", f"Comprehensive strategic report with {major_count}-program implementation plan and student success competitive advantage analysis generated")
-            ]
-        
-        # NOW: Animate the progress with pre-calculated results
-        for step_name, progress_percent, details, results in steps:
-            update_progress(step_name, progress_percent, details, results)
-            time.sleep(1.2)
-        
-        return insights
-        
-    except Exception as e:
-        if progress_placeholder:
-            progress_placeholder.error(f"❌ Enhanced Agent Analysis failed: {str(e)}")
-        return f"Enhanced Agent Analysis failed: {str(e)}"
+configure(VERTICAL)
+
+# Startup profile - recorded once per browser session
+mark_first_paint(IMPORT_SECONDS, FIRST_PAINT_SECONDS)
+
+# Sampling notes shown under the charts they apply to, keyed by chart title
+chart_notes = {}
 
 def create_metrics_charts(data):
     """Create metric visualizations for the higher education data"""
@@ -321,9 +297,10 @@ def create_metrics_charts(data):
     
     # GPA Distribution
     if 'current_gpa' in data.columns:
-        gpa_chart = alt.Chart(data).mark_bar().encode(
-            alt.X('current_gpa:Q', bin=alt.Bin(maxbins=20), title='Current GPA'),
-            alt.Y('count()', title='Number of Students'),
+        gpa_chart = alt.Chart(histogram_data(data, 'current_gpa', 20)).mark_bar().encode(
+            alt.X('bin_start:Q', bin='binned', title='Current GPA'),
+            alt.X2('bin_end:Q'),
+            alt.Y('count:Q', title='Number of Students'),
             color=alt.value('#1f77b4')
         ).properties(
             title='GPA Distribution',
@@ -334,11 +311,7 @@ def create_metrics_charts(data):
     
     # Engagement Score by Academic Standing
     if 'engagement_score' in data.columns and 'academic_standing' in data.columns:
-        engagement_chart = alt.Chart(data).mark_boxplot().encode(
-            alt.X('academic_standing:N', title='Academic Standing'),
-            alt.Y('engagement_score:Q', title='Engagement Score'),
-            color=alt.Color('academic_standing:N', legend=None)
-        ).properties(
+        engagement_chart = boxplot_chart(*boxplot_data(data, 'academic_standing', 'engagement_score'), 'academic_standing', 'Academic Standing', 'Engagement Score').properties(
             title='Engagement by Standing',
             width=380,
             height=340
@@ -347,9 +320,14 @@ def create_metrics_charts(data):
     
     # Course Completion Rate Trends
     if 'course_completion_rate' in data.columns and 'enrollment_date' in data.columns:
-        completion_chart = alt.Chart(data).mark_line(point=True).encode(
-            alt.X('month(enrollment_date):O', title='Enrollment Month'),
-            alt.Y('mean(course_completion_rate):Q', title='Avg Completion Rate'),
+        completion_data = grouped_mean_data(
+            data.assign(enrollment_month=pd.to_datetime(data['enrollment_date'], errors='coerce').dt.strftime('%b')),
+            'enrollment_month', 'course_completion_rate'
+        )
+        month_order = [m for m in pd.date_range('2000-01-01', periods=12, freq='MS').strftime('%b') if m in set(completion_data['enrollment_month'])]
+        completion_chart = alt.Chart(completion_data).mark_line(point=True).encode(
+            alt.X('enrollment_month:O', title='Enrollment Month', sort=month_order),
+            alt.Y('course_completion_rate:Q', title='Avg Completion Rate'),
             color=alt.value('#ff7f0e')
         ).properties(
             title='Completion Rate Trends',
@@ -360,10 +338,10 @@ def create_metrics_charts(data):
     
     # At-Risk Student Distribution
     if 'at_risk_flag' in data.columns:
-        risk_chart = alt.Chart(data).mark_arc().encode(
-            theta=alt.Theta('count():Q'),
+        risk_chart = alt.Chart(materialized_value_counts('at_risk_flag').reset_index()).mark_arc().encode(
+            theta=alt.Theta('count:Q'),
             color=alt.Color('at_risk_flag:N', title='At Risk', scale=alt.Scale(range=['#2ca02c', '#d62728'])),
-            tooltip=['at_risk_flag:N', 'count():Q']
+            tooltip=['at_risk_flag:N', 'count:Q']
         ).properties(
             title='At-Risk Distribution',
             width=380,
@@ -373,12 +351,19 @@ def create_metrics_charts(data):
     
     # Financial Aid vs GPA Correlation
     if 'financial_aid_amount' in data.columns and 'current_gpa' in data.columns:
-        aid_chart = alt.Chart(data).mark_circle(size=80).encode(
-            alt.X('financial_aid_amount:Q', title='Financial Aid Amount ($)'),
-            alt.Y('current_gpa:Q', title='Current GPA'),
-            color=alt.Color('engagement_score:Q', title='Engagement', scale=alt.Scale(scheme='viridis')),
-            tooltip=['financial_aid_amount:Q', 'current_gpa:Q', 'engagement_score:Q']
-        ).properties(
+        points, sampling_note = scatter_rows(data, 'academic_standing')
+        if points is None:
+            aid_chart = density_chart(data, 'financial_aid_amount', 'current_gpa', 'Financial Aid Amount ($)', 'Current GPA')
+        else:
+            aid_chart = alt.Chart(points).mark_circle(size=80).encode(
+                alt.X('financial_aid_amount:Q', title='Financial Aid Amount ($)'),
+                alt.Y('current_gpa:Q', title='Current GPA'),
+                color=alt.Color('engagement_score:Q', title='Engagement', scale=alt.Scale(scheme='viridis')),
+                tooltip=['financial_aid_amount:Q', 'current_gpa:Q', 'engagement_score:Q']
+            )
+        if sampling_note:
+            chart_notes['Aid vs GPA Correlation'] = sampling_note
+        aid_chart = aid_chart.properties(
             title='Aid vs GPA Correlation',
             width=380,
             height=280
@@ -405,192 +390,7 @@ def create_metrics_charts(data):
     
     return charts
 
-def generate_insights(data, focus_area, model_name):
-    data_summary = f"Table: {table_name}\n"
-    data_summary += f"Description: {table_description}\n"
-    data_summary += f"Records analyzed: {len(data)}\n"
-
-    # Calculate basic statistics for numeric columns only - exclude ID columns
-    numeric_stats = {}
-    # Only include actual numeric metrics, not ID columns
-    key_metrics = ["current_gpa", "credit_hours_attempted", "credit_hours_earned", "financial_aid_amount", 
-                  "total_course_views", "assignment_submissions", "discussion_posts", "avg_assignment_score", 
-                  "course_completion_rate", "plagiarism_incidents", "writing_quality_score", 
-                  "engagement_score", "intervention_count"]
-    
-    # Filter to only columns that exist and are actually numeric
-    available_metrics = []
-    for col in key_metrics:
-        if col in data.columns:
-            try:
-                # Test if the column is actually numeric by trying to calculate mean
-                test_mean = pd.to_numeric(data[col], errors='coerce').mean()
-                if not pd.isna(test_mean):
-                    available_metrics.append(col)
-            except:
-                # Skip columns that can't be converted to numeric
-                continue
-    
-    for col in available_metrics:
-        try:
-            numeric_data = pd.to_numeric(data[col], errors='coerce')
-            numeric_stats[col] = {
-                "mean": numeric_data.mean(),
-                "min": numeric_data.min(),
-                "max": numeric_data.max(),
-                "std": numeric_data.std()
-            }
-            data_summary += f"- {col} (avg: {numeric_data.mean():.2f}, min: {numeric_data.min():.2f}, max: {numeric_data.max():.2f})\n"
-        except Exception as e:
-            # Skip columns that cause errors
-            continue
-
-    # Get top values for categorical columns
-    categorical_stats = {}
-    categorical_options = ["academic_standing", "major_code", "at_risk_flag"]
-    for cat_col in categorical_options:
-        if cat_col in data.columns:
-            try:
-                top = data[cat_col].value_counts().head(3)
-                categorical_stats[cat_col] = top.to_dict()
-                data_summary += f"\nTop {cat_col} values:\n" + "\n".join(f"- {k}: {v}" for k, v in top.items())
-            except:
-                # Skip columns that cause errors
-                continue
-
-    # Calculate correlations if enough numeric columns available
-    correlation_info = ""
-    if len(available_metrics) >= 2:
-        try:
-            # Create a dataframe with only the numeric columns
-            numeric_df = data[available_metrics].apply(pd.to_numeric, errors='coerce')
-            correlations = numeric_df.corr()
-            
-            # Get the top 3 strongest correlations (absolute value)
-            corr_pairs = []
-            for i in range(len(correlations.columns)):
-                for j in range(i+1, len(correlations.columns)):
-                    col1 = correlations.columns[i]
-                    col2 = correlations.columns[j]
-                    corr_value = correlations.iloc[i, j]
-                    if not pd.isna(corr_value):
-                        corr_pairs.append((col1, col2, abs(corr_value), corr_value))
-
-            # Sort by absolute correlation value
-            corr_pairs.sort(key=lambda x: x[2], reverse=True)
-
-            # Add top correlations to the summary
-            if corr_pairs:
-                correlation_info = "Top correlations between student metrics:\n"
-                for col1, col2, _, corr_value in corr_pairs[:3]:
-                    correlation_info += f"- {col1} and {col2}: r = {corr_value:.2f}\n"
-        except Exception as e:
-            correlation_info = "Could not calculate correlations between student metrics.\n"
-
-    # Define specific instructions for each focus area
-    focus_area_instructions = {
-        "Overall Performance": """
-        For the Overall Performance analysis of StudentSuccess:
-        1. Provide a comprehensive analysis of freshman retention using GPA, credit hours, engagement scores, and at-risk indicators
-        2. Identify significant patterns in academic performance, student engagement, and retention risk across different majors and academic standings
-        3. Highlight 3-5 key academic metrics that best indicate student success likelihood (GPA trends, course completion rates, engagement scores)
-        4. Discuss both strengths and areas for improvement in the AI-powered student success prediction system
-        5. Include 3-5 actionable insights for improving freshman retention based on the student data
-        
-        Structure your response with these higher education focused sections:
-        - Academic Performance Insights (5 specific insights with supporting GPA, credit hours, and engagement data)
-        - Student Engagement Trends (3-4 significant trends in course views, assignments, and discussion participation)
-        - Retention Risk Recommendations (3-5 data-backed recommendations for improving student success interventions)
-        - Implementation Steps (3-5 concrete next steps for advisors and student success coordinators)
-        """,
-        
-        "Optimization Opportunities": """
-        For the Optimization Opportunities analysis of StudentSuccess:
-        1. Focus specifically on areas where student success interventions and retention efforts can be improved
-        2. Identify inefficiencies in academic advising, student engagement tracking, and early warning systems
-        3. Analyze correlations between engagement metrics, academic performance, and intervention effectiveness
-        4. Prioritize optimization opportunities based on potential impact on retention rates and student outcomes
-        5. Suggest specific technical or process improvements for integration with existing SIS and LMS systems
-        
-        Structure your response with these higher education focused sections:
-        - Student Success Optimization Priorities (3-5 areas with highest retention improvement potential)
-        - Academic Impact Analysis (quantified benefits of addressing each opportunity in terms of GPA and retention metrics)
-        - Advising Strategy Enhancement (specific steps for academic advisors to implement each optimization)
-        - System Integration Recommendations (specific technical changes needed for seamless integration with Banner, Canvas, and Turnitin)
-        - Student Support Risk Assessment (potential challenges for students and advisors and how to mitigate them)
-        """,
-        
-        "Financial Impact": """
-        For the Financial Impact analysis of StudentSuccess:
-        1. Focus on cost-benefit analysis and ROI in higher education terms (tuition revenue protection vs. intervention costs)
-        2. Quantify financial impacts through retention improvements, reduced dropout costs, and increased enrollment efficiency
-        3. Identify revenue protection opportunities across different student populations and academic programs
-        4. Analyze resource allocation efficiency across different advisors and intervention strategies
-        5. Project future financial outcomes based on improved retention rates and expanding to other student populations
-        
-        Structure your response with these higher education focused sections:
-        - Tuition Revenue Analysis (breakdown of revenue protection and potential gains by retention improvements)
-        - Student Success Investment Impact (how improved early warning affects institutional costs and student outcomes)
-        - Higher Education ROI Calculation (specific calculations showing return on investment in terms of retained tuition revenue)
-        - Intervention Cost-Effectiveness (specific areas to optimize intervention spending for maximum retention impact)
-        - Enrollment Revenue Forecasting (projections based on improved retention rate metrics)
-        """,
-        
-        "Strategic Recommendations": """
-        For the Strategic Recommendations analysis of StudentSuccess:
-        1. Focus on long-term strategic implications for digital transformation in higher education student success
-        2. Identify competitive advantages against traditional reactive advising approaches
-        3. Suggest new directions for AI integration with emerging educational technologies (e.g., adaptive learning, predictive analytics)
-        4. Connect recommendations to broader institutional goals of improving graduation rates and student satisfaction
-        5. Provide a student success roadmap with prioritized initiatives
-        
-        Structure your response with these higher education focused sections:
-        - Digital Student Success Context (how StudentSuccess fits into broader digital transformation in higher education)
-        - Institutional Competitive Advantage Analysis (how to maximize retention advantages compared to traditional reactive methods)
-        - Academic Technology Strategic Priorities (3-5 high-impact strategic initiatives for improving student outcomes)
-        - Advanced Analytics Integration Vision (how to evolve StudentSuccess with predictive learning analytics over 1-3 years)
-        - Student Success Transformation Roadmap (sequenced steps for expanding to degree completion prediction and personalized learning pathways)
-        """
-    }
-
-    # Get the specific instructions for the selected focus area
-    selected_focus_instructions = focus_area_instructions.get(focus_area, "")
-
-    prompt = f'''
-    You are an expert data analyst specializing in {focus_area.lower()} analysis for higher education student success and retention.
-
-    SOLUTION CONTEXT:
-    {solution_name}
-
-    {solution_content}
-
-    DATA SUMMARY:
-    {data_summary}
-
-    {correlation_info}
-
-    ANALYSIS INSTRUCTIONS:
-    {selected_focus_instructions}
-
-    IMPORTANT GUIDELINES:
-    - Base all insights directly on the data provided
-    - Use specific metrics and numbers from the data in your analysis
-    - Maintain a professional, analytical tone
-    - Be concise but thorough in your analysis
-    - Focus specifically on {focus_area} as defined in the instructions
-    - Ensure your response is unique and tailored to this specific focus area
-    - Include a mix of observations, analysis, and actionable recommendations
-    - Use bullet points and clear section headers for readability
-    - Frame all insights in the context of higher education student success and freshman retention
-    '''
-
-    return call_cortex_model(prompt, model_name)
-
-# Load data
-data = load_data()
-if data.empty:
-    st.error("No data found.")
-    st.stop()
+data, dataset_profile = load_dataset()
 
 categorical_cols = [col for col in ["academic_standing", "major_code", "advisor_id"] if col in data.columns]
 numeric_cols = [col for col in ["current_gpa", "credit_hours_attempted", "credit_hours_earned", "financial_aid_amount", 
@@ -600,12 +400,12 @@ numeric_cols = [col for col in ["current_gpa", "credit_hours_attempted", "credit
 date_cols = [col for col in ["enrollment_date", "last_login_date", "last_updated"] if col in data.columns]
 
 sample_cols = data.columns.tolist()
-numeric_candidates = [col for col in sample_cols if data[col].dtype in ['float64', 'int64'] and 'id' not in col.lower()]
+numeric_candidates = dataset_profile["numeric_candidates"]
 date_candidates = [col for col in sample_cols if 'date' in col.lower() or 'timestamp' in col.lower()]
-cat_candidates = [col for col in sample_cols if data[col].dtype == 'object' and data[col].nunique() < 1000]
+cat_candidates = dataset_profile["cat_candidates"]
 
-# Four tabs - Metrics tab first, then AI Insights
-tabs = st.tabs(["📊 Metrics", "✨ AI Insights", "📁 Insights History", "🔍 Data Explorer"])
+# Five tabs - Metrics tab first, then AI Insights
+tabs = st.tabs(["📊 Metrics", "✨ AI Insights", "📁 Insights History", "🔍 Data Explorer", "🛠 Ops"])
 
 # ─────────────────────────────────────────────────────────
 # 📊 HED Metrics Tab — title clipping fixed (Altair offset + padding)
@@ -618,56 +418,28 @@ with tabs[0]:
     
     with col1:
         if 'current_gpa' in data.columns:
-            avg_gpa = data['current_gpa'].mean()
+            avg_gpa = kpi_value('avg_current_gpa')
             st.metric("Average GPA", f"{avg_gpa:.2f}", delta=f"{(avg_gpa - 3.0):.2f} vs 3.0 target")
     
     with col2:
         if 'course_completion_rate' in data.columns:
-            avg_completion = data['course_completion_rate'].mean()
+            avg_completion = kpi_value('avg_course_completion_rate')
             st.metric("Avg Completion Rate", f"{avg_completion:.1%}", delta=f"{(avg_completion - 0.85):.1%} vs 85% target")
     
     with col3:
         if 'engagement_score' in data.columns:
-            avg_engagement = data['engagement_score'].mean()
+            avg_engagement = kpi_value('avg_engagement_score')
             st.metric("Avg Engagement Score", f"{avg_engagement:.1f}", delta=f"{(avg_engagement - 70):.1f} vs 70 target")
     
     with col4:
         if 'at_risk_flag' in data.columns:
-            at_risk_pct = data['at_risk_flag'].mean()
+            at_risk_pct = kpi_value('at_risk_share')
             st.metric("At-Risk Students", f"{at_risk_pct:.1%}", delta=f"{(at_risk_pct - 0.30):.1%} vs 30% baseline")
     
     st.markdown("---")
     
-    # Create charts (existing helper, unchanged)
-    charts = create_metrics_charts(data)  # returns list of (title, alt.Chart)
-
-    # ---- Title clipping fix (Altair) ----
-    # 1) TitleParams with offset to push the title down
-    # 2) Extra top padding so the title never clips in Snowflake Streamlit
-    def _fixed_title(text: str) -> alt.TitleParams:
-        return alt.TitleParams(
-            text=text,
-            fontSize=16,
-            fontWeight='bold',
-            anchor='start',
-            offset=14  # key: moves the title downward
-        )
-
-    _PAD = {"top": 28, "left": 6, "right": 6, "bottom": 6}  # key: explicit headroom
-
-    charts_fixed = []
-    if charts:
-        for item in charts:
-            # Expected shape: (title_text, chart_object). Fallback if a bare chart arrives.
-            try:
-                t, ch = item
-            except Exception:
-                t, ch = "", item
-
-            # Apply offset + padding to every chart
-            ch = ch.properties(title=_fixed_title(t or ""), padding=_PAD)
-            ch = ch.configure_title(anchor='start')
-            charts_fixed.append((t, ch))
+    # Reruns reuse the finished Vega-Lite specs until the data snapshot changes
+    charts_fixed = list(metrics_chart_specs(create_metrics_charts, data, chart_notes, fixed_titles=True).items())
     
     if charts_fixed:
         st.subheader("📈 Performance Visualizations")
@@ -679,15 +451,19 @@ with tabs[0]:
             
             # Left column chart
             if i < num_charts:
-                _, chart = charts_fixed[i]
+                chart_name, chart = charts_fixed[i]
                 with cols[0]:
-                    st.altair_chart(chart, use_container_width=True)
+                    st.vega_lite_chart(chart, use_container_width=True)
+                    if chart_name in chart_notes:
+                        st.caption(chart_notes[chart_name])
             
             # Right column chart
             if i + 1 < num_charts:
-                _, chart = charts_fixed[i + 1]
+                chart_name, chart = charts_fixed[i + 1]
                 with cols[1]:
-                    st.altair_chart(chart, use_container_width=True)
+                    st.vega_lite_chart(chart, use_container_width=True)
+                    if chart_name in chart_notes:
+                        st.caption(chart_notes[chart_name])
         
         # Display chart count for debugging (unchanged)
         st.caption(f"Displaying {num_charts} performance charts")
@@ -700,7 +476,7 @@ with tabs[0]:
     st.subheader("📈 Summary Statistics")
     if numeric_candidates:
         # Create enhanced summary statistics
-        summary_stats = data[numeric_candidates].describe()
+        summary_stats = dataset_profile["describe"]
         
         # Transpose for better readability and add formatting
         summary_df = summary_stats.T.round(3)
@@ -713,7 +489,7 @@ with tabs[0]:
         
         with col1:
             st.markdown("**🎯 Key Academic Metrics**")
-            key_metrics = ['current_gpa', 'course_completion_rate', 'engagement_score', 'avg_assignment_score']
+            key_metrics = VERTICAL["summary_metrics"]
             key_metrics_present = [m for m in key_metrics if m in summary_df.index]
             
             if key_metrics_present:
@@ -791,107 +567,23 @@ with tabs[0]:
                 use_container_width=True
             )
 
+    # Full-table statistics from warehouse sketches, with their error bounds
+    render_table_sketch()
 
 # AI Insights tab
 with tabs[1]:
-    st.subheader("✨ AI-Powered Insights with Agent Workflows")
-    st.markdown("**Experience behind-the-scenes AI agent processing for each student success analysis focus area**")
-    
-    focus_area = st.radio("Focus Area", [
-        "Overall Performance", 
-        "Optimization Opportunities", 
-        "Financial Impact", 
-        "Strategic Recommendations"
-    ])
-    
-    # Show business challenge and solution
-    focus_info = get_focus_area_info(focus_area)
-    if focus_info["challenge"]:
-        st.markdown("#### Business Challenge")
-        st.info(focus_info["challenge"])
-        st.markdown("#### Agent Solution")
-        st.success(focus_info["solution"])
-    
-    st.markdown("**Select Snowflake Cortex Model for Analysis:**")
-    selected_model = st.selectbox("", MODELS, index=0, label_visibility="collapsed")
-
-    # Agent control buttons and status
-    col1, col2, col3 = st.columns([2, 1, 1])
-    
-    agent_running_key = f"{focus_area}_agent_running"
-    if agent_running_key not in st.session_state:
-        st.session_state[agent_running_key] = False
-    
-    with col1:
-        if st.button("🚀 Start Agent"):
-            st.session_state[agent_running_key] = True
-            st.rerun()
-    
-    with col2:
-        if st.button("⏹ Stop Agent"):
-            st.session_state[agent_running_key] = False
-            st.rerun()
-    
-    with col3:
-        st.markdown("**Status**")
-        if st.session_state[agent_running_key]:
-            st.markdown('<div class="agent-status-active">✅ Active</div>', unsafe_allow_html=True)
-        else:
-            st.markdown("⏸ Ready")
+    render_insights_tab(data, dataset_profile)
 
-    # Progress placeholder
-    progress_placeholder = st.empty()
-    
-    # Run agent if active
-    if st.session_state[agent_running_key]:
-        with st.spinner("Agent Running..."):
-            insights = generate_insights_with_agent_workflow(data, focus_area, selected_model, progress_placeholder)
-            
-            if insights:
-                # Show completion message
-                st.success(f"🎉 {focus_area} Agent completed with real student success data analysis!")
-                
-                # Show report in expandable section
-                with st.expander(f"📋 Generated {focus_area} Report (Real Higher Education Student Data)", expanded=True):
-                    st.markdown(f"""
-                    <div class="agent-report-header">
-                        <strong>{focus_area} Report - AI-Generated Student Success Analysis</strong><br>
-                        <small>Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}</small><br>
-                        <small>Data Source: Live Snowflake Student Success Analysis</small><br>
-                        <small>AI Model: {selected_model}</small>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    st.markdown(insights)
-                
-                # Save to history
-                timestamp = pd.Timestamp.now().strftime("%Y-%m-%d %H:%M")
-                st.session_state.insights_history.append({
-                    "timestamp": timestamp,
-                    "focus": focus_area,
-                    "insights": insights,
-                    "model": selected_model
-                })
-                
-                # Stop the agent after completion
-                st.session_state[agent_running_key] = False
-
-# Insights History tab (now third)
+# Insights History tab
 with tabs[2]:
-    st.subheader("📁 Insights History")
-    if st.session_state.insights_history:
-        for i, item in enumerate(reversed(st.session_state.insights_history)):
-            with st.expander(f"{item['timestamp']} - {item['focus']} ({item['model']})", expanded=False):
-                st.markdown(item["insights"])
-    else:
-        st.info("No insights generated yet. Go to the AI Insights tab to generate some insights.")
+    render_history_tab()
 
-# Data Explorer tab (now fourth)
+# Data Explorer tab (fourth)
 with tabs[3]:
-    st.subheader("🔍 Data Explorer")
-    rows_per_page = st.slider("Rows per page", 5, 50, 10)
-    page = st.number_input("Page", min_value=1, value=1)
-    start = (page - 1) * rows_per_page
-    end = min(start + rows_per_page, len(data))
-    st.dataframe(data.iloc[start:end], use_container_width=True)
-    st.caption(f"Showing rows {start + 1}–{end} of {len(data)}")
+    render_explorer_tab(data)
+
+# Ops tab - LLM latency, cache and error telemetry
+with tabs[4]:
+    render_ops_tab()
+
+finish_run(SCRIPT_STARTED, RUN_STARTED)
@@ -1,72 +1,28 @@
-import streamlit as st
-import pandas as pd
-import altair as alt
 import time
-import json
-import re
-from datetime import datetime
-from snowflake.snowpark.context import get_active_session
+
+# Startup profiler - everything below is timed from here
+SCRIPT_STARTED = time.perf_counter()
+
+import base64
+import os
+import sys
+import streamlit as st
+
+# Script start - used to measure how long each rerun takes
+RUN_STARTED = time.time()
+
+# Header logo - bundled in the app's images folder, so the header makes no remote request
+LOGO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images", "fivetran_logo.png")
+with open(LOGO_PATH, "rb") as logo_file:
+    LOGO_DATA_URI = "data:image/png;base64," + base64.b64encode(logo_file.read()).decode()
 
 st.set_page_config(
     page_title="pricepulse_–_ai_driven_dynamic_pricing",
-    page_icon="https://i.imgur.com/Og6gFnB.png",
+    page_icon=LOGO_PATH,
     layout="wide",
     initial_sidebar_state="expanded"
 )
 
-# Add CSS for agent progress styling
-st.markdown("""
-<style>
-.agent-current {
-    background-color: #e3f2fd;
-    border-left: 4px solid #2196f3;
-    padding: 10px;
-    margin: 5px 0;
-    border-radius: 5px;
-    font-weight: 500;
-}
-
-.agent-completed {
-    background-color: #e8f5e8;
-    border-left: 4px solid #4caf50;
-    padding: 8px;
-    margin: 3px 0;
-    border-radius: 5px;
-    font-size: 0.9em;
-    color: #2e7d32;
-}
-
-.agent-container {
-    background-color: #f8f9fa;
-    padding: 15px;
-    border-radius: 10px;
-    margin: 10px 0;
-    border: 1px solid #e0e0e0;
-}
-
-.agent-status-active {
-    color: #4CAF50;
-    font-weight: bold;
-    font-size: 1.1em;
-}
-
-.agent-button-container {
-    display: flex;
-    gap: 10px;
-    align-items: center;
-    margin: 10px 0;
-}
-
-.agent-report-header {
-    background-color: #f8f9fa;
-    padding: 10px;
-    border-radius: 5px;
-    margin: 10px 0;
-    border-left: 4px solid #2196F3;
-}
-</style>
-""", unsafe_allow_html=True)
-
 solution_name = '''Solution 1: PricePulse – AI-driven Dynamic Pricing'''
 solution_name_clean = '''pricepulse_–_ai_driven_dynamic_pricing'''
 table_name = '''RDP_RECORDS'''
@@ -106,7 +62,7 @@ solution_content = '''Solution 1: PricePulse – AI-driven Dynamic Pricing**
 # Display logo and title inline
 st.markdown(f'''
 <div style="display:flex; align-items:center; margin-bottom:15px">
-    <img src="https://i.imgur.com/Og6gFnB.png" width="100" style="margin-right:15px">
+    <img src="{LOGO_DATA_URI}" width="100" style="margin-right:15px">
     <div>
         <h1 style="font-size:2.2rem; margin:0; padding:0">{solution_name_clean.replace('_', ' ').title()}</h1>
         <p style="font-size:1.1rem; color:gray; margin:0; padding:0">Fivetran and Cortex-powered Streamlit in Snowflake data application for Retail</p>
@@ -114,230 +70,101 @@ st.markdown(f'''
 </div>
 ''', unsafe_allow_html=True)
 
-# Define available models as strings
-MODELS = [
-    "openai-gpt-oss-120b", "openai-gpt-4.1", "openai-gpt-5", "openai-gpt-5-mini", "openai-gpt-5-nano", "openai-gpt-5-chat", "claude-4-sonnet", "claude-3-7-sonnet", "claude-3-5-sonnet", "llama3.1-8b", "llama3.1-70b", "llama4-maverick", "llama4-scout", "llama3.2-1b", "snowflake-llama-3.1-405b", "snowflake-llama-3.3-70b", "mistral-large2", "mistral-7b", "deepseek-r1", "snowflake-arctic", "reka-flash", "jamba-instruct", "gemma-7b"
-]
-
-if 'insights_history' not in st.session_state:
-    st.session_state.insights_history = []
-
-if 'data_cache' not in st.session_state:
-    st.session_state.data_cache = {}
-
-# Initialize completed steps for each focus area
-focus_areas = ["Overall Performance", "Optimization Opportunities", "Financial Impact", "Strategic Recommendations"]
-for area in focus_areas:
-    if f'{area.lower().replace(" ", "_")}_completed_steps' not in st.session_state:
-        st.session_state[f'{area.lower().replace(" ", "_")}_completed_steps'] = []
-
-try:
-    session = get_active_session()
-except Exception as e:
-    st.error(f"❌ Error connecting to Snowflake: {str(e)}")
-    st.stop()
-
-def query_snowflake(query):
-    try:
-        return session.sql(query).to_pandas()
-    except Exception as e:
-        st.error(f"Query failed: {str(e)}")
-        return pd.DataFrame()
-
-def load_data():
-    query = f"SELECT * FROM {table_name} LIMIT 1000"
-    df = query_snowflake(query)
-    df.columns = [col.lower() for col in df.columns]
-    return df
-
-def call_cortex_model(prompt, model_name):
-    try:
-        cortex_query = "SELECT SNOWFLAKE.CORTEX.COMPLETE(?, ?) AS response"
-        response = session.sql(cortex_query, params=[model_name, prompt]).collect()[0][0]
-        return response
-    except Exception as e:
-        st.error(f"❌ Cortex error: {str(e)}")
-        return None
-
-def get_focus_area_info(focus_area):
-    """Get business challenge and agent solution for each focus area"""
-    
-    focus_info = {
-        "Overall Performance": {
-            "challenge": "Pricing managers manually review thousands of product prices and market conditions daily, spending 3+ hours analyzing competitor pricing, demand forecasts, and inventory levels to optimize pricing strategies and maximize revenue.",
-            "solution": "Autonomous dynamic pricing workflow that analyzes real-time market data, customer behavior, and inventory levels to generate AI-driven price recommendations with revenue optimization, demand forecasting, and automated price adjustments across all retail channels."
-        },
-        "Optimization Opportunities": {
-            "challenge": "Merchandising teams spend 4+ hours daily manually identifying inefficiencies in pricing strategies, inventory management, and customer segmentation across diverse product categories and sales channels.",
-            "solution": "AI-powered retail optimization analysis that automatically detects pricing inefficiencies, inventory optimization opportunities, and customer segment targeting improvements with specific implementation recommendations for POS and inventory management system integration."
-        },
-        "Financial Impact": {
-            "challenge": "Retail financial analysts manually calculate complex ROI metrics across pricing strategies and inventory management, requiring 3+ hours of financial modeling to assess dynamic pricing impact on revenue growth and cost reduction.",
-            "solution": "Automated retail financial analysis that calculates comprehensive ROI, identifies revenue optimization opportunities across product categories and customer segments, and projects pricing strategy benefits with detailed retail economics forecasting."
-        },
-        "Strategic Recommendations": {
-            "challenge": "Chief Executive Officers spend hours manually analyzing competitive positioning and developing strategic roadmaps for retail technology advancement and omnichannel pricing transformation initiatives.",
-            "solution": "Strategic retail intelligence workflow that analyzes competitive advantages against traditional fixed-pricing approaches, identifies emerging retail technology integration opportunities with IoT/AR, and creates prioritized omnichannel transformation roadmaps."
-        }
-    }
-    
-    return focus_info.get(focus_area, {"challenge": "", "solution": ""})
+# The header is drawn before pandas, altair, numpy and Snowpark are imported
+FIRST_PAINT_SECONDS = time.perf_counter() - SCRIPT_STARTED
 
-def generate_insights_with_agent_workflow(data, focus_area, model_name, progress_placeholder=None):
-    """Generate insights using AI agent workflow - Retail Dynamic Pricing focused version"""
-    
-    try:
-        # FIRST: Generate the actual insights (behind the scenes)
-        insights = generate_insights(data, focus_area, model_name)
-        
-        # THEN: Prepare for animation
-        session_key = f'{focus_area.lower().replace(" ", "_")}_completed_steps'
-        st.session_state[session_key] = []
-        
-        def update_progress(step_name, progress_percent, details, results):
-            """Update progress display with completed steps"""
-            if progress_placeholder:
-                with progress_placeholder.container():
-                    # Progress bar
-                    st.progress(progress_percent / 100)
-                    st.write(f"**{step_name} ({progress_percent}%)**")
-                    
-                    if details:
-                        st.markdown(f'<div class="agent-current">{details}</div>', unsafe_allow_html=True)
-                    
-                    if results:
-                        st.session_state[session_key].append((step_name, results))
-                        
-                    # Display completed steps
-                    for completed_step, completed_result in st.session_state[session_key]:
-                        st.markdown(f'<div class="agent-completed">✅ {completed_step}: {completed_result}</div>', unsafe_allow_html=True)
-        
-        # Calculate real data for enhanced context
-        total_products = len(data)
-        key_metrics = ["order_total", "product_price", "revenue_growth_rate", "customer_satisfaction_rate", "stockout_rate", "overstock_rate"]
-        available_metrics = [col for col in key_metrics if col in data.columns]
-        
-        # Calculate enhanced retail data insights
-        avg_revenue_growth = data['revenue_growth_rate'].mean() if 'revenue_growth_rate' in data.columns else 0
-        avg_price = data['product_price'].mean() if 'product_price' in data.columns else 0
-        product_categories = len(data['product_category'].unique()) if 'product_category' in data.columns else 0
-        customer_segments = len(data['customer_segment'].unique()) if 'customer_segment' in data.columns else 0
-        successful_optimizations = len(data[data['price_optimization_result'] == 'Success']) if 'price_optimization_result' in data.columns else 0
-        
-        # Define enhanced agent workflows for each focus area
-        if focus_area == "Overall Performance":
-            steps = [
-                ("Retail Pricing Data Initialization", 15, f"Loading comprehensive retail pricing dataset with enhanced validation across {total_products} products and {product_categories} product categories", f"Connected to {len(available_metrics)} pricing metrics across {len(data.columns)} total retail data dimensions"),
-                ("Dynamic Pricing Performance Assessment", 35, f"Advanced calculation of pricing optimization indicators with revenue analysis (avg revenue growth: {avg_revenue_growth:.1%})", f"Computed pricing metrics: {avg_revenue_growth:.1%} revenue growth, ${avg_price:.2f} avg price, {successful_optimizations} successful price optimizations"),
-                ("Retail Pattern Recognition", 55, f"Sophisticated identification of pricing effectiveness patterns with customer behavior correlation analysis across {customer_segments} customer segments", f"Detected significant patterns in {len(data['price_optimization_recommendation'].unique()) if 'price_optimization_recommendation' in data.columns else 'N/A'} pricing recommendations with market response analysis completed"),
-                ("AI Retail Intelligence Processing", 75, f"Processing comprehensive retail data through {model_name} with advanced reasoning for dynamic pricing optimization insights", f"Enhanced AI analysis of pricing strategy effectiveness across {total_products} retail products completed"),
-                ("Retail Performance Report Compilation", 100, f"Professional retail pricing analysis with evidence-based recommendations and actionable revenue optimization insights ready", f"Comprehensive retail performance report with {len(available_metrics)} pricing metrics analysis and dynamic pricing recommendations generated")
-            ]
-            
-        elif focus_area == "Optimization Opportunities":
-            avg_stockout = data['stockout_rate'].mean() if 'stockout_rate' in data.columns else 0
-            avg_overstock = data['overstock_rate'].mean() if 'overstock_rate' in data.columns else 0
-            
-            steps = [
-                ("Retail Optimization Data Preparation", 12, f"Advanced loading of retail pricing and inventory data with enhanced validation across {total_products} products for efficiency improvement identification", f"Prepared {product_categories} product categories, {customer_segments} customer segments for optimization analysis with {avg_stockout:.1%} stockout rate and {avg_overstock:.1%} overstock rate"),
-                ("Pricing Strategy Inefficiency Detection", 28, f"Sophisticated analysis of price elasticity and customer segmentation with evidence-based inefficiency identification", f"Identified optimization opportunities across {product_categories} product categories with pricing strategy gaps and inventory management issues"),
-                ("Retail Correlation Analysis", 45, f"Enhanced examination of relationships between price elasticity, customer segments, and purchasing behavior", f"Analyzed correlations between pricing strategies and customer response across {total_products} retail products"),
-                ("POS System Integration Optimization", 65, f"Comprehensive evaluation of dynamic pricing integration with existing Shopify, Square, and inventory management platforms", f"Assessed integration opportunities across {len(data.columns)} data points and retail system optimization needs"),
-                ("AI Retail Optimization Intelligence", 85, f"Generating advanced pricing strategy recommendations using {model_name} with retail reasoning and merchandising implementation strategies", f"AI-powered retail optimization strategy across {product_categories} product areas and pricing improvements completed"),
-                ("Retail Strategy Finalization", 100, f"Professional retail optimization report with prioritized implementation roadmap and pricing strategy impact analysis ready", f"Comprehensive optimization strategy with {len(available_metrics)} performance improvement areas and retail implementation plan generated")
-            ]
-            
-        elif focus_area == "Financial Impact":
-            avg_order_value = data['average_order_value'].mean() if 'average_order_value' in data.columns else 0
-            total_order_value = data['order_total'].sum() if 'order_total' in data.columns else 0
-            
-            steps = [
-                ("Retail Financial Data Integration", 15, f"Advanced loading of retail revenue data and pricing financial metrics with enhanced validation across {total_products} products", f"Integrated retail financial data: ${avg_order_value:.0f} avg order value, ${total_order_value:,.0f} total order value across product portfolio"),
-                ("Revenue Impact Calculation", 30, f"Sophisticated ROI metrics calculation with pricing strategy analysis and customer lifetime value enhancement", f"Computed comprehensive financial analysis: revenue growth impact, customer value optimization, and ${total_order_value:,.0f} total sales volume"),
-                ("Customer Value Financial Assessment", 50, f"Enhanced analysis of retail revenue impact with customer satisfaction metrics and pricing elasticity correlation analysis", f"Assessed financial implications: {avg_revenue_growth:.1%} revenue growth with {successful_optimizations} optimized pricing strategies driving customer value"),
-                ("Retail Portfolio Efficiency Analysis", 70, f"Comprehensive evaluation of resource allocation efficiency across product categories with inventory cost optimization", f"Analyzed retail efficiency: {product_categories} product categories with pricing optimization and inventory cost reduction opportunities identified"),
-                ("AI Retail Financial Modeling", 90, f"Advanced retail revenue projections and pricing ROI calculations using {model_name} with comprehensive retail cost-benefit analysis", f"Enhanced financial impact analysis and forecasting across {len(available_metrics)} retail revenue metrics completed"),
-                ("Retail Economics Report Generation", 100, f"Professional retail financial impact analysis with detailed pricing optimization ROI calculations and revenue forecasting ready", f"Comprehensive retail financial report with ${total_order_value:,.0f} revenue analysis and dynamic pricing strategy generated")
-            ]
-            
-        elif focus_area == "Strategic Recommendations":
-            pricing_effectiveness_score = (avg_revenue_growth * 100) + (successful_optimizations / total_products * 50) if total_products > 0 else 0
-            
-            steps = [
-                ("Retail Technology Assessment", 15, f"Advanced loading of retail technology context with competitive positioning analysis across {total_products} products and {product_categories} categories", f"Analyzed retail technology landscape: {product_categories} product categories, {customer_segments} customer segments, comprehensive dynamic pricing competitive assessment completed"),
-                ("Retail Competitive Advantage Analysis", 30, f"Sophisticated evaluation of competitive positioning against traditional fixed-pricing retail approaches with AI-powered dynamic pricing effectiveness", f"Assessed competitive advantages: {pricing_effectiveness_score:.1f}% pricing effectiveness, {avg_revenue_growth:.1%} revenue growth vs traditional pricing methods"),
-                ("Advanced Retail Technology Integration", 50, f"Enhanced analysis of integration opportunities with IoT sensors, AR customer experiences, and omnichannel retail technologies across {len(data.columns)} retail data dimensions", f"Identified strategic technology integration: IoT inventory monitoring, AR price comparison, omnichannel pricing synchronization opportunities"),
-                ("Omnichannel Retail Strategy Development", 70, f"Comprehensive development of prioritized retail transformation roadmap with evidence-based dynamic pricing adoption strategies", f"Created sequenced implementation plan across {product_categories} product areas with emerging retail technology integration opportunities"),
-                ("AI Retail Strategic Processing", 85, f"Advanced retail strategic recommendations using {model_name} with long-term competitive positioning and retail industry analysis", f"Enhanced strategic analysis with retail competitive positioning and omnichannel transformation roadmap completed"),
-                ("Digital Retail Report Generation", 100, f"Professional digital retail transformation roadmap with competitive analysis and dynamic pricing implementation plan ready for CEO executive review", f"Comprehensive strategic report with {product_categories}-category implementation plan and retail competitive advantage analysis generated")
-            ]
-        
-        # NOW: Animate the progress with pre-calculated results
-        for step_name, progress_percent, details, results in steps:
-            update_progress(step_name, progress_percent, details, results)
-            time.sleep(1.2)
-        
-        return insights
-        
-    except Exception as e:
-        if progress_placeholder:
-            progress_placeholder.error(f"❌ Enhanced Agent Analysis failed: {str(e)}")
-        return f"Enhanced Agent Analysis failed: {str(e)}"
-
-def generate_insights(data, focus_area, model_name):
-    data_summary = f"Table: {table_name}\n"
-    data_summary += f"Description: {table_description}\n"
-    data_summary += f"Records analyzed: {len(data)}\n"
-
-    # Calculate basic statistics for numeric columns
-    numeric_stats = {}
-    key_metrics = ["order_total", "product_price", "inventory_level", "customer_ltv", "order_frequency", "average_order_value", "product_rating", "product_review_count", "price_elasticity", "demand_forecast", "inventory_turnover", "stockout_rate", "overstock_rate", "revenue_growth_rate", "customer_satisfaction_rate"]
-    for col in key_metrics:
-        if col in data.columns:
-            numeric_stats[col] = {
-                "mean": data[col].mean(),
-                "min": data[col].min(),
-                "max": data[col].max(),
-                "std": data[col].std()
-            }
-            data_summary += f"- {col} (avg: {data[col].mean():.2f}, min: {data[col].min():.2f}, max: {data[col].max():.2f})\n"
-
-    # Get top values for categorical columns
-    categorical_stats = {}
-    categorical_options = ["order_id", "customer_id", "product_id", "customer_segment", "order_status", "product_category", "product_subcategory", "price_optimization_result", "price_optimization_recommendation"]
-    for cat_col in categorical_options:
-        if cat_col in data.columns:
-            top = data[cat_col].value_counts().head(3)
-            categorical_stats[cat_col] = top.to_dict()
-            data_summary += f"\nTop {cat_col} values:\n" + "\n".join(f"- {k}: {v}" for k, v in top.items())
-
-    # Calculate correlations if enough numeric columns available
-    correlation_info = ""
-    if len(key_metrics) >= 2:
-        try:
-            correlations = data[key_metrics].corr()
-            # Get the top 3 strongest correlations (absolute value)
-            corr_pairs = []
-            for i in range(len(correlations.columns)):
-                for j in range(i+1, len(correlations.columns)):
-                    col1 = correlations.columns[i]
-                    col2 = correlations.columns[j]
-                    corr_value = correlations.iloc[i, j]
-                    corr_pairs.append((col1, col2, abs(corr_value), corr_value))
-
-            # Sort by absolute correlation value
-            corr_pairs.sort(key=lambda x: x[2], reverse=True)
-
-            # Add top correlations to the summary
-            if corr_pairs:
-                correlation_info = "Top correlations between metrics:\n"
-                for col1, col2, _, corr_value in corr_pairs[:3]:
-                    correlation_info += f"- {col1} and {col2}: r = {corr_value:.2f}\n"
-        except:
-            correlation_info = "Could not calculate correlations between metrics.\n"
-
-    # Define specific instructions for each focus area
-    focus_area_instructions = {
+import pandas as pd
+import altair as alt
+
+# Shared engine - deployed next to this file on the stage; a checkout imports it from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from solution_engine import (
+    configure, finish_run, kpi_value, load_dataset, mark_first_paint, materialized_value_counts, metrics_chart_specs,
+    render_explorer_tab, render_history_tab, render_insights_tab, render_ops_tab, render_table_sketch, sample_points
+)
+
+IMPORT_SECONDS = time.perf_counter() - SCRIPT_STARTED - FIRST_PAINT_SECONDS
+
+def agent_steps(data, focus_area, model_name, profile):
+    """Name, progress and details of each agent workflow step for a focus area; the results come from the work itself"""
+
+    # Calculate real data for enhanced context
+    total_products = len(data)
+
+    # Calculate enhanced retail data insights
+    avg_revenue_growth = profile['means']['revenue_growth_rate'] if 'revenue_growth_rate' in data.columns else 0
+    product_categories = profile['distinct']['product_category'] if 'product_category' in data.columns else 0
+    customer_segments = profile['distinct']['customer_segment'] if 'customer_segment' in data.columns else 0
+
+    # Define enhanced agent workflows for each focus area
+    if focus_area == "Overall Performance":
+        steps = [
+            ("Retail Pricing Data Initialization", 15, f"Loading comprehensive retail pricing dataset with enhanced validation across {total_products} products and {product_categories} product categories"),
+            ("Dynamic Pricing Performance Assessment", 35, f"Advanced calculation of pricing optimization indicators with revenue analysis (avg revenue growth: {avg_revenue_growth:.1%})"),
+            ("Retail Pattern Recognition", 55, f"Sophisticated identification of pricing effectiveness patterns with customer behavior correlation analysis across {customer_segments} customer segments"),
+            ("AI Retail Intelligence Processing", 75, f"Processing comprehensive retail data through {model_name} with advanced reasoning for dynamic pricing optimization insights"),
+            ("Retail Performance Report Compilation", 100, f"Professional retail pricing analysis with evidence-based recommendations and actionable revenue optimization insights ready")
+        ]
+
+    elif focus_area == "Optimization Opportunities":
+        steps = [
+            ("Retail Optimization Data Preparation", 12, f"Advanced loading of retail pricing and inventory data with enhanced validation across {total_products} products for efficiency improvement identification"),
+            ("Pricing Strategy Inefficiency Detection", 28, f"Sophisticated analysis of price elasticity and customer segmentation with evidence-based inefficiency identification"),
+            ("Retail Correlation Analysis", 45, f"Enhanced examination of relationships between price elasticity, customer segments, and purchasing behavior"),
+            ("POS System Integration Optimization", 65, f"Comprehensive evaluation of dynamic pricing integration with existing Shopify, Square, and inventory management platforms"),
+            ("AI Retail Optimization Intelligence", 85, f"Generating advanced pricing strategy recommendations using {model_name} with retail reasoning and merchandising implementation strategies"),
+            ("Retail Strategy Finalization", 100, f"Professional retail optimization report with prioritized implementation roadmap and pricing strategy impact analysis ready")
+        ]
+
+    elif focus_area == "Financial Impact":
+        steps = [
+            ("Retail Financial Data Integration", 15, f"Advanced loading of retail revenue data and pricing financial metrics with enhanced validation across {total_products} products"),
+            ("Revenue Impact Calculation", 30, f"Sophisticated ROI metrics calculation with pricing strategy analysis and customer lifetime value enhancement"),
+            ("Customer Value Financial Assessment", 50, f"Enhanced analysis of retail revenue impact with customer satisfaction metrics and pricing elasticity correlation analysis"),
+            ("Retail Portfolio Efficiency Analysis", 70, f"Comprehensive evaluation of resource allocation efficiency across product categories with inventory cost optimization"),
+            ("AI Retail Financial Modeling", 90, f"Advanced retail revenue projections and pricing ROI calculations using {model_name} with comprehensive retail cost-benefit analysis"),
+            ("Retail Economics Report Generation", 100, f"Professional retail financial impact analysis with detailed pricing optimization ROI calculations and revenue forecasting ready")
+        ]
+
+    elif focus_area == "Strategic Recommendations":
+        steps = [
+            ("Retail Technology Assessment", 15, f"Advanced loading of retail technology context with competitive positioning analysis across {total_products} products and {product_categories} categories"),
+            ("Retail Competitive Advantage Analysis", 30, f"Sophisticated evaluation of competitive positioning against traditional fixed-pricing retail approaches with AI-powered dynamic pricing effectiveness"),
+            ("Advanced Retail Technology Integration", 50, f"Enhanced analysis of integration opportunities with IoT sensors, AR customer experiences, and omnichannel retail technologies across {len(data.columns)} retail data dimensions"),
+            ("Omnichannel Retail Strategy Development", 70, f"Comprehensive development of prioritized retail transformation roadmap with evidence-based dynamic pricing adoption strategies"),
+            ("AI Retail Strategic Processing", 85, f"Advanced retail strategic recommendations using {model_name} with long-term competitive positioning and retail industry analysis"),
+            ("Digital Retail Report Generation", 100, f"Professional digital retail transformation roadmap with competitive analysis and dynamic pricing implementation plan ready for CEO executive review")
+        ]
+
+    return steps
+
+# Vertical descriptor - the columns, KPIs, segments and prompts specific to this solution;
+# the shared engine in solution_engine.py reads vertical specifics only from here
+VERTICAL = {
+    "code": "RDP",
+    "table": table_name,
+    "table_description": table_description,
+    "solution_name": solution_name,
+    "solution_content": solution_content,
+    "key_metrics": ["order_total", "product_price", "inventory_level", "customer_ltv", "order_frequency", "average_order_value", "product_rating", "product_review_count", "price_elasticity", "demand_forecast", "inventory_turnover", "stockout_rate", "overstock_rate", "revenue_growth_rate", "customer_satisfaction_rate"],
+    "categorical_options": ["order_id", "customer_id", "product_id", "customer_segment", "order_status", "product_category", "product_subcategory", "price_optimization_result", "price_optimization_recommendation"],
+    "headline_metrics": ["order_total", "product_price", "revenue_growth_rate", "customer_satisfaction_rate", "stockout_rate", "overstock_rate"],
+    "kpis": {
+        "avg_revenue_growth_rate": ("revenue_growth_rate", "mean"),
+        "avg_overstock_rate": ("overstock_rate", "mean"),
+        "avg_stockout_rate": ("stockout_rate", "mean"),
+        "avg_customer_satisfaction_rate": ("customer_satisfaction_rate", "mean"),
+        "avg_product_price": ("product_price", "mean"),
+        "avg_average_order_value": ("average_order_value", "mean"),
+        "avg_price_elasticity": ("price_elasticity", "mean"),
+        "avg_inventory_turnover": ("inventory_turnover", "mean")
+    },
+    "chart_aggregates": ["price_optimization_result", "price_optimization_recommendation", "customer_segment", "product_category", "product_subcategory", "order_status"],
+    "segment_column": "product_category",
+    "analyst_domain": None,
+    "prompt_context": None,
+    "correlation_heading": "Top correlations between metrics:",
+    "focus_instructions": {
         "Overall Performance": """
         For the Overall Performance analysis of PricePulse:
         1. Provide a comprehensive analysis of the dynamic pricing system using revenue growth rate, customer satisfaction, and inventory metrics (stockout and overstock rates)
@@ -400,56 +227,381 @@ def generate_insights(data, focus_area, model_name):
         - Future Retail Technology Integration (how to evolve PricePulse with IoT and AR for enhanced customer experience over 1-3 years)
         - Omnichannel Pricing Roadmap (sequenced steps for implementing dynamic pricing across all retail channels)
         """
-    }
+    },
+    "insights_labels": {
+        "intro": "dynamic pricing analysis",
+        "completed": "retail pricing data",
+        "report": "Retail Dynamic Pricing Data",
+        "analysis": "Dynamic Pricing Analysis",
+        "source": "Retail Pricing Analysis"
+    },
+    "focus_info": {
+        "Overall Performance": {
+            "challenge": "Pricing managers manually review thousands of product prices and market conditions daily, spending 3+ hours analyzing competitor pricing, demand forecasts, and inventory levels to optimize pricing strategies and maximize revenue.",
+            "solution": "Autonomous dynamic pricing workflow that analyzes real-time market data, customer behavior, and inventory levels to generate AI-driven price recommendations with revenue optimization, demand forecasting, and automated price adjustments across all retail channels."
+        },
+        "Optimization Opportunities": {
+            "challenge": "Merchandising teams spend 4+ hours daily manually identifying inefficiencies in pricing strategies, inventory management, and customer segmentation across diverse product categories and sales channels.",
+            "solution": "AI-powered retail optimization analysis that automatically detects pricing inefficiencies, inventory optimization opportunities, and customer segment targeting improvements with specific implementation recommendations for POS and inventory management system integration."
+        },
+        "Financial Impact": {
+            "challenge": "Retail financial analysts manually calculate complex ROI metrics across pricing strategies and inventory management, requiring 3+ hours of financial modeling to assess dynamic pricing impact on revenue growth and cost reduction.",
+            "solution": "Automated retail financial analysis that calculates comprehensive ROI, identifies revenue optimization opportunities across product categories and customer segments, and projects pricing strategy benefits with detailed retail economics forecasting."
+        },
+        "Strategic Recommendations": {
+            "challenge": "Chief Executive Officers spend hours manually analyzing competitive positioning and developing strategic roadmaps for retail technology advancement and omnichannel pricing transformation initiatives.",
+            "solution": "Strategic retail intelligence workflow that analyzes competitive advantages against traditional fixed-pricing approaches, identifies emerging retail technology integration opportunities with IoT/AR, and creates prioritized omnichannel transformation roadmaps."
+        }
+    },
+    "agent_steps": agent_steps
+}
+
+configure(VERTICAL)
+
+# Startup profile - recorded once per browser session
+mark_first_paint(IMPORT_SECONDS, FIRST_PAINT_SECONDS)
+
+# Quadrant targets based on solution content
+target_revenue_growth = 0.08  # 8%
+target_satisfaction = 0.80 + (0.80 * 0.05)  # 80% baseline + 5% improvement = 84%
 
-    # Get the specific instructions for the selected focus area
-    selected_focus_instructions = focus_area_instructions.get(focus_area, "")
+def growth_quadrants(data):
+    """Products labelled by revenue growth and customer satisfaction quadrant, and the five best overall performers"""
+    # Create a copy of the data with just the columns we need
+    quadrant_data = data[['revenue_growth_rate', 'customer_satisfaction_rate', 'product_category', 'price_optimization_result']].copy()
 
-    prompt = f'''
-    You are an expert data analyst specializing in {focus_area.lower()} analysis.
+    # Calculate a performance score
+    quadrant_data['performance_score'] = (quadrant_data['revenue_growth_rate'] / target_revenue_growth + 
+                                         quadrant_data['customer_satisfaction_rate'] / target_satisfaction) / 2
 
-    SOLUTION CONTEXT:
-    {solution_name}
+    # Label quadrants
+    quadrant_data['quadrant'] = 'Q3: Low Growth, Low Satisfaction'  # default
 
-    {solution_content}
+    # Q1: High Growth, High Satisfaction (optimal)
+    mask_q1 = (quadrant_data['revenue_growth_rate'] >= target_revenue_growth) & (quadrant_data['customer_satisfaction_rate'] >= target_satisfaction)
+    quadrant_data.loc[mask_q1, 'quadrant'] = 'Q1: High Growth, High Satisfaction ✓'
 
-    DATA SUMMARY:
-    {data_summary}
+    # Q2: Low Growth, High Satisfaction
+    mask_q2 = (quadrant_data['revenue_growth_rate'] < target_revenue_growth) & (quadrant_data['customer_satisfaction_rate'] >= target_satisfaction)
+    quadrant_data.loc[mask_q2, 'quadrant'] = 'Q2: Low Growth, High Satisfaction'
 
-    {correlation_info}
+    # Q4: High Growth, Low Satisfaction
+    mask_q4 = (quadrant_data['revenue_growth_rate'] >= target_revenue_growth) & (quadrant_data['customer_satisfaction_rate'] < target_satisfaction)
+    quadrant_data.loc[mask_q4, 'quadrant'] = 'Q4: High Growth, Low Satisfaction'
 
-    ANALYSIS INSTRUCTIONS:
-    {selected_focus_instructions}
+    # Top performers - to highlight
+    top_performers = quadrant_data.sort_values('performance_score', ascending=False).head(5)
+    return quadrant_data, top_performers
 
-    IMPORTANT GUIDELINES:
-    - Base all insights directly on the data provided
-    - Use specific metrics and numbers from the data in your analysis
-    - Maintain a professional, analytical tone
-    - Be concise but thorough in your analysis
-    - Focus specifically on {focus_area} as defined in the instructions
-    - Ensure your response is unique and tailored to this specific focus area
-    - Include a mix of observations, analysis, and actionable recommendations
-    - Use bullet points and clear section headers for readability
-    '''
+# Sampling notes shown under the charts they apply to, keyed by chart id
+chart_notes = {}
 
-    return call_cortex_model(prompt, model_name)
+def create_metrics_charts(data):
+    """Metrics tab charts as (chart id, chart) pairs; the tab places each one by its id"""
+    charts = []
 
-data = load_data()
-if data.empty:
-    st.error("No data found.")
-    st.stop()
+    # Price Optimization Results Distribution
+    if 'price_optimization_result' in data.columns:
+        result_counts = materialized_value_counts('price_optimization_result').reset_index()
+        result_counts.columns = ['result', 'count']
+
+        # Result colors
+        colors = {
+            'Success': '#52BE80',  # Green
+            'Failure': '#E74C3C'   # Red
+        }
+
+        # Price Optimization Results Distribution Chart
+        chart = alt.Chart(result_counts).mark_bar().encode(
+            x=alt.X('result:N', title='Price Optimization Result', axis=alt.Axis(labelAngle=0)),
+            y=alt.Y('count:Q', title='Number of Products'),
+            color=alt.Color('result:N', scale=alt.Scale(domain=list(colors.keys()), range=list(colors.values())))
+        )
+
+        text = chart.mark_text(
+            align='center',
+            baseline='bottom',
+            dy=-10
+        ).encode(
+            text='count:Q'
+        )
+        charts.append(('Price Optimization Results Distribution', (chart + text).properties(height=300)))
+
+    # Price Recommendation Distribution
+    if 'price_optimization_recommendation' in data.columns:
+        recommendation_counts = materialized_value_counts('price_optimization_recommendation').reset_index()
+        recommendation_counts.columns = ['recommendation', 'count']
+
+        # Price Recommendation Distribution Chart
+        chart = alt.Chart(recommendation_counts).mark_bar().encode(
+            x=alt.X('recommendation:N', title='Price Recommendation', axis=alt.Axis(labelAngle=0)),
+            y=alt.Y('count:Q', title='Number of Products'),
+            color=alt.Color('recommendation:N', scale=alt.Scale(scheme='category10'))
+        )
+
+        text = chart.mark_text(
+            align='center',
+            baseline='bottom',
+            dy=-10
+        ).encode(
+            text='count:Q'
+        )
+        charts.append(('Price Recommendation Distribution', (chart + text).properties(height=300)))
+
+    # Customer Segment Distribution
+    if 'customer_segment' in data.columns:
+        segment_counts = materialized_value_counts('customer_segment').reset_index()
+        segment_counts.columns = ['segment', 'count']
+
+        # Define segment colors
+        segment_colors = {
+            'Low-Value': '#F4D03F',      # Yellow
+            'Medium-Value': '#5DADE2',   # Blue
+            'High-Value': '#52BE80'      # Green
+        }
+
+        # Customer Segment Distribution Chart
+        chart = alt.Chart(segment_counts).mark_bar().encode(
+            x=alt.X('segment:N', title='Customer Segment', axis=alt.Axis(labelAngle=0)),
+            y=alt.Y('count:Q', title='Number of Customers'),
+            color=alt.Color('segment:N', scale=alt.Scale(domain=list(segment_colors.keys()), range=list(segment_colors.values())))
+        )
+
+        text = chart.mark_text(
+            align='center',
+            baseline='bottom',
+            dy=-10
+        ).encode(
+            text='count:Q'
+        )
+        charts.append(('Customer Segment Distribution', (chart + text).properties(height=300)))
+
+    # Product Category Distribution
+    if 'product_category' in data.columns:
+        category_counts = materialized_value_counts('product_category').reset_index()
+        category_counts.columns = ['category', 'count']
+
+        # Product Category Distribution Chart
+        chart = alt.Chart(category_counts).mark_bar().encode(
+            y=alt.Y('category:N', title='Product Category', sort='-x'),
+            x=alt.X('count:Q', title='Number of Products'),
+            color=alt.Color('category:N', legend=None)
+        )
+
+        text = chart.mark_text(
+            align='left',
+            baseline='middle',
+            dx=3
+        ).encode(
+            text='count:Q'
+        )
+        charts.append(('Product Category Distribution', (chart + text).properties(height=300)))
+
+    # Top Product Subcategories
+    if 'product_subcategory' in data.columns:
+        subcategory_counts = materialized_value_counts('product_subcategory').head(10).reset_index()
+        subcategory_counts.columns = ['subcategory', 'count']
+
+        # Product Subcategory Distribution Chart
+        chart = alt.Chart(subcategory_counts).mark_bar().encode(
+            y=alt.Y('subcategory:N', title='Product Subcategory', sort='-x'),
+            x=alt.X('count:Q', title='Number of Products'),
+            color=alt.Color('subcategory:N', legend=None)
+        )
+
+        text = chart.mark_text(
+            align='left',
+            baseline='middle',
+            dx=3
+        ).encode(
+            text='count:Q'
+        )
+        charts.append(('Top Product Subcategories', (chart + text).properties(height=300)))
+
+    # Price Elasticity vs Inventory Turnover Analysis
+    if 'price_elasticity' in data.columns and 'inventory_turnover' in data.columns:
+        elasticity_turnover = data[['price_elasticity', 'inventory_turnover', 'product_category', 'price_optimization_recommendation']].copy()
+
+        # Create scatter plot
+        elasticity_points, sampling_note = sample_points(elasticity_turnover, 'product_category')
+        scatter = alt.Chart(elasticity_points).mark_circle(size=60).encode(
+            x=alt.X('price_elasticity:Q', title='Price Elasticity'),
+            y=alt.Y('inventory_turnover:Q', title='Inventory Turnover'),
+            color='product_category:N',
+            tooltip=['product_category', 'price_elasticity', 'inventory_turnover', 'price_optimization_recommendation']
+        ).interactive()
+        charts.append(('Price Elasticity vs Inventory Turnover Analysis', scatter))
+        if sampling_note:
+            chart_notes['Price Elasticity vs Inventory Turnover Analysis'] = sampling_note
+
+    # Revenue Growth vs Customer Satisfaction Quadrant
+    if 'revenue_growth_rate' in data.columns and 'customer_satisfaction_rate' in data.columns:
+        quadrant_data, top_performers = growth_quadrants(data)
+
+        # Create reference lines for targets
+        vline = alt.Chart(pd.DataFrame({'x': [target_revenue_growth]})).mark_rule(
+            color='gray', strokeDash=[5, 5]
+        ).encode(x='x:Q')
+
+        hline = alt.Chart(pd.DataFrame({'y': [target_satisfaction]})).mark_rule(
+            color='gray', strokeDash=[5, 5]
+        ).encode(y='y:Q')
+
+        # Annotations for quadrants
+        text_data = pd.DataFrame({
+            'revenue_growth_rate': [target_revenue_growth/2, target_revenue_growth*1.5, target_revenue_growth/2, target_revenue_growth*1.5],
+            'customer_satisfaction_rate': [target_satisfaction*1.05, target_satisfaction*1.05, target_satisfaction*0.95, target_satisfaction*0.95],
+            'label': ['Q2', 'Q1 (Optimal)', 'Q3', 'Q4']
+        })
+
+        text_chart = alt.Chart(text_data).mark_text(
+            align='center',
+            baseline='middle',
+            fontSize=14,
+            opacity=0.7
+        ).encode(
+            x='revenue_growth_rate:Q',
+            y='customer_satisfaction_rate:Q',
+            text='label:N'
+        )
+
+        # Main scatter plot
+        quadrant_points, sampling_note = sample_points(quadrant_data, 'quadrant')
+        scatter = alt.Chart(quadrant_points).mark_circle(
+            size=60,
+            opacity=0.6
+        ).encode(
+            x=alt.X('revenue_growth_rate:Q', 
+                   title='Revenue Growth Rate',
+                   scale=alt.Scale(domain=[0, max(quadrant_data['revenue_growth_rate'])*1.05])),
+            y=alt.Y('customer_satisfaction_rate:Q', 
+                   title='Customer Satisfaction Rate',
+                   scale=alt.Scale(domain=[0, max(quadrant_data['customer_satisfaction_rate'])*1.05])),
+            color=alt.Color('quadrant:N', 
+                          legend=alt.Legend(title="Performance Quadrant")),
+            tooltip=['product_category', 'revenue_growth_rate', 'customer_satisfaction_rate', 
+                    'price_optimization_result', 'quadrant']
+        )
+
+        # Highlight top performers
+        highlight = alt.Chart(top_performers).mark_circle(
+            size=100,
+            stroke='black',
+            strokeWidth=2
+        ).encode(
+            x='revenue_growth_rate:Q',
+            y='customer_satisfaction_rate:Q',
+            tooltip=['product_category', 'revenue_growth_rate', 'customer_satisfaction_rate', 
+                   'price_optimization_result', 'performance_score']
+        )
+
+        # Target labels
+        target_labels = alt.Chart(pd.DataFrame({
+            'x': [target_revenue_growth],
+            'y': [0],
+            'text': [f'Target: {target_revenue_growth:.0%}']
+        })).mark_text(
+            align='center',
+            baseline='top',
+            dy=10,
+            fontSize=10
+        ).encode(
+            x='x:Q',
+            y='y:Q',
+            text='text:N'
+        )
+
+        target_labels_y = alt.Chart(pd.DataFrame({
+            'x': [0],
+            'y': [target_satisfaction],
+            'text': [f'Target: {target_satisfaction:.0%}']
+        })).mark_text(
+            align='left',
+            baseline='middle',
+            dx=10,
+            fontSize=10
+        ).encode(
+            x='x:Q',
+            y='y:Q',
+            text='text:N'
+        )
+
+        # Combine all elements
+        chart = (scatter + highlight + vline + hline + text_chart + target_labels + target_labels_y).interactive()
+        charts.append(('Revenue Growth vs Customer Satisfaction Quadrant', chart))
+        if sampling_note:
+            chart_notes['Revenue Growth vs Customer Satisfaction Quadrant'] = sampling_note
+
+    # Order Status Distribution
+    if 'order_status' in data.columns:
+        status_counts = materialized_value_counts('order_status').reset_index()
+        status_counts.columns = ['status', 'count']
+
+        # Calculate percentages
+        total = status_counts['count'].sum()
+        status_counts['percentage'] = status_counts['count'] / total * 100
+        status_counts['label'] = status_counts['percentage'].apply(lambda x: f"{x:.1f}%")
+
+        # Define custom colors for each status
+        status_colors = {
+            'Delivered': '#52BE80',  # Green
+            'Shipped': '#5DADE2',    # Blue
+            'Pending': '#F4D03F',    # Yellow
+            'Cancelled': '#E74C3C'   # Red
+        }
+
+        # Create a more visually appealing horizontal bar chart with percentages
+        bars = alt.Chart(status_counts).mark_bar().encode(
+            y=alt.Y('status:N', title='Order Status', sort='-x'),
+            x=alt.X('percentage:Q', title='Percentage (%)'),
+            color=alt.Color('status:N', scale=alt.Scale(domain=list(status_colors.keys()), 
+                                                        range=list(status_colors.values()))),
+            tooltip=['status', 'count', alt.Tooltip('percentage:Q', format='.1f')]
+        )
+
+        # Add text labels showing percentage
+        text = bars.mark_text(
+            align='left',
+            baseline='middle',
+            dx=3,
+            fontSize=12
+        ).encode(
+            text='label:N'
+        )
+        charts.append(('Order Status Distribution', (bars + text).properties(height=300)))
+
+    # Stockout Rate by Category
+    if all(col in data.columns for col in ['stockout_rate', 'overstock_rate', 'inventory_turnover', 'product_category']):
+        # Calculate category-level inventory metrics
+        category_inventory = data.groupby('product_category')[['stockout_rate', 'overstock_rate', 'inventory_turnover']].mean().reset_index()
+
+        # Sort by stockout rate
+        category_inventory = category_inventory.sort_values('stockout_rate', ascending=False)
+
+        # Create a column chart for stockout rates by category
+        bar = alt.Chart(category_inventory).mark_bar().encode(
+            y=alt.Y('product_category:N', title='Product Category', sort='-x'),
+            x=alt.X('stockout_rate:Q', title='Stockout Rate'),
+            color=alt.Color('stockout_rate:Q', scale=alt.Scale(scheme='redblue', reverse=True)),
+            tooltip=['product_category', 'stockout_rate', 'overstock_rate', 'inventory_turnover']
+        )
+        charts.append(('Stockout Rate by Category', bar))
+
+    return charts
+
+data, dataset_profile = load_dataset()
 
 categorical_cols = [col for col in ["order_id", "customer_id", "product_id", "customer_segment", "order_status", "product_category", "product_subcategory", "price_optimization_result", "price_optimization_recommendation"] if col in data.columns]
 numeric_cols = [col for col in ["order_total", "product_price", "inventory_level", "customer_ltv", "order_frequency", "average_order_value", "product_rating", "product_review_count", "price_elasticity", "demand_forecast", "inventory_turnover", "stockout_rate", "overstock_rate", "revenue_growth_rate", "customer_satisfaction_rate"] if col in data.columns]
 date_cols = [col for col in ["order_date", "price_optimization_date"] if col in data.columns]
 
 sample_cols = data.columns.tolist()
-numeric_candidates = [col for col in sample_cols if data[col].dtype in ['float64', 'int64'] and 'id' not in col.lower()]
+numeric_candidates = dataset_profile["numeric_candidates"]
 date_candidates = [col for col in sample_cols if 'date' in col.lower() or 'timestamp' in col.lower()]
-cat_candidates = [col for col in sample_cols if data[col].dtype == 'object' and data[col].nunique() < 1000]
+cat_candidates = dataset_profile["cat_candidates"]
 
-# Four tabs - with Metrics as the first tab (Tab 0)
-tabs = st.tabs(["📊 Metrics", "✨ AI Insights", "📁 Insights History", "🔍 Data Explorer"])
+# Five tabs - with Metrics as the first tab (Tab 0)
+tabs = st.tabs(["📊 Metrics", "✨ AI Insights", "📁 Insights History", "🔍 Data Explorer", "🛠 Ops"])
 
 # Metrics Tab (Tab 0)
 with tabs[0]:
@@ -460,10 +612,10 @@ with tabs[0]:
     col1, col2, col3, col4 = st.columns(4)
     
     # Calculate metrics from the data
-    avg_revenue_growth = data['revenue_growth_rate'].mean() if 'revenue_growth_rate' in data.columns else 0
-    avg_overstock_rate = data['overstock_rate'].mean() if 'overstock_rate' in data.columns else 0
-    avg_stockout_rate = data['stockout_rate'].mean() if 'stockout_rate' in data.columns else 0
-    avg_customer_satisfaction = data['customer_satisfaction_rate'].mean() if 'customer_satisfaction_rate' in data.columns else 0
+    avg_revenue_growth = kpi_value('avg_revenue_growth_rate')
+    avg_overstock_rate = kpi_value('avg_overstock_rate')
+    avg_stockout_rate = kpi_value('avg_stockout_rate')
+    avg_customer_satisfaction = kpi_value('avg_customer_satisfaction_rate')
     
     # Targets based on solution content
     target_revenue_growth = 0.08  # 8% increase
@@ -519,19 +671,22 @@ with tabs[0]:
     
     with col1:
         with st.container(border=True):
-            avg_price = data['product_price'].mean() if 'product_price' in data.columns else 0
+            avg_price = kpi_value('avg_product_price')
             st.metric("Avg Product Price", f"${avg_price:.2f}")
         
     with col2:
         with st.container(border=True):
-            avg_order_value = data['average_order_value'].mean() if 'average_order_value' in data.columns else 0
+            avg_order_value = kpi_value('avg_average_order_value')
             st.metric("Avg Order Value", f"${avg_order_value:.2f}")
         
     with col3:
         with st.container(border=True):
-            avg_elasticity = data['price_elasticity'].mean() if 'price_elasticity' in data.columns else 0
+            avg_elasticity = kpi_value('avg_price_elasticity')
             st.metric("Avg Price Elasticity", f"{avg_elasticity:.4f}")
     
+    # Reruns reuse the finished Vega-Lite specs until the data snapshot changes
+    metrics_specs = metrics_chart_specs(create_metrics_charts, data, chart_notes)
+
     # Create two columns for charts
     col1, col2 = st.columns(2)
     
@@ -540,31 +695,7 @@ with tabs[0]:
         st.subheader("Price Optimization Results Distribution")
         
         if 'price_optimization_result' in data.columns:
-            result_counts = data['price_optimization_result'].value_counts().reset_index()
-            result_counts.columns = ['result', 'count']
-            
-            # Result colors
-            colors = {
-                'Success': '#52BE80',  # Green
-                'Failure': '#E74C3C'   # Red
-            }
-            
-            # Price Optimization Results Distribution Chart
-            chart = alt.Chart(result_counts).mark_bar().encode(
-                x=alt.X('result:N', title='Price Optimization Result', axis=alt.Axis(labelAngle=0)),
-                y=alt.Y('count:Q', title='Number of Products'),
-                color=alt.Color('result:N', scale=alt.Scale(domain=list(colors.keys()), range=list(colors.values())))
-            )
-            
-            text = chart.mark_text(
-                align='center',
-                baseline='bottom',
-                dy=-10
-            ).encode(
-                text='count:Q'
-            )
-            
-            st.altair_chart((chart + text).properties(height=300), use_container_width=True)
+            st.vega_lite_chart(metrics_specs['Price Optimization Results Distribution'], use_container_width=True)
         else:
             st.write("Price optimization result data not available")
     
@@ -573,25 +704,7 @@ with tabs[0]:
         st.subheader("Price Recommendation Distribution")
         
         if 'price_optimization_recommendation' in data.columns:
-            recommendation_counts = data['price_optimization_recommendation'].value_counts().reset_index()
-            recommendation_counts.columns = ['recommendation', 'count']
-            
-            # Price Recommendation Distribution Chart
-            chart = alt.Chart(recommendation_counts).mark_bar().encode(
-                x=alt.X('recommendation:N', title='Price Recommendation', axis=alt.Axis(labelAngle=0)),
-                y=alt.Y('count:Q', title='Number of Products'),
-                color=alt.Color('recommendation:N', scale=alt.Scale(scheme='category10'))
-            )
-            
-            text = chart.mark_text(
-                align='center',
-                baseline='bottom',
-                dy=-10
-            ).encode(
-                text='count:Q'
-            )
-            
-            st.altair_chart((chart + text).properties(height=300), use_container_width=True)
+            st.vega_lite_chart(metrics_specs['Price Recommendation Distribution'], use_container_width=True)
         else:
             st.write("Price optimization recommendation data not available")
     
@@ -599,32 +712,7 @@ with tabs[0]:
     st.subheader("Customer Segment Distribution")
     
     if 'customer_segment' in data.columns:
-        segment_counts = data['customer_segment'].value_counts().reset_index()
-        segment_counts.columns = ['segment', 'count']
-        
-        # Define segment colors
-        segment_colors = {
-            'Low-Value': '#F4D03F',      # Yellow
-            'Medium-Value': '#5DADE2',   # Blue
-            'High-Value': '#52BE80'      # Green
-        }
-        
-        # Customer Segment Distribution Chart
-        chart = alt.Chart(segment_counts).mark_bar().encode(
-            x=alt.X('segment:N', title='Customer Segment', axis=alt.Axis(labelAngle=0)),
-            y=alt.Y('count:Q', title='Number of Customers'),
-            color=alt.Color('segment:N', scale=alt.Scale(domain=list(segment_colors.keys()), range=list(segment_colors.values())))
-        )
-        
-        text = chart.mark_text(
-            align='center',
-            baseline='bottom',
-            dy=-10
-        ).encode(
-            text='count:Q'
-        )
-        
-        st.altair_chart((chart + text).properties(height=300), use_container_width=True)
+        st.vega_lite_chart(metrics_specs['Customer Segment Distribution'], use_container_width=True)
     else:
         st.write("Customer segment data not available")
     
@@ -639,25 +727,7 @@ with tabs[0]:
         st.subheader("Product Category Distribution")
         
         if 'product_category' in data.columns:
-            category_counts = data['product_category'].value_counts().reset_index()
-            category_counts.columns = ['category', 'count']
-            
-            # Product Category Distribution Chart
-            chart = alt.Chart(category_counts).mark_bar().encode(
-                y=alt.Y('category:N', title='Product Category', sort='-x'),
-                x=alt.X('count:Q', title='Number of Products'),
-                color=alt.Color('category:N', legend=None)
-            )
-            
-            text = chart.mark_text(
-                align='left',
-                baseline='middle',
-                dx=3
-            ).encode(
-                text='count:Q'
-            )
-            
-            st.altair_chart((chart + text).properties(height=300), use_container_width=True)
+            st.vega_lite_chart(metrics_specs['Product Category Distribution'], use_container_width=True)
         else:
             st.write("Product category data not available")
     
@@ -666,25 +736,7 @@ with tabs[0]:
         st.subheader("Top Product Subcategories")
         
         if 'product_subcategory' in data.columns:
-            subcategory_counts = data['product_subcategory'].value_counts().head(10).reset_index()
-            subcategory_counts.columns = ['subcategory', 'count']
-            
-            # Product Subcategory Distribution Chart
-            chart = alt.Chart(subcategory_counts).mark_bar().encode(
-                y=alt.Y('subcategory:N', title='Product Subcategory', sort='-x'),
-                x=alt.X('count:Q', title='Number of Products'),
-                color=alt.Color('subcategory:N', legend=None)
-            )
-            
-            text = chart.mark_text(
-                align='left',
-                baseline='middle',
-                dx=3
-            ).encode(
-                text='count:Q'
-            )
-            
-            st.altair_chart((chart + text).properties(height=300), use_container_width=True)
+            st.vega_lite_chart(metrics_specs['Top Product Subcategories'], use_container_width=True)
         else:
             st.write("Product subcategory data not available")
     
@@ -692,130 +744,15 @@ with tabs[0]:
     st.subheader("Revenue Growth vs Customer Satisfaction Quadrant Analysis")
     
     if 'revenue_growth_rate' in data.columns and 'customer_satisfaction_rate' in data.columns:
-        # Target values based on solution content
-        target_revenue_growth = 0.08  # 8%
-        target_satisfaction = 0.80 + (0.80 * 0.05)  # 80% baseline + 5% improvement = 84%
-        
-        # Create a copy of the data with just the columns we need
-        quadrant_data = data[['revenue_growth_rate', 'customer_satisfaction_rate', 'product_category', 'price_optimization_result']].copy()
-        
-        # Calculate a performance score
-        quadrant_data['performance_score'] = (quadrant_data['revenue_growth_rate'] / target_revenue_growth + 
-                                             quadrant_data['customer_satisfaction_rate'] / target_satisfaction) / 2
-        
-        # Label quadrants
-        quadrant_data['quadrant'] = 'Q3: Low Growth, Low Satisfaction'  # default
-        
-        # Q1: High Growth, High Satisfaction (optimal)
-        mask_q1 = (quadrant_data['revenue_growth_rate'] >= target_revenue_growth) & (quadrant_data['customer_satisfaction_rate'] >= target_satisfaction)
-        quadrant_data.loc[mask_q1, 'quadrant'] = 'Q1: High Growth, High Satisfaction ✓'
-        
-        # Q2: Low Growth, High Satisfaction
-        mask_q2 = (quadrant_data['revenue_growth_rate'] < target_revenue_growth) & (quadrant_data['customer_satisfaction_rate'] >= target_satisfaction)
-        quadrant_data.loc[mask_q2, 'quadrant'] = 'Q2: Low Growth, High Satisfaction'
-        
-        # Q4: High Growth, Low Satisfaction
-        mask_q4 = (quadrant_data['revenue_growth_rate'] >= target_revenue_growth) & (quadrant_data['customer_satisfaction_rate'] < target_satisfaction)
-        quadrant_data.loc[mask_q4, 'quadrant'] = 'Q4: High Growth, Low Satisfaction'
-        
-        # Top performers - to highlight
-        top_performers = quadrant_data.sort_values('performance_score', ascending=False).head(5)
-        
-        # Create reference lines for targets
-        vline = alt.Chart(pd.DataFrame({'x': [target_revenue_growth]})).mark_rule(
-            color='gray', strokeDash=[5, 5]
-        ).encode(x='x:Q')
-        
-        hline = alt.Chart(pd.DataFrame({'y': [target_satisfaction]})).mark_rule(
-            color='gray', strokeDash=[5, 5]
-        ).encode(y='y:Q')
-        
-        # Annotations for quadrants
-        text_data = pd.DataFrame({
-            'revenue_growth_rate': [target_revenue_growth/2, target_revenue_growth*1.5, target_revenue_growth/2, target_revenue_growth*1.5],
-            'customer_satisfaction_rate': [target_satisfaction*1.05, target_satisfaction*1.05, target_satisfaction*0.95, target_satisfaction*0.95],
-            'label': ['Q2', 'Q1 (Optimal)', 'Q3', 'Q4']
-        })
-        
-        text_chart = alt.Chart(text_data).mark_text(
-            align='center',
-            baseline='middle',
-            fontSize=14,
-            opacity=0.7
-        ).encode(
-            x='revenue_growth_rate:Q',
-            y='customer_satisfaction_rate:Q',
-            text='label:N'
-        )
-        
-        # Main scatter plot
-        scatter = alt.Chart(quadrant_data).mark_circle(
-            size=60,
-            opacity=0.6
-        ).encode(
-            x=alt.X('revenue_growth_rate:Q', 
-                   title='Revenue Growth Rate',
-                   scale=alt.Scale(domain=[0, max(quadrant_data['revenue_growth_rate'])*1.05])),
-            y=alt.Y('customer_satisfaction_rate:Q', 
-                   title='Customer Satisfaction Rate',
-                   scale=alt.Scale(domain=[0, max(quadrant_data['customer_satisfaction_rate'])*1.05])),
-            color=alt.Color('quadrant:N', 
-                          legend=alt.Legend(title="Performance Quadrant")),
-            tooltip=['product_category', 'revenue_growth_rate', 'customer_satisfaction_rate', 
-                    'price_optimization_result', 'quadrant']
-        )
-        
-        # Highlight top performers
-        highlight = alt.Chart(top_performers).mark_circle(
-            size=100,
-            stroke='black',
-            strokeWidth=2
-        ).encode(
-            x='revenue_growth_rate:Q',
-            y='customer_satisfaction_rate:Q',
-            tooltip=['product_category', 'revenue_growth_rate', 'customer_satisfaction_rate', 
-                   'price_optimization_result', 'performance_score']
-        )
-        
-        # Target labels
-        target_labels = alt.Chart(pd.DataFrame({
-            'x': [target_revenue_growth],
-            'y': [0],
-            'text': [f'Target: {target_revenue_growth:.0%}']
-        })).mark_text(
-            align='center',
-            baseline='top',
-            dy=10,
-            fontSize=10
-        ).encode(
-            x='x:Q',
-            y='y:Q',
-            text='text:N'
-        )
-        
-        target_labels_y = alt.Chart(pd.DataFrame({
-            'x': [0],
-            'y': [target_satisfaction],
-            'text': [f'Target: {target_satisfaction:.0%}']
-        })).mark_text(
-            align='left',
-            baseline='middle',
-            dx=10,
-            fontSize=10
-        ).encode(
-            x='x:Q',
-            y='y:Q',
-            text='text:N'
-        )
-        
-        # Combine all elements
-        chart = (scatter + highlight + vline + hline + text_chart + target_labels + target_labels_y).interactive()
-        
+        quadrant_data, _ = growth_quadrants(data)
+
         # Add metrics about quadrant distribution
         q1_pct = (quadrant_data['quadrant'] == 'Q1: High Growth, High Satisfaction ✓').mean() * 100
         
         # Show chart and metrics
-        st.altair_chart(chart, use_container_width=True)
+        st.vega_lite_chart(metrics_specs['Revenue Growth vs Customer Satisfaction Quadrant'], use_container_width=True)
+        if 'Revenue Growth vs Customer Satisfaction Quadrant' in chart_notes:
+            st.caption(chart_notes['Revenue Growth vs Customer Satisfaction Quadrant'])
         
         # Show quadrant distribution
         st.markdown(f"""
@@ -844,17 +781,9 @@ with tabs[0]:
     st.subheader("Price Elasticity vs Inventory Turnover Analysis")
     
     if 'price_elasticity' in data.columns and 'inventory_turnover' in data.columns:
-        elasticity_turnover = data[['price_elasticity', 'inventory_turnover', 'product_category', 'price_optimization_recommendation']].copy()
-        
-        # Create scatter plot
-        scatter = alt.Chart(elasticity_turnover).mark_circle(size=60).encode(
-            x=alt.X('price_elasticity:Q', title='Price Elasticity'),
-            y=alt.Y('inventory_turnover:Q', title='Inventory Turnover'),
-            color='product_category:N',
-            tooltip=['product_category', 'price_elasticity', 'inventory_turnover', 'price_optimization_recommendation']
-        ).interactive()
-        
-        st.altair_chart(scatter, use_container_width=True)
+        st.vega_lite_chart(metrics_specs['Price Elasticity vs Inventory Turnover Analysis'], use_container_width=True)
+        if 'Price Elasticity vs Inventory Turnover Analysis' in chart_notes:
+            st.caption(chart_notes['Price Elasticity vs Inventory Turnover Analysis'])
         
         # Analysis text
         st.markdown("""
@@ -870,47 +799,16 @@ with tabs[0]:
     st.subheader("Order Status Distribution")
     
     if 'order_status' in data.columns:
-        status_counts = data['order_status'].value_counts().reset_index()
+        status_counts = materialized_value_counts('order_status').reset_index()
         status_counts.columns = ['status', 'count']
-        
-        # Calculate percentages
         total = status_counts['count'].sum()
-        status_counts['percentage'] = status_counts['count'] / total * 100
-        status_counts['label'] = status_counts['percentage'].apply(lambda x: f"{x:.1f}%")
-        
-        # Define custom colors for each status
-        status_colors = {
-            'Delivered': '#52BE80',  # Green
-            'Shipped': '#5DADE2',    # Blue
-            'Pending': '#F4D03F',    # Yellow
-            'Cancelled': '#E74C3C'   # Red
-        }
-        
-        # Create a more visually appealing horizontal bar chart with percentages
-        bars = alt.Chart(status_counts).mark_bar().encode(
-            y=alt.Y('status:N', title='Order Status', sort='-x'),
-            x=alt.X('percentage:Q', title='Percentage (%)'),
-            color=alt.Color('status:N', scale=alt.Scale(domain=list(status_colors.keys()), 
-                                                        range=list(status_colors.values()))),
-            tooltip=['status', 'count', alt.Tooltip('percentage:Q', format='.1f')]
-        )
-        
-        # Add text labels showing percentage
-        text = bars.mark_text(
-            align='left',
-            baseline='middle',
-            dx=3,
-            fontSize=12
-        ).encode(
-            text='label:N'
-        )
         
         # Create a small dashboard with multiple related visualizations
         col1, col2 = st.columns([3, 1])
         
         with col1:
             # Show the improved bar chart
-            st.altair_chart((bars + text).properties(height=300), use_container_width=True)
+            st.vega_lite_chart(metrics_specs['Order Status Distribution'], use_container_width=True)
         
         with col2:
             # Add some key metrics in a visually appealing format
@@ -956,9 +854,9 @@ with tabs[0]:
         
         with col1:
             # Calculate inventory health metrics
-            avg_stockout = data['stockout_rate'].mean()
-            avg_overstock = data['overstock_rate'].mean()
-            avg_turnover = data['inventory_turnover'].mean()
+            avg_stockout = kpi_value('avg_stockout_rate')
+            avg_overstock = kpi_value('avg_overstock_rate')
+            avg_turnover = kpi_value('avg_inventory_turnover')
             
             # Display metrics
             st.metric("Average Inventory Turnover", f"{avg_turnover:.2f}", help="Higher is better")
@@ -976,124 +874,27 @@ with tabs[0]:
         
         with col2:
             if 'product_category' in data.columns:
-                # Calculate category-level inventory metrics
-                category_inventory = data.groupby('product_category')[['stockout_rate', 'overstock_rate', 'inventory_turnover']].mean().reset_index()
-                
-                # Sort by stockout rate
-                category_inventory = category_inventory.sort_values('stockout_rate', ascending=False)
-                
-                # Create a column chart for stockout rates by category
-                bar = alt.Chart(category_inventory).mark_bar().encode(
-                    y=alt.Y('product_category:N', title='Product Category', sort='-x'),
-                    x=alt.X('stockout_rate:Q', title='Stockout Rate'),
-                    color=alt.Color('stockout_rate:Q', scale=alt.Scale(scheme='redblue', reverse=True)),
-                    tooltip=['product_category', 'stockout_rate', 'overstock_rate', 'inventory_turnover']
-                )
-                
-                st.altair_chart(bar, use_container_width=True)
+                st.vega_lite_chart(metrics_specs['Stockout Rate by Category'], use_container_width=True)
     else:
         st.write("Inventory metrics data not available")
 
+    # Full-table statistics from warehouse sketches, with their error bounds
+    render_table_sketch()
+
 # AI Insights tab
 with tabs[1]:
-    st.subheader("✨ AI-Powered Insights with Agent Workflows")
-    st.markdown("**Experience behind-the-scenes AI agent processing for each dynamic pricing analysis focus area**")
-    
-    focus_area = st.radio("Focus Area", [
-        "Overall Performance", 
-        "Optimization Opportunities", 
-        "Financial Impact", 
-        "Strategic Recommendations"
-    ])
-    
-    # Show business challenge and solution
-    focus_info = get_focus_area_info(focus_area)
-    if focus_info["challenge"]:
-        st.markdown("#### Business Challenge")
-        st.info(focus_info["challenge"])
-        st.markdown("#### Agent Solution")
-        st.success(focus_info["solution"])
-    
-    st.markdown("**Select Snowflake Cortex Model for Analysis:**")
-    selected_model = st.selectbox("", MODELS, index=0, label_visibility="collapsed")
-
-    # Agent control buttons and status
-    col1, col2, col3 = st.columns([2, 1, 1])
-    
-    agent_running_key = f"{focus_area}_agent_running"
-    if agent_running_key not in st.session_state:
-        st.session_state[agent_running_key] = False
-    
-    with col1:
-        if st.button("🚀 Start Agent"):
-            st.session_state[agent_running_key] = True
-            st.rerun()
-    
-    with col2:
-        if st.button("⏹ Stop Agent"):
-            st.session_state[agent_running_key] = False
-            st.rerun()
-    
-    with col3:
-        st.markdown("**Status**")
-        if st.session_state[agent_running_key]:
-            st.markdown('<div class="agent-status-active">✅ Active</div>', unsafe_allow_html=True)
-        else:
-            st.markdown("⏸ Ready")
-
-    # Progress placeholder
-    progress_placeholder = st.empty()
-    
-    # Run agent if active
-    if st.session_state[agent_running_key]:
-        with st.spinner("Agent Running..."):
-            insights = generate_insights_with_agent_workflow(data, focus_area, selected_model, progress_placeholder)
-            
-            if insights:
-                # Show completion message
-                st.success(f"🎉 {focus_area} Agent completed with real retail pricing data analysis!")
-                
-                # Show report in expandable section
-                with st.expander(f"📋 Generated {focus_area} Report (Real Retail Dynamic Pricing Data)", expanded=True):
-                    st.markdown(f"""
-                    <div class="agent-report-header">
-                        <strong>{focus_area} Report - AI-Generated Dynamic Pricing Analysis</strong><br>
-                        <small>Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}</small><br>
-                        <small>Data Source: Live Snowflake Retail Pricing Analysis</small><br>
-                        <small>AI Model: {selected_model}</small>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    st.markdown(insights)
-                
-                # Save to history
-                timestamp = pd.Timestamp.now().strftime("%Y-%m-%d %H:%M")
-                st.session_state.insights_history.append({
-                    "timestamp": timestamp,
-                    "focus": focus_area,
-                    "insights": insights,
-                    "model": selected_model
-                })
-                
-                # Stop the agent after completion
-                st.session_state[agent_running_key] = False
+    render_insights_tab(data, dataset_profile)
 
 # Insights History tab
 with tabs[2]:
-    st.subheader("📁 Insights History")
-    if st.session_state.insights_history:
-        for i, item in enumerate(reversed(st.session_state.insights_history)):
-            with st.expander(f"{item['timestamp']} - {item['focus']} ({item['model']})", expanded=False):
-                st.markdown(item["insights"])
-    else:
-        st.info("No insights generated yet. Go to the AI Insights tab to generate some insights.")
+    render_history_tab()
 
-# Data Explorer tab
+# Data Explorer tab (fourth)
 with tabs[3]:
-    st.subheader("🔍 Data Explorer")
-    rows_per_page = st.slider("Rows per page", 5, 50, 10)
-    page = st.number_input("Page", min_value=1, value=1)
-    start = (page - 1) * rows_per_page
-    end = min(start + rows_per_page, len(data))
-    st.dataframe(data.iloc[start:end], use_container_width=True)
-    st.caption(f"Showing rows {start + 1}–{end} of {len(data)}")
+    render_explorer_tab(data)
+
+# Ops tab - LLM latency, cache and error telemetry
+with tabs[4]:
+    render_ops_tab()
+
+finish_run(SCRIPT_STARTED, RUN_STARTED)
@@ -0,0 +1,2486 @@
+import time
+import streamlit as st
+import pandas as pd
+import numpy as np
+import altair as alt
+import json
+import re
+import random
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from snowflake.snowpark.context import get_active_session
+
+try:
+    from snowflake.cortex import Complete
+except ImportError:
+    # snowflake-ml-python is not installed - streaming replays the SQL response instead
+    Complete = None
+
+# Shared engine for the solution apps - data versioning, caching, Cortex calls and the common tabs.
+# Each app_agent.py passes its VERTICAL descriptor to configure() at the top of every run.
+
+# Define available models as strings
+MODELS = [
+    "openai-gpt-oss-120b", "openai-gpt-4.1", "openai-gpt-5", "openai-gpt-5-mini", "openai-gpt-5-nano", "openai-gpt-5-chat", "claude-4-sonnet", "claude-3-7-sonnet", "claude-3-5-sonnet", "llama3.1-8b", "llama3.1-70b", "llama4-maverick", "llama4-scout", "llama3.2-1b", "snowflake-llama-3.1-405b", "snowflake-llama-3.3-70b", "mistral-large2", "mistral-7b", "deepseek-r1", "snowflake-arctic", "reka-flash", "jamba-instruct", "gemma-7b"
+]
+
+focus_areas = ["Overall Performance", "Optimization Opportunities", "Financial Impact", "Strategic Recommendations"]
+
+# Set by configure() - the vertical descriptor, its source table and the tables derived from it
+VERTICAL = {}
+table_name = None
+KPI_SUMMARY_TABLE = None
+LLM_CACHE_TABLE = None
+SEMANTIC_CACHE_TABLE = None
+TELEMETRY_TABLE = None
+session_pool = None
+session = None
+
+def configure(vertical):
+    """Register the app's vertical, connect to Snowflake and initialise this browser session's state"""
+    global VERTICAL, table_name, KPI_SUMMARY_TABLE, LLM_CACHE_TABLE, SEMANTIC_CACHE_TABLE, TELEMETRY_TABLE, session_pool, session
+    VERTICAL = vertical
+    table_name = vertical["table"]
+    KPI_SUMMARY_TABLE = f"{table_name}_KPI_SUMMARY"
+    LLM_CACHE_TABLE = f"{table_name}_LLM_CACHE"
+    SEMANTIC_CACHE_TABLE = f"{table_name}_LLM_SEMANTIC_CACHE"
+    TELEMETRY_TABLE = f"{table_name}_LLM_TELEMETRY"
+    init_session_state()
+    try:
+        session_pool = get_session_pool()
+        session = session_pool["sessions"][0]
+    except Exception as e:
+        st.error(f"❌ Error connecting to Snowflake: {str(e)}")
+        st.stop()
+    st.markdown(AGENT_STYLES, unsafe_allow_html=True)
+
+def init_session_state():
+    """Per-session state every section relies on, created on the first run of each browser session"""
+    if 'insights_history' not in st.session_state:
+        st.session_state.insights_history = []
+
+    if 'data_cache' not in st.session_state:
+        st.session_state.data_cache = {}
+
+    # Initialize completed steps for each focus area
+    for area in focus_areas:
+        if f'{area.lower().replace(" ", "_")}_completed_steps' not in st.session_state:
+            st.session_state[f'{area.lower().replace(" ", "_")}_completed_steps'] = []
+
+    if 'run_latencies' not in st.session_state:
+        st.session_state.run_latencies = []
+
+    if 'data_version' not in st.session_state:
+        st.session_state.data_version = {"snapshot_id": None, "marker": None, "row_count": None, "checked_at": 0.0}
+
+    if 'explorer_page_cache' not in st.session_state:
+        st.session_state.explorer_page_cache = OrderedDict()
+
+    if 'explorer_state' not in st.session_state:
+        st.session_state.explorer_state = {"signature": None, "page": 1, "cursors": {1: None}}
+
+    if 'explorer_counts' not in st.session_state:
+        st.session_state.explorer_counts = {}
+
+    if 'kpi_materialization' not in st.session_state:
+        st.session_state.kpi_materialization = {"summary": None, "snapshot_id": None}
+
+    if 'last_prompt_stats' not in st.session_state:
+        st.session_state.last_prompt_stats = None
+
+    if 'llm_cache' not in st.session_state:
+        st.session_state.llm_cache = OrderedDict()
+
+    if 'llm_cache_table_ready' not in st.session_state:
+        st.session_state.llm_cache_table_ready = None
+
+    if 'last_llm_cache_hit' not in st.session_state:
+        st.session_state.last_llm_cache_hit = False
+
+    if 'semantic_cache_threshold' not in st.session_state:
+        st.session_state.semantic_cache_threshold = SEMANTIC_CACHE_THRESHOLD
+
+    if 'semantic_cache_table_ready' not in st.session_state:
+        st.session_state.semantic_cache_table_ready = None
+
+    if 'last_semantic_hit' not in st.session_state:
+        st.session_state.last_semantic_hit = None
+
+    if 'semantic_embeddings' not in st.session_state:
+        st.session_state.semantic_embeddings = OrderedDict()
+
+    if 'insights_history_table_ready' not in st.session_state:
+        st.session_state.insights_history_table_ready = None
+
+    if 'history_state' not in st.session_state:
+        st.session_state.history_state = {"version": 0, "signature": None, "page": 1, "cursors": {1: None}}
+
+    if 'history_page_cache' not in st.session_state:
+        st.session_state.history_page_cache = OrderedDict()
+
+    if 'history_counts' not in st.session_state:
+        st.session_state.history_counts = {}
+
+    if 'telemetry' not in st.session_state:
+        st.session_state.telemetry = {
+            "session_id": hashlib.sha1(f"{time.time()}-{id(st.session_state)}".encode()).hexdigest()[:16],
+            "buffer": [],
+            "events": [],
+            "flushed_at": time.time(),
+            "table_ready": None,
+            "summaries": {}
+        }
+
+    if 'model_stats' not in st.session_state:
+        st.session_state.model_stats = {}
+
+    if 'last_model_used' not in st.session_state:
+        st.session_state.last_model_used = None
+
+# Add CSS for agent progress styling
+AGENT_STYLES = """
+<style>
+.agent-current {
+    background-color: #e3f2fd;
+    border-left: 4px solid #2196f3;
+    padding: 10px;
+    margin: 5px 0;
+    border-radius: 5px;
+    font-weight: 500;
+}
+
+.agent-completed {
+    background-color: #e8f5e8;
+    border-left: 4px solid #4caf50;
+    padding: 8px;
+    margin: 3px 0;
+    border-radius: 5px;
+    font-size: 0.9em;
+    color: #2e7d32;
+}
+
+.agent-container {
+    background-color: #f8f9fa;
+    padding: 15px;
+    border-radius: 10px;
+    margin: 10px 0;
+    border: 1px solid #e0e0e0;
+}
+
+.agent-status-active {
+    color: #4CAF50;
+    font-weight: bold;
+    font-size: 1.1em;
+}
+
+.agent-button-container {
+    display: flex;
+    gap: 10px;
+    align-items: center;
+    margin: 10px 0;
+}
+
+.agent-report-header {
+    background-color: #f8f9fa;
+    padding: 10px;
+    border-radius: 5px;
+    margin: 10px 0;
+    border-left: 4px solid #2196F3;
+}
+</style>
+"""
+
+# Session management - Streamlit in Snowflake provides one active session; local runs keep a warm pool
+SESSION_POOL_SIZE = 4
+RUN_LATENCY_WINDOW = 50
+
+def session_warmup_queries(columns):
+    """The sample, data version probe and watermark queries of the first render, in the exact text they are issued"""
+    queries = [sample_query(), data_version_query(columns)]
+    if DELTA_WATERMARK_COLUMN in columns:
+        queries.append(watermark_query())
+    return queries
+
+@st.cache_resource
+def open_session_pool(table, pool_size):
+    """Snowpark sessions for local runs from the [connections.snowflake] secrets, opened and warmed once per server
+    for each (table, pool size); table is the configured table_name, whose first-render queries seed the result cache"""
+    from snowflake.snowpark import Session
+    config = dict(st.secrets["connections"]["snowflake"])
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=pool_size) as executor:
+        sessions = list(executor.map(lambda _: Session.builder.configs(config).create(), range(pool_size)))
+    connected = time.time()
+
+    # Resume the warehouse and seed the result cache with the queries every first render issues
+    def warm(pooled, query):
+        try:
+            pooled.sql(query).collect()
+        except Exception:
+            pass
+    try:
+        columns = {field.name.strip('"').lower() for field in sessions[0].table(table).schema.fields}
+    except Exception:
+        columns = set()
+    warmup_queries = session_warmup_queries(columns)
+    with ThreadPoolExecutor(max_workers=len(warmup_queries)) as executor:
+        list(executor.map(warm, sessions, warmup_queries))
+    return {"sessions": sessions, "connect_seconds": connected - started, "warmup_seconds": time.time() - connected}
+
+def get_session_pool():
+    try:
+        return {"sessions": [get_active_session()], "connect_seconds": None, "warmup_seconds": None}
+    except Exception:
+        return open_session_pool(table_name, SESSION_POOL_SIZE)
+
+def run_concurrently(tasks):
+    """Run independent {name: fn(session)} queries on separate pooled sessions; returns each result or its exception"""
+    sessions = session_pool["sessions"]
+    items = [(name, task, sessions[i % len(sessions)]) for i, (name, task) in enumerate(tasks.items())]
+
+    def run(item):
+        name, task, pooled = item
+        try:
+            return name, task(pooled)
+        except Exception as e:
+            return name, e
+    if len(sessions) == 1 or len(items) == 1:
+        return dict(map(run, items))
+    with ThreadPoolExecutor(max_workers=min(len(sessions), len(items))) as executor:
+        return dict(executor.map(run, items))
+
+def query_snowflake(query):
+    try:
+        return session.sql(query).to_pandas()
+    except Exception as e:
+        st.error(f"Query failed: {str(e)}")
+        return pd.DataFrame()
+
+# Data version - a metadata-only probe of the source table; every cache keys on the snapshot id it returns
+DATA_VERSION_CHECK_SECONDS = 60
+DATA_VERSION_AUTO_REFRESH = True
+
+def data_version_marker(columns):
+    """SQL for the newest change in the table - Fivetran's sync time when present, else the record watermark"""
+    if "_fivetran_synced" in columns:
+        return "DATE_PART(epoch_millisecond, MAX(_fivetran_synced))::FLOAT"
+    if "last_updated_epoch" in columns:
+        return "MAX(last_updated_epoch)::FLOAT"
+    return "0::FLOAT"
+
+def data_version_query(columns):
+    return f"SELECT {data_version_marker(columns)}, COUNT(*) FROM {table_name}"
+
+def format_snapshot_id(marker, row_count):
+    return f"{0 if pd.isna(marker) else marker:.0f}:{int(row_count)}"
+
+def probe_data_version(max_age=DATA_VERSION_CHECK_SECONDS):
+    """Snapshot id of the source table, reusing a probe younger than max_age seconds"""
+    state = st.session_state.data_version
+    now = time.time()
+    if state["snapshot_id"] is not None and now - state["checked_at"] < max_age:
+        return state["snapshot_id"]
+    state["checked_at"] = now
+
+    table_columns = {col.lower() for col in get_table_columns()}
+    try:
+        # MAX and COUNT(*) are answered from micro-partition metadata, so the probe does not scan the table
+        marker, row_count = session.sql(data_version_query(table_columns)).collect()[0]
+    except Exception as e:
+        st.warning(f"Data version probe failed, caches are keyed on the loaded sample: {str(e)}")
+        return state["snapshot_id"]
+
+    snapshot_id = format_snapshot_id(marker, row_count)
+    if state["snapshot_id"] is not None and snapshot_id != state["snapshot_id"]:
+        # A new sync landed - Data Explorer pages and counts are not keyed on the snapshot, so drop them
+        st.session_state.explorer_page_cache.clear()
+        st.session_state.explorer_counts.clear()
+    state.update({"snapshot_id": snapshot_id, "marker": marker, "row_count": row_count})
+    return snapshot_id
+
+@st.fragment(run_every=DATA_VERSION_CHECK_SECONDS if DATA_VERSION_AUTO_REFRESH else None)
+def data_version_watcher():
+    """Re-probe the data version in the background and rerun the app once a new sync lands"""
+    previous = st.session_state.data_version["snapshot_id"]
+    # The full run has just probed, so only timer-driven runs of this fragment query the table
+    snapshot_id = probe_data_version(max_age=DATA_VERSION_CHECK_SECONDS / 2)
+    if previous is not None and snapshot_id != previous:
+        # Caches keyed on the old snapshot miss on the rerun; LLM reports and history are left as they are
+        st.session_state.data_version["refreshed"] = True
+        st.rerun(scope="app")
+    if st.session_state.data_version.pop("refreshed", False):
+        st.toast("🔄 New data synced - KPIs and charts refreshed")
+    checked_at = time.strftime('%H:%M:%S', time.localtime(st.session_state.data_version["checked_at"]))
+    mode = "live" if DATA_VERSION_AUTO_REFRESH else "auto-refresh off"
+    st.caption(f"🔄 Data snapshot {snapshot_id or 'unavailable'} · checked {checked_at} · {mode}")
+
+# Delta loading - after a sync only rows changed since the loaded watermark are fetched and upserted by key
+DATA_SAMPLE_ROWS = 1000
+DELTA_KEY_COLUMN = "record_id"
+DELTA_WATERMARK_COLUMN = "last_updated_epoch"
+DELTA_MAX_ROWS = 5000
+
+def sample_query():
+    return f"SELECT * FROM {table_name} LIMIT {DATA_SAMPLE_ROWS}"
+
+def watermark_query():
+    return f"SELECT MAX({DELTA_WATERMARK_COLUMN})::FLOAT FROM {table_name}"
+
+def read_watermark():
+    """Table-wide MAX of the watermark column (a metadata read), or None when the table has no such column"""
+    if DELTA_WATERMARK_COLUMN not in {col.lower() for col in get_table_columns()}:
+        return None
+    try:
+        return session.sql(watermark_query()).collect()[0][0]
+    except Exception:
+        return None
+
+def delta_query():
+    # >= re-reads rows at the watermark itself - rows committed later with the same value would be skipped by >
+    return (f"SELECT * FROM {table_name} WHERE {DELTA_WATERMARK_COLUMN} >= ? "
+            f"ORDER BY {DELTA_WATERMARK_COLUMN}, {DELTA_KEY_COLUMN} LIMIT {DELTA_MAX_ROWS + 1}")
+
+def fetch_delta(watermark):
+    """Rows changed at or after the watermark, newest version per key, or None when the change is too large to merge"""
+    query = delta_query()
+    try:
+        delta = session.sql(query, params=[float(watermark)]).to_pandas()
+    except Exception as e:
+        st.warning(f"Delta load failed, reloading the sample: {str(e)}")
+        return None
+    delta.columns = [col.lower() for col in delta.columns]
+    if len(delta) > DELTA_MAX_ROWS:
+        return None
+    # Rows re-read at the watermark replace themselves in merge_delta, so only duplicate keys need dropping here
+    return delta.drop_duplicates(DELTA_KEY_COLUMN, keep="last").reset_index(drop=True)
+
+def merge_delta(frame, delta):
+    """Upsert delta rows into the frame by key; returns the merged frame and the rows it removed and added"""
+    base = frame.set_index(DELTA_KEY_COLUMN, drop=False)
+    changes = delta.drop_duplicates(DELTA_KEY_COLUMN, keep="last").set_index(DELTA_KEY_COLUMN, drop=False)
+    replaced = base.index.isin(changes.index)
+    merged = pd.concat([base[~replaced], changes])
+    removed = base[replaced]
+    if len(merged) > DATA_SAMPLE_ROWS:
+        # Keep the sample bounded - the least recently updated rows make room for new ones
+        evicted = pd.to_numeric(merged[DELTA_WATERMARK_COLUMN], errors='coerce').nsmallest(len(merged) - DATA_SAMPLE_ROWS).index
+        removed = pd.concat([removed, merged.loc[evicted]])
+        merged = merged.drop(index=evicted)
+    return merged.reset_index(drop=True), removed.reset_index(drop=True), changes.reset_index(drop=True)
+
+def load_data():
+    """Sample rows for the current data version; after a sync only the changed rows are fetched and merged"""
+    snapshot_id = probe_data_version()
+    row_count = st.session_state.data_version["row_count"]
+    cached = st.session_state.data_cache.get("data")
+    if cached is not None and snapshot_id is not None and cached["snapshot_id"] == snapshot_id:
+        return cached["frame"]
+
+    df = None
+    # A shrinking table means deletes, which a delta cannot see
+    can_merge = (
+        cached is not None
+        and cached["snapshot_id"] is not None
+        and cached["watermark"] is not None
+        and snapshot_id is not None
+        and row_count >= cached["row_count"]
+    )
+    if can_merge:
+        delta = fetch_delta(cached["watermark"])
+        if delta is not None:
+            df, removed, added = merge_delta(cached["frame"], delta)
+            watermark = max(cached["watermark"], pd.to_numeric(added[DELTA_WATERMARK_COLUMN], errors='coerce').max()) if not added.empty else cached["watermark"]
+            st.session_state.data_cache["data_delta"] = {"from": cached["snapshot_id"], "to": snapshot_id, "removed": removed, "added": added}
+    if df is None:
+        # Read the watermark before the sample so rows changed in between are picked up by the next delta
+        watermark = read_watermark()
+        df = query_snowflake(sample_query())
+        df.columns = [col.lower() for col in df.columns]
+        st.session_state.data_cache.pop("data_delta", None)
+        if DELTA_KEY_COLUMN not in df.columns:
+            watermark = None
+    if not df.empty:
+        st.session_state.data_cache["data"] = {"snapshot_id": snapshot_id, "frame": df, "watermark": watermark, "row_count": row_count}
+    return df
+
+# Data Explorer paging - keyset pagination pushed down to Snowflake
+EXPLORER_KEY_CANDIDATES = ["record_id", "last_updated_epoch"]
+EXPLORER_PAGE_CACHE_SIZE = 24
+EXPLORER_OPERATORS = ["=", "!=", ">", ">=", "<", "<=", "contains"]
+
+def quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+def quote_literal(value):
+    """Single-quoted string literal, for SQL that cannot take bind variables such as a dynamic table definition"""
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "''") + "'"
+
+def get_table_columns():
+    """Column names of the source table, read once from table metadata"""
+    if 'table_columns' not in st.session_state:
+        try:
+            fields = session.table(table_name).schema.fields
+        except Exception as e:
+            st.error(f"Query failed: {str(e)}")
+            return []
+        st.session_state.table_columns = [field.name.strip('"') for field in fields]
+        st.session_state.numeric_table_columns = {
+            field.name.strip('"') for field in fields
+            if type(field.datatype).__name__ in ("DecimalType", "DoubleType", "FloatType", "LongType", "IntegerType", "ShortType", "ByteType")
+        }
+    return st.session_state.table_columns
+
+def find_key_column(columns):
+    lookup = {col.lower(): col for col in columns}
+    for candidate in EXPLORER_KEY_CANDIDATES:
+        if candidate in lookup:
+            return lookup[candidate]
+    return None
+
+def to_bind_value(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+def parse_number(value):
+    """int or float for a numeric filter value; ValueError when it is not a finite number"""
+    try:
+        return int(value)
+    except ValueError:
+        number = float(value)
+    if not np.isfinite(number):
+        raise ValueError(value)
+    return number
+
+def build_filter_clause(column, operator, value):
+    """SQL predicate and binds for the Data Explorer filter; ValueError when a numeric column gets a value that is not a number"""
+    if not column or value in (None, ""):
+        return "", []
+    if operator == "contains":
+        return f"CONTAINS(LOWER(TO_VARCHAR({quote_identifier(column)})), LOWER(?))", [value]
+    if column in st.session_state.get('numeric_table_columns', set()):
+        try:
+            value = parse_number(value)
+        except ValueError:
+            raise ValueError(f"'{value}' is not a number - {column.lower()} is numeric, so the filter needs a value like 42 or 12.5")
+    return f"{quote_identifier(column)} {operator} ?", [value]
+
+def build_keyset_clause(sort_column, key_column, descending, cursor):
+    """Seek predicate that continues after the last row of the previous page"""
+    if cursor is None:
+        return "", []
+    last_sort, last_key = cursor
+    cmp = "<" if descending else ">"
+    key = quote_identifier(key_column)
+    if sort_column == key_column:
+        return f"{key} {cmp} ?", [last_key]
+    sort = quote_identifier(sort_column)
+    if last_sort is None:
+        # NULLS LAST: once the cursor reaches the null block only the key orders rows
+        return f"({sort} IS NULL AND {key} {cmp} ?)", [last_key]
+    return f"({sort} {cmp} ? OR ({sort} = ? AND {key} {cmp} ?) OR {sort} IS NULL)", [last_sort, last_sort, last_key]
+
+def build_explorer_query(query_args, cursor):
+    columns, key_column, sort_column, descending, filter_clause, page_size = query_args
+    filter_sql, params = filter_clause
+    keyset_sql, keyset_params = build_keyset_clause(sort_column, key_column, descending, cursor)
+    conditions = [sql for sql in [filter_sql, keyset_sql] if sql]
+    direction = "DESC" if descending else "ASC"
+    order_by = [f"{quote_identifier(sort_column)} {direction} NULLS LAST"]
+    if sort_column != key_column:
+        order_by.append(f"{quote_identifier(key_column)} {direction}")
+    query = f"SELECT {', '.join(quote_identifier(col) for col in columns)} FROM {table_name}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    # One extra row tells us whether a next page exists without a COUNT
+    query += f" ORDER BY {', '.join(order_by)} LIMIT {int(page_size) + 1}"
+    return query, [to_bind_value(v) for v in params + keyset_params]
+
+def explorer_cache_get(cache_key):
+    cache = st.session_state.explorer_page_cache
+    if cache_key not in cache:
+        return None
+    cache.move_to_end(cache_key)
+    page = cache[cache_key]
+    if not isinstance(page, pd.DataFrame):
+        # Resolve a prefetch that was submitted with to_pandas(block=False)
+        try:
+            page = page.result()
+        except Exception:
+            del cache[cache_key]
+            return None
+        cache[cache_key] = page
+    return page
+
+def explorer_cache_put(cache_key, page):
+    cache = st.session_state.explorer_page_cache
+    cache[cache_key] = page
+    cache.move_to_end(cache_key)
+    while len(cache) > EXPLORER_PAGE_CACHE_SIZE:
+        cache.popitem(last=False)
+
+def fetch_explorer_page(signature, query_args, cursor):
+    cache_key = (signature, cursor)
+    page = explorer_cache_get(cache_key)
+    if page is None:
+        query, params = build_explorer_query(query_args, cursor)
+        try:
+            page = session.sql(query, params=params).to_pandas()
+        except Exception as e:
+            st.error(f"Query failed: {str(e)}")
+            return pd.DataFrame()
+        explorer_cache_put(cache_key, page)
+    return page
+
+def prefetch_explorer_page(signature, query_args, cursor):
+    cache_key = (signature, cursor)
+    if cache_key in st.session_state.explorer_page_cache:
+        return
+    query, params = build_explorer_query(query_args, cursor)
+    try:
+        explorer_cache_put(cache_key, session.sql(query, params=params).to_pandas(block=False))
+    except Exception:
+        # Prefetch is best effort; the page is fetched on demand instead
+        pass
+
+def build_count_query(filter_clause):
+    filter_sql, params = filter_clause
+    query = f"SELECT COUNT(*) FROM {table_name}" + (f" WHERE {filter_sql}" if filter_sql else "")
+    return (filter_sql, tuple(params)), query, [to_bind_value(v) for v in params]
+
+def count_explorer_rows(filter_clause):
+    count_key, query, params = build_count_query(filter_clause)
+    if count_key not in st.session_state.explorer_counts:
+        try:
+            st.session_state.explorer_counts[count_key] = session.sql(query, params=params).collect()[0][0]
+        except Exception as e:
+            st.error(f"Query failed: {str(e)}")
+            return None
+    return st.session_state.explorer_counts[count_key]
+
+def warm_explorer_queries(signature, query_args, cursor, filter_clause):
+    """Fetch an uncached page and its uncached row count at the same time on pooled sessions"""
+    cache_key = (signature, cursor)
+    count_key, count_query, count_params = build_count_query(filter_clause)
+    if cache_key in st.session_state.explorer_page_cache or count_key in st.session_state.explorer_counts:
+        return
+    page_query, page_params = build_explorer_query(query_args, cursor)
+    results = run_concurrently({
+        "page": lambda pooled: pooled.sql(page_query, params=page_params).to_pandas(),
+        "count": lambda pooled: pooled.sql(count_query, params=count_params).collect()[0][0]
+    })
+    # Failures are left to the regular fetch path, which reports them
+    if not isinstance(results["page"], Exception):
+        explorer_cache_put(cache_key, results["page"])
+    if not isinstance(results["count"], Exception):
+        st.session_state.explorer_counts[count_key] = results["count"]
+
+# KPI materialization - headline KPIs and chart aggregates kept in a Snowflake summary table
+
+def kpi_sql(column, agg, value=None):
+    if agg == "mean":
+        return f"AVG({column})"
+    if agg == "sum":
+        return f"SUM({column})"
+    if agg == "share_true":
+        return f"AVG(IFF({column}, 1, 0))"
+    if agg == "count_equal":
+        return f"COUNT_IF({column} = {quote_literal(value)})"
+    raise ValueError(f"Unknown KPI aggregate: {agg}")
+
+def current_dataset():
+    """The loaded sample and its profile for this session's current run"""
+    return st.session_state.data_cache["data"]["frame"], st.session_state.data_cache["dataset_profile"]
+
+def compute_kpi_locally(column, agg, value=None):
+    data, dataset_profile = current_dataset()
+    if column not in data.columns:
+        return 0
+    if agg == "count_equal":
+        return profile_count(dataset_profile, column, value)
+    totals = dataset_profile["sums"] if agg == "sum" else dataset_profile["means"]
+    return totals.get(column, 0)
+
+def build_kpi_summary_query(kpi_definitions, chart_aggregates, signature, marker_sql):
+    # The meta row records the data version the summary was built from, in the same form as the probe
+    parts = [f"SELECT 'meta' AS kind, 'source' AS name, '{signature}' AS group_value, {marker_sql} AS value, COUNT(*) AS row_count FROM {table_name}"]
+    for name, definition in kpi_definitions.items():
+        parts.append(f"SELECT 'kpi', '{name}', NULL, ({kpi_sql(*definition)})::FLOAT, COUNT(*) FROM {table_name}")
+    for column in chart_aggregates:
+        parts.append(f"SELECT 'count', '{column}', TO_VARCHAR({column}), COUNT(*)::FLOAT, COUNT(*) FROM {table_name} GROUP BY {column}")
+    return "\nUNION ALL\n".join(parts)
+
+def materialize_kpi_summary(query, replace):
+    """Create the summary as an incrementally refreshed dynamic table, or a plain table where that is not allowed.
+    The plain table has no incremental refresh - each refresh recomputes it with a full scan of the source table."""
+    if replace:
+        try:
+            warehouse = session.get_current_warehouse()
+            session.sql(f"CREATE OR REPLACE DYNAMIC TABLE {KPI_SUMMARY_TABLE} TARGET_LAG = 'DOWNSTREAM' WAREHOUSE = {warehouse} REFRESH_MODE = AUTO AS {query}").collect()
+        except Exception:
+            session.sql(f"CREATE OR REPLACE TABLE {KPI_SUMMARY_TABLE} AS {query}").collect()
+        return
+    try:
+        session.sql(f"ALTER DYNAMIC TABLE {KPI_SUMMARY_TABLE} REFRESH").collect()
+    except Exception:
+        session.sql(f"INSERT OVERWRITE INTO {KPI_SUMMARY_TABLE} {query}").collect()
+
+def refresh_kpi_materialization():
+    """Read the KPI summary once per data version, rebuilding it when it lags the probed snapshot"""
+    state = st.session_state.kpi_materialization
+    snapshot_id = st.session_state.data_version["snapshot_id"]
+    # Checked once per data version; without a version the KPIs come from the loaded sample
+    if snapshot_id is None or state["snapshot_id"] == snapshot_id:
+        return state["summary"]
+
+    table_columns = {col.lower() for col in get_table_columns()}
+    kpi_definitions = {name: definition for name, definition in VERTICAL["kpis"].items() if definition[0] in table_columns}
+    chart_aggregates = [col for col in VERTICAL["chart_aggregates"] if col in table_columns]
+    signature = hashlib.md5(repr((kpi_definitions, chart_aggregates)).encode()).hexdigest()[:12]
+    query = build_kpi_summary_query(kpi_definitions, chart_aggregates, signature, data_version_marker(table_columns))
+
+    try:
+        summary = session.sql(f"SELECT kind, name, group_value, value, row_count FROM {KPI_SUMMARY_TABLE}").to_pandas()
+        summary.columns = [col.lower() for col in summary.columns]
+    except Exception:
+        # The summary table does not exist yet
+        summary = None
+
+    meta = summary[summary['kind'] == 'meta'] if summary is not None else pd.DataFrame()
+    is_current = (
+        not meta.empty
+        and meta['group_value'].iloc[0] == signature
+        and format_snapshot_id(meta['value'].iloc[0], meta['row_count'].iloc[0]) == snapshot_id
+    )
+    if not is_current:
+        try:
+            materialize_kpi_summary(query, replace=meta.empty or meta['group_value'].iloc[0] != signature)
+            summary = session.sql(f"SELECT kind, name, group_value, value, row_count FROM {KPI_SUMMARY_TABLE}").to_pandas()
+            summary.columns = [col.lower() for col in summary.columns]
+        except Exception as e:
+            st.warning(f"KPI materialization unavailable, using sampled data: {str(e)}")
+            summary = None
+
+    state["summary"], state["snapshot_id"] = summary, snapshot_id
+    return summary
+
+def kpi_value(name):
+    """Materialized KPI over the full table, falling back to the loaded sample"""
+    summary = st.session_state.kpi_materialization["summary"]
+    if summary is not None:
+        row = summary[(summary['kind'] == 'kpi') & (summary['name'] == name)]
+        if not row.empty and not pd.isna(row['value'].iloc[0]):
+            return row['value'].iloc[0]
+    return compute_kpi_locally(*VERTICAL["kpis"][name])
+
+def materialized_value_counts(column):
+    """Drop-in for data[column].value_counts() served from the summary table"""
+    data, dataset_profile = current_dataset()
+    summary = st.session_state.kpi_materialization["summary"]
+    if summary is None or column not in data.columns:
+        return dataset_profile["value_counts"][column]
+    rows = summary[(summary['kind'] == 'count') & (summary['name'] == column) & summary['group_value'].notna()]
+    if rows.empty:
+        return dataset_profile["value_counts"][column]
+    # Map Snowflake's text group labels back onto the sample's native values (booleans, numbers)
+    native = {str(v).lower(): v for v in dataset_profile["value_counts"][column].index}
+    index = pd.Index([native.get(str(v).lower(), v) for v in rows['group_value']], name=column)
+    counts = pd.Series(rows['value'].astype(int).values, index=index, name='count')
+    return counts.sort_values(ascending=False)
+
+# Full-table sketches - approximate statistics computed in the warehouse with bounded memory
+SKETCH_QUANTILES = [0.25, 0.5, 0.75]
+SKETCH_TOP_K = 3
+SKETCH_COUNTERS = 10000
+HLL_RELATIVE_ERROR = 0.0162
+
+def build_sketch_query(numeric_columns, categorical_columns):
+    """One aggregate pass: t-digest quartiles, HyperLogLog distinct counts and space-saving top values"""
+    fields = [("rows", None, "COUNT(*)")]
+    for col in numeric_columns:
+        fields.append(("Min", col, f"MIN({col})::FLOAT"))
+        fields += [(q, col, f"APPROX_PERCENTILE({col}, {q})::FLOAT") for q in SKETCH_QUANTILES]
+        fields.append(("Max", col, f"MAX({col})::FLOAT"))
+        fields.append(("Mean", col, f"AVG({col})::FLOAT"))
+    for col in categorical_columns:
+        fields.append(("distinct", col, f"APPROX_COUNT_DISTINCT({col})"))
+        fields.append(("top", col, f"APPROX_TOP_K({col}, {SKETCH_TOP_K}, {SKETCH_COUNTERS})"))
+    select_list = ", ".join(f"{expr} AS s{i}" for i, (_, _, expr) in enumerate(fields))
+    return f"SELECT {select_list} FROM {table_name}", fields
+
+def get_table_sketch():
+    """Approximate full-table statistics, recomputed only when the data version changes"""
+    snapshot = current_data_snapshot()
+    cached = st.session_state.data_cache.get("table_sketch")
+    if cached is not None and cached[0] == snapshot:
+        return cached[1]
+
+    table_columns = {col.lower() for col in get_table_columns()}
+    numeric_columns = [col for col in VERTICAL["key_metrics"] if col in table_columns]
+    categorical_columns = [col for col in VERTICAL["categorical_options"] if col in table_columns]
+    query, fields = build_sketch_query(numeric_columns, categorical_columns)
+
+    sketch = None
+    try:
+        row = session.sql(query).collect()[0]
+        quantiles = {}
+        sketch = {"rows": int(row[0]), "distinct": {}, "top_values": {}}
+        for i, (stat, col, _) in enumerate(fields[1:], start=1):
+            if stat == "distinct":
+                sketch["distinct"][col] = int(row[i] or 0)
+            elif stat == "top":
+                sketch["top_values"][col] = [(value, int(count)) for value, count in json.loads(row[i] or "[]")]
+            else:
+                quantiles.setdefault(col, {})[stat] = row[i]
+        sketch["quantiles"] = pd.DataFrame.from_dict(quantiles, orient='index').rename(
+            columns={0.25: '25%', 0.5: '50% (Median)', 0.75: '75%'})
+        # Space-saving over-estimates any reported count by at most N / counters
+        sketch["top_k_error"] = sketch["rows"] / SKETCH_COUNTERS
+    except Exception as e:
+        st.warning(f"Full-table sketches unavailable: {str(e)}")
+        sketch = None
+
+    st.session_state.data_cache["table_sketch"] = (snapshot, sketch)
+    return sketch
+
+def format_sketch_summary(sketch, categorical_options):
+    lines = [f"\n\nFull table (approximate, {sketch['rows']:,} records):"]
+    for col in categorical_options:
+        if col in sketch["top_values"]:
+            top = ", ".join(f"{value}: ~{count:,}" for value, count in sketch["top_values"][col])
+            lines.append(f"- {col} (~{sketch['distinct'][col]:,} distinct): {top}")
+    return "\n".join(lines) + "\n"
+
+# Prompt budgeting - compact static context, count tokens and keep each prompt within a per-model budget
+# The default budget caps input cost per call; a model whose context window cannot hold it plus the report gets what fits
+DEFAULT_PROMPT_TOKEN_BUDGET = 3000
+RESPONSE_TOKEN_RESERVE = 2048
+MODEL_CONTEXT_TOKENS = {
+    "snowflake-arctic": 4096,
+    "gemma-7b": 8000
+}
+PROMPT_TOKEN_BUDGETS = {
+    model: min(DEFAULT_PROMPT_TOKEN_BUDGET, context - RESPONSE_TOKEN_RESERVE)
+    for model, context in MODEL_CONTEXT_TOKENS.items()
+}
+STATIC_PROMPT_SECTIONS = {"solution"}
+
+def estimate_tokens(text):
+    """Approximate token count (about four characters per token for English text)"""
+    return (len(text) + 3) // 4
+
+def compact_prompt_text(text):
+    lines = [line.strip() for line in text.replace("**", "").split("\n")]
+    lines = [line for line in lines if line != "---"]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+def summarize_static_context(text):
+    """Keep each paragraph's headings, first sentence and first two bullets"""
+    summary = []
+    for block in text.split("\n\n"):
+        lines = [line for line in block.split("\n") if line]
+        bullets = [line for line in lines if line.startswith(("•", "-"))]
+        headings = [line for line in lines if line not in bullets and (line.startswith("#") or line.endswith(":"))]
+        body = [line for line in lines if line not in bullets and line not in headings]
+        kept = headings
+        if body:
+            kept = kept + [re.split(r"(?<=[.!?])\s", " ".join(body), maxsplit=1)[0]]
+        summary.append("\n".join(kept + bullets[:2]))
+    return "\n\n".join(part for part in summary if part)
+
+def compact_static_section(text):
+    """Deduplicated and summarized forms of static context, computed once and reused by every prompt"""
+    cache = st.session_state.data_cache.setdefault("static_prompt_sections", {})
+    key = hashlib.sha1(text.encode()).hexdigest()
+    if key not in cache:
+        seen, lines = set(), []
+        for line in compact_prompt_text(text).split("\n"):
+            if line and line in seen:
+                continue
+            seen.add(line)
+            lines.append(line)
+        compact = "\n".join(lines)
+        cache[key] = (compact, summarize_static_context(compact))
+    return cache[key]
+
+def compose_prompt(sections, model_name=None):
+    """Join (name, text, priority) sections within the model's budget; priority 0 is kept, higher numbers go first"""
+    budget = PROMPT_TOKEN_BUDGETS.get(model_name, DEFAULT_PROMPT_TOKEN_BUDGET)
+    baseline_tokens = estimate_tokens("\n\n".join(text for _, text, _ in sections))
+    parts, summaries = {}, {}
+    for name, text, _ in sections:
+        if name in STATIC_PROMPT_SECTIONS:
+            parts[name], summaries[name] = compact_static_section(text)
+        else:
+            parts[name] = compact_prompt_text(text)
+
+    def total_tokens():
+        return estimate_tokens("\n\n".join(part for part in parts.values() if part))
+
+    actions = []
+    for name, _, priority in sorted(sections, key=lambda section: -section[2]):
+        if priority == 0 or total_tokens() <= budget:
+            break
+        if name in summaries and parts[name] != summaries[name]:
+            parts[name] = summaries[name]
+            actions.append(f"summarized {name}")
+            if total_tokens() <= budget:
+                break
+        parts[name] = ""
+        actions.append(f"dropped {name}")
+
+    prompt = "\n\n".join(part for part in parts.values() if part)
+    st.session_state.last_prompt_stats = {
+        "tokens": estimate_tokens(prompt),
+        "baseline_tokens": baseline_tokens,
+        "budget": budget,
+        "actions": actions
+    }
+    return prompt
+
+def prompt_stats_caption():
+    stats = st.session_state.last_prompt_stats
+    saved = stats["baseline_tokens"] - stats["tokens"]
+    caption = (f"🧮 Prompt: ~{stats['tokens']:,} tokens (budget {stats['budget']:,}) · "
+               f"saved ~{saved:,} tokens ({saved / max(stats['baseline_tokens'], 1):.0%})")
+    if stats["actions"]:
+        caption += " · " + ", ".join(stats["actions"])
+    return caption
+
+# Data profiling - one vectorized pass over the sample, reusable across focus areas
+def build_data_profile(data, key_metrics, categorical_options):
+    """Numeric moments, top categorical values and strongest correlations for the prompt"""
+    metrics = [col for col in key_metrics if col in data.columns]
+    # Coerce every metric once; columns with no numeric values at all are dropped
+    numeric_df = data[metrics].apply(pd.to_numeric, errors='coerce').dropna(axis=1, how='all')
+    moments = numeric_df.agg(['mean', 'min', 'max', 'std']).T
+
+    categories = [col for col in categorical_options if col in data.columns]
+    top_categories = {}
+    if categories:
+        stacked = data[categories].melt(var_name='_column', value_name='_value').dropna()
+        counts = stacked.groupby(['_column', '_value'], sort=False).size().sort_values(ascending=False, kind='stable')
+        for (column, value), count in counts.groupby(level='_column', sort=False).head(3).items():
+            top_categories.setdefault(column, {})[value] = count
+        top_categories = {col: top_categories[col] for col in categories if col in top_categories}
+
+    top_correlations = []
+    if numeric_df.shape[1] >= 2:
+        corr = numeric_df.corr().to_numpy()
+        rows, cols = np.triu_indices_from(corr, k=1)
+        values = corr[rows, cols]
+        valid = ~np.isnan(values)
+        rows, cols, values = rows[valid], cols[valid], values[valid]
+        for k in np.argsort(-np.abs(values), kind='stable')[:3]:
+            top_correlations.append((numeric_df.columns[rows[k]], numeric_df.columns[cols[k]], values[k]))
+
+    return {
+        "records": len(data),
+        "moments": moments,
+        "top_categories": top_categories,
+        "top_correlations": top_correlations
+    }
+
+def format_profile_summary(profile):
+    data_summary = f"Table: {table_name}\n"
+    data_summary += f"Description: {VERTICAL['table_description']}\n"
+    data_summary += f"Records analyzed: {profile['records']}\n"
+    for col, stats in profile["moments"].iterrows():
+        data_summary += f"- {col} (avg: {stats['mean']:.2f}, min: {stats['min']:.2f}, max: {stats['max']:.2f})\n"
+    for col, top in profile["top_categories"].items():
+        data_summary += f"\nTop {col} values:\n" + "\n".join(f"- {k}: {v}" for k, v in top.items())
+    return data_summary
+
+def format_correlation_info(profile, heading="Top correlations between metrics:"):
+    if not profile["top_correlations"]:
+        return ""
+    return heading + "\n" + "".join(f"- {col1} and {col2}: r = {corr_value:.2f}\n" for col1, col2, corr_value in profile["top_correlations"])
+
+# Dataset profile - computed once per data snapshot and shared by charts, KPIs and prompts
+def compute_snapshot_id(data):
+    """Content hash of the loaded sample"""
+    try:
+        hashed = pd.util.hash_pandas_object(data, index=False)
+    except TypeError:
+        # Semi-structured cells (dicts, lists) are not hashable - hash their text form
+        hashed = pd.util.hash_pandas_object(data.astype(str), index=False)
+    digest = hashlib.sha1(hashed.to_numpy().tobytes())
+    digest.update("|".join(data.columns).encode())
+    return digest.hexdigest()
+
+def build_dataset_profile(data):
+    numeric = {}
+    for col in data.columns:
+        try:
+            values = pd.to_numeric(data[col], errors='coerce')
+        except (TypeError, ValueError):
+            continue
+        if values.notna().any():
+            numeric[col] = values
+    numeric_frame = pd.DataFrame(numeric, index=data.index)
+
+    value_counts = {}
+    for col in data.columns:
+        try:
+            value_counts[col] = data[col].value_counts()
+        except TypeError:
+            continue
+    distinct = pd.Series({col: len(counts) for col, counts in value_counts.items()}, dtype='int64')
+
+    numeric_candidates = [col for col in data.columns if data[col].dtype in ['float64', 'int64'] and 'id' not in col.lower()]
+    cat_candidates = [col for col in data.columns if data[col].dtype == 'object' and distinct.get(col, 0) < 1000]
+
+    return {
+        "records": len(data),
+        "means": numeric_frame.mean(),
+        "sums": numeric_frame.sum(),
+        "sorted": {col: np.sort(values.dropna().to_numpy(dtype=float)) for col, values in numeric_frame.items()},
+        "value_counts": value_counts,
+        "distinct": distinct,
+        "numeric_candidates": numeric_candidates,
+        "cat_candidates": cat_candidates,
+        "describe": data[numeric_candidates].describe() if numeric_candidates else pd.DataFrame(),
+        "prompt": {}
+    }
+
+def numeric_values(frame, column):
+    """Non-null numeric values of a column as a sorted array, empty when the frame lacks it"""
+    if column not in frame.columns:
+        return np.array([])
+    return np.sort(pd.to_numeric(frame[column], errors='coerce').dropna().to_numpy(dtype=float))
+
+def column_counts(frame, column):
+    return frame[column].value_counts() if column in frame.columns else pd.Series(dtype='int64')
+
+def describe_sorted(profile, columns):
+    """describe() statistics read from the profile's sorted arrays"""
+    stats = {}
+    for col in columns:
+        values = profile["sorted"].get(col, np.array([]))
+        if len(values) == 0:
+            stats[col] = [0] + [np.nan] * 7
+            continue
+        stats[col] = [len(values), values.mean(), values.std(ddof=1) if len(values) > 1 else np.nan, values[0],
+                      *np.quantile(values, [0.25, 0.5, 0.75]), values[-1]]
+    return pd.DataFrame(stats, index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'])
+
+def update_dataset_profile(profile, data, removed, added):
+    """Apply a delta to a profile from build_dataset_profile instead of rescanning the merged sample"""
+    profile["sums"] = profile["sums"].astype('float64')
+    for col, values in profile["sorted"].items():
+        old, new = numeric_values(removed, col), numeric_values(added, col)
+        # Delete each removed value once - repeated values take successive positions
+        positions = np.searchsorted(values, old, side='left') + np.arange(len(old)) - np.searchsorted(old, old, side='left')
+        values = np.delete(values, positions)
+        profile["sorted"][col] = np.insert(values, np.searchsorted(values, new), new)
+        profile["sums"][col] += new.sum() - old.sum()
+    non_null = pd.Series({col: len(values) for col, values in profile["sorted"].items()}, dtype='float64')
+    profile["means"] = profile["sums"] / non_null.replace(0, np.nan)
+
+    for col, counts in profile["value_counts"].items():
+        updated = counts.sub(column_counts(removed, col), fill_value=0).add(column_counts(added, col), fill_value=0)
+        profile["value_counts"][col] = updated[updated > 0].astype('int64').sort_values(ascending=False)
+    profile["distinct"] = pd.Series({col: len(counts) for col, counts in profile["value_counts"].items()}, dtype='int64')
+
+    profile["records"] = len(data)
+    profile["numeric_candidates"] = [col for col in data.columns if data[col].dtype in ['float64', 'int64'] and 'id' not in col.lower()]
+    profile["cat_candidates"] = [col for col in data.columns if data[col].dtype == 'object' and profile["distinct"].get(col, 0) < 1000]
+    profile["describe"] = describe_sorted(profile, profile["numeric_candidates"]) if profile["numeric_candidates"] else pd.DataFrame()
+    profile["prompt"] = {}
+    return profile
+
+def get_dataset_profile(data):
+    """Memoized profile for the current data snapshot, reused across reruns"""
+    # Hashing the sample is only needed when the data version probe failed
+    snapshot_id = st.session_state.data_version["snapshot_id"] or compute_snapshot_id(data)
+    cached = st.session_state.data_cache.get("dataset_profile")
+    if cached is not None and cached["snapshot_id"] == snapshot_id:
+        return cached
+    delta = st.session_state.data_cache.get("data_delta")
+    profile = None
+    if cached is not None and delta is not None and (delta["from"], delta["to"]) == (cached["snapshot_id"], snapshot_id):
+        try:
+            profile = update_dataset_profile(cached, data, delta["removed"], delta["added"])
+        except Exception:
+            # A profile that no longer lines up with the sample is rebuilt from scratch
+            profile = None
+    if profile is None:
+        profile = build_dataset_profile(data)
+    profile["snapshot_id"] = snapshot_id
+    st.session_state.data_cache["dataset_profile"] = profile
+    return profile
+
+def profile_prompt_sections(profile, data, key_metrics, categorical_options):
+    """Prompt statistics for one metric selection, memoized on the profile"""
+    key = (tuple(key_metrics), tuple(categorical_options))
+    if key not in profile["prompt"]:
+        profile["prompt"][key] = build_data_profile(data, key_metrics, categorical_options)
+    return profile["prompt"][key]
+
+def profile_count(profile, column, value):
+    """Rows where column equals value"""
+    counts = profile["value_counts"].get(column)
+    if counts is None:
+        return 0
+    return int(counts.get(value, 0))
+
+def profile_count_above(profile, column, threshold):
+    """Rows where column is strictly greater than threshold"""
+    values = profile["sorted"].get(column)
+    if values is None:
+        return 0
+    return int(len(values) - np.searchsorted(values, threshold, side='right'))
+
+# LLM response cache - Snowflake table fronted by an in-process LRU
+LLM_CACHE_TTL_SECONDS = 24 * 60 * 60
+LLM_CACHE_SIZE = 64
+
+def current_data_snapshot():
+    """Identifier of the data behind the current analysis - the probed table version when available"""
+    return st.session_state.data_version["snapshot_id"] or st.session_state.data_cache["dataset_profile"]["snapshot_id"]
+
+def llm_cache_key(prompt, model_name):
+    normalized = re.sub(r"\s+", " ", prompt).strip()
+    return hashlib.sha256(f"{model_name}\n{normalized}".encode()).hexdigest()
+
+def ensure_llm_cache_table():
+    """Create the cache table once per session and purge expired or superseded entries"""
+    if st.session_state.llm_cache_table_ready is None:
+        try:
+            session.sql(f"CREATE TABLE IF NOT EXISTS {LLM_CACHE_TABLE} (cache_key STRING, model STRING, snapshot_id STRING, response STRING, created_at TIMESTAMP_LTZ)").collect()
+            session.sql(
+                f"DELETE FROM {LLM_CACHE_TABLE} WHERE created_at < DATEADD(second, ?, CURRENT_TIMESTAMP()) OR snapshot_id != ?",
+                params=[-LLM_CACHE_TTL_SECONDS, current_data_snapshot()]
+            ).collect()
+            st.session_state.llm_cache_table_ready = True
+        except Exception:
+            # No privileges to create tables - keep the in-process cache only
+            st.session_state.llm_cache_table_ready = False
+    return st.session_state.llm_cache_table_ready
+
+def llm_cache_remember(cache_key, snapshot_id, response, created_at):
+    cache = st.session_state.llm_cache
+    cache[cache_key] = {"snapshot_id": snapshot_id, "response": response, "created_at": created_at}
+    cache.move_to_end(cache_key)
+    while len(cache) > LLM_CACHE_SIZE:
+        cache.popitem(last=False)
+
+def llm_cache_get(cache_key, snapshot_id):
+    """Cached response for this prompt and data snapshot, checking the LRU before the table"""
+    cache = st.session_state.llm_cache
+    entry = cache.get(cache_key)
+    if entry is not None:
+        if entry["snapshot_id"] == snapshot_id and time.time() - entry["created_at"] < LLM_CACHE_TTL_SECONDS:
+            cache.move_to_end(cache_key)
+            return entry["response"]
+        del cache[cache_key]
+    if not ensure_llm_cache_table():
+        return None
+    try:
+        rows = session.sql(
+            f"SELECT response, DATE_PART(epoch_second, created_at) FROM {LLM_CACHE_TABLE} "
+            f"WHERE cache_key = ? AND snapshot_id = ? AND created_at >= DATEADD(second, ?, CURRENT_TIMESTAMP()) "
+            f"ORDER BY created_at DESC LIMIT 1",
+            params=[cache_key, snapshot_id, -LLM_CACHE_TTL_SECONDS]
+        ).collect()
+    except Exception:
+        return None
+    if not rows:
+        return None
+    llm_cache_remember(cache_key, snapshot_id, rows[0][0], float(rows[0][1]))
+    return rows[0][0]
+
+def llm_cache_put(cache_key, model_name, snapshot_id, response):
+    llm_cache_remember(cache_key, snapshot_id, response, time.time())
+    if not ensure_llm_cache_table():
+        return
+    try:
+        session.sql(
+            f"MERGE INTO {LLM_CACHE_TABLE} t USING (SELECT ? AS cache_key, ? AS model, ? AS snapshot_id, ? AS response) s "
+            f"ON t.cache_key = s.cache_key "
+            f"WHEN MATCHED THEN UPDATE SET model = s.model, snapshot_id = s.snapshot_id, response = s.response, created_at = CURRENT_TIMESTAMP() "
+            f"WHEN NOT MATCHED THEN INSERT (cache_key, model, snapshot_id, response, created_at) "
+            f"VALUES (s.cache_key, s.model, s.snapshot_id, s.response, CURRENT_TIMESTAMP())",
+            params=[cache_key, model_name, snapshot_id, response]
+        ).collect()
+    except Exception:
+        pass
+
+# Semantic response cache - reuse answers to near-identical prompts by embedding similarity
+SEMANTIC_EMBED_MODEL = "snowflake-arctic-embed-m-v2.0"
+SEMANTIC_CACHE_THRESHOLD = 0.97
+# Answers to a similar prompt are only reused for an hour - the data has usually moved on after that
+SEMANTIC_CACHE_MAX_AGE_SECONDS = 60 * 60
+SEMANTIC_EMBEDDING_MEMO_SIZE = 16
+SEMANTIC_EMBEDDING_VECTOR = "PARSE_JSON(?)::ARRAY::VECTOR(FLOAT, 768)"
+
+def semantic_cache_text(prompt):
+    """The data part of an insights prompt - from the data summary up to the instructions.
+    The solution context and instructions are the same on every run, so embedding them would make any two prompts look alike."""
+    match = re.search(r"DATA SUMMARY:\n(.*?)\n\nANALYSIS INSTRUCTIONS:", prompt, re.S)
+    return match.group(1) if match else prompt
+
+def semantic_embedding(prompt):
+    """EMBED_TEXT_768 of the prompt's data part as a JSON array, computed once per distinct data part in the session"""
+    text = semantic_cache_text(prompt)
+    key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    memo = st.session_state.semantic_embeddings
+    if key in memo:
+        memo.move_to_end(key)
+        return memo[key]
+    embedding = session.sql("SELECT SNOWFLAKE.CORTEX.EMBED_TEXT_768(?, ?)", params=[SEMANTIC_EMBED_MODEL, text]).collect()[0][0]
+    memo[key] = embedding if isinstance(embedding, str) else json.dumps([float(value) for value in embedding])
+    while len(memo) > SEMANTIC_EMBEDDING_MEMO_SIZE:
+        memo.popitem(last=False)
+    return memo[key]
+
+def ensure_semantic_cache_table():
+    if st.session_state.semantic_cache_table_ready is None:
+        try:
+            session.sql(
+                f"CREATE TABLE IF NOT EXISTS {SEMANTIC_CACHE_TABLE} (model STRING, focus_area STRING, embedding VECTOR(FLOAT, 768), "
+                f"response STRING, snapshot_id STRING, created_at TIMESTAMP_LTZ)"
+            ).collect()
+            session.sql(
+                f"DELETE FROM {SEMANTIC_CACHE_TABLE} WHERE created_at < DATEADD(second, ?, CURRENT_TIMESTAMP())",
+                params=[-SEMANTIC_CACHE_MAX_AGE_SECONDS]
+            ).collect()
+            st.session_state.semantic_cache_table_ready = True
+        except Exception:
+            st.session_state.semantic_cache_table_ready = False
+    return st.session_state.semantic_cache_table_ready
+
+def semantic_cache_get(prompt, model_name, focus_area):
+    """Answer to the most similar earlier prompt for this model and focus area, if it clears the threshold"""
+    st.session_state.last_semantic_hit = None
+    threshold = st.session_state.semantic_cache_threshold
+    if threshold >= 1.0 or not ensure_semantic_cache_table():
+        return None
+    try:
+        # Snowflake has no vector index - the scan is limited to one model and focus area within the last hour
+        rows = session.sql(
+            f"SELECT c.response, VECTOR_COSINE_SIMILARITY(c.embedding, {SEMANTIC_EMBEDDING_VECTOR}) AS similarity, "
+            f"DATEDIFF(second, c.created_at, CURRENT_TIMESTAMP()) AS age_seconds, c.snapshot_id "
+            f"FROM {SEMANTIC_CACHE_TABLE} c WHERE c.model = ? AND c.focus_area = ? "
+            f"AND c.created_at >= DATEADD(second, ?, CURRENT_TIMESTAMP()) ORDER BY similarity DESC LIMIT 1",
+            params=[semantic_embedding(prompt), model_name, focus_area or "", -SEMANTIC_CACHE_MAX_AGE_SECONDS]
+        ).collect()
+    except Exception:
+        return None
+    if not rows or rows[0][1] < threshold:
+        return None
+    st.session_state.last_semantic_hit = {
+        "similarity": float(rows[0][1]),
+        "age_seconds": int(rows[0][2]),
+        "same_snapshot": rows[0][3] == current_data_snapshot()
+    }
+    return rows[0][0]
+
+def semantic_cache_put(prompt, model_name, focus_area, snapshot_id, response):
+    if st.session_state.semantic_cache_threshold >= 1.0 or not ensure_semantic_cache_table():
+        return
+    try:
+        session.sql(
+            f"INSERT INTO {SEMANTIC_CACHE_TABLE} (model, focus_area, embedding, response, snapshot_id, created_at) "
+            f"SELECT ?, ?, {SEMANTIC_EMBEDDING_VECTOR}, ?, ?, CURRENT_TIMESTAMP()",
+            params=[model_name, focus_area or "", semantic_embedding(prompt), response, snapshot_id]
+        ).collect_nowait()
+    except Exception:
+        pass
+
+def cache_hit_caption():
+    hit = st.session_state.last_semantic_hit
+    if hit is None:
+        return "⚡ Served from the response cache - same model, prompt and data snapshot as an earlier run"
+    age = f"{hit['age_seconds'] // 3600}h" if hit["age_seconds"] >= 3600 else f"{max(hit['age_seconds'] // 60, 1)}m"
+    data_note = "the current data snapshot" if hit["same_snapshot"] else "an earlier data snapshot"
+    return f"♻️ Reused the answer to a similar prompt (similarity {hit['similarity']:.3f}), generated {age} ago on {data_note}"
+
+# Persistent insights history - one table shared by every vertical, clustered for filtered paging
+INSIGHTS_HISTORY_TABLE = "AI_INSIGHTS_HISTORY"
+HISTORY_PAGE_SIZE = 10
+HISTORY_PAGE_CACHE_SIZE = 24
+# Rows saved in the same instant are ordered by a hash of their content
+HISTORY_ROW_KEY = "HASH(focus, model, insights)"
+
+def ensure_history_table():
+    if st.session_state.insights_history_table_ready is None:
+        try:
+            session.sql(
+                f"CREATE TABLE IF NOT EXISTS {INSIGHTS_HISTORY_TABLE} (vertical STRING, focus STRING, model STRING, "
+                f"created_at TIMESTAMP_LTZ, insights STRING, snapshot_id STRING) "
+                f"CLUSTER BY (vertical, focus, model, TO_DATE(created_at))"
+            ).collect()
+            st.session_state.insights_history_table_ready = True
+        except Exception:
+            # No privileges to create tables - history stays in this session only
+            st.session_state.insights_history_table_ready = False
+        if st.session_state.insights_history_table_ready:
+            try:
+                session.sql(f"ALTER TABLE {INSIGHTS_HISTORY_TABLE} ADD SEARCH OPTIMIZATION ON FULL_TEXT(insights)").collect()
+            except Exception:
+                # Search optimization needs Enterprise edition; SEARCH() still works with a scan
+                pass
+    return st.session_state.insights_history_table_ready
+
+def bump_history_version():
+    """Invalidate cached history pages and counts after a save or an explicit refresh"""
+    st.session_state.history_state["version"] += 1
+    st.session_state.history_page_cache.clear()
+    st.session_state.history_counts.clear()
+
+def record_insight(entry):
+    """Keep the entry for this session and persist it for later ones"""
+    st.session_state.insights_history.append(entry)
+    bump_history_version()
+    if not entry["insights"] or not ensure_history_table():
+        return
+    try:
+        session.sql(
+            f"INSERT INTO {INSIGHTS_HISTORY_TABLE} (vertical, focus, model, created_at, insights, snapshot_id) "
+            f"SELECT ?, ?, ?, CURRENT_TIMESTAMP(), ?, ?",
+            params=[VERTICAL["code"], entry["focus"], entry["model"], entry["insights"], current_data_snapshot()]
+        ).collect()
+    except Exception as e:
+        st.warning(f"Insight was not saved to {INSIGHTS_HISTORY_TABLE}: {str(e)}")
+
+def build_history_filter(search, focus, model):
+    filters, params = ["vertical = ?"], [VERTICAL["code"]]
+    if focus:
+        # Segment reports are saved as "<focus> · <segment>"
+        filters.append("STARTSWITH(focus, ?)")
+        params.append(focus)
+    if model:
+        filters.append("model = ?")
+        params.append(model)
+    if search:
+        filters.append("SEARCH(insights, ?)")
+        params.append(search)
+    return " AND ".join(filters), params
+
+def build_history_keyset_clause(cursor):
+    """Seek predicate for newest-first pages; created_at stays bare so clustering still prunes"""
+    if cursor is None:
+        return "", []
+    created_ns, row_key = cursor
+    return (f"(created_at < TO_TIMESTAMP_LTZ(?, 9) OR (created_at = TO_TIMESTAMP_LTZ(?, 9) AND {HISTORY_ROW_KEY} < ?))",
+            [created_ns, created_ns, row_key])
+
+def fetch_history_page(where, params, cursor):
+    """One page of saved insights after the cursor, plus the cursor of the page that follows (None on the last page)"""
+    keyset_sql, keyset_params = build_history_keyset_clause(cursor)
+    rows = session.sql(
+        f"SELECT TO_CHAR(created_at, 'YYYY-MM-DD HH24:MI'), focus, model, insights, "
+        f"DATE_PART(EPOCH_NANOSECOND, created_at), {HISTORY_ROW_KEY} FROM {INSIGHTS_HISTORY_TABLE} "
+        f"WHERE {where}{' AND ' + keyset_sql if keyset_sql else ''} "
+        f"ORDER BY created_at DESC, {HISTORY_ROW_KEY} DESC LIMIT {HISTORY_PAGE_SIZE + 1}",
+        params=params + keyset_params
+    ).collect()
+    entries = [{"timestamp": row[0], "focus": row[1], "model": row[2], "insights": row[3]} for row in rows[:HISTORY_PAGE_SIZE]]
+    next_cursor = (rows[HISTORY_PAGE_SIZE - 1][4], rows[HISTORY_PAGE_SIZE - 1][5]) if len(rows) > HISTORY_PAGE_SIZE else None
+    return entries, next_cursor
+
+def load_history_page(search, focus, model, page, cursor):
+    """One page of saved insights, newest first, the next page's cursor and the number of matching entries
+
+    Pages and counts are cached per history version, so reruns from other widgets do not query the table again.
+    """
+    version = st.session_state.history_state["version"]
+    filter_key = (version, search, focus, model)
+    if ensure_history_table():
+        where, params = build_history_filter(search, focus, model)
+        cache = st.session_state.history_page_cache
+        try:
+            if (filter_key, cursor) not in cache:
+                cache[(filter_key, cursor)] = fetch_history_page(where, params, cursor)
+                while len(cache) > HISTORY_PAGE_CACHE_SIZE:
+                    cache.popitem(last=False)
+            cache.move_to_end((filter_key, cursor))
+            if filter_key not in st.session_state.history_counts:
+                st.session_state.history_counts[filter_key] = session.sql(
+                    f"SELECT COUNT(*) FROM {INSIGHTS_HISTORY_TABLE} WHERE {where}", params=params
+                ).collect()[0][0]
+            entries, next_cursor = cache[(filter_key, cursor)]
+            return entries, next_cursor, st.session_state.history_counts[filter_key]
+        except Exception as e:
+            st.warning(f"Could not read {INSIGHTS_HISTORY_TABLE}, showing this session's insights: {str(e)}")
+    entries = [item for item in reversed(st.session_state.insights_history)
+               if (not focus or item["focus"].startswith(focus))
+               and (not model or item["model"] == model)
+               and all(term in (item["insights"] or "").lower() for term in search.lower().split())]
+    start = (page - 1) * HISTORY_PAGE_SIZE
+    next_cursor = page + 1 if len(entries) > start + HISTORY_PAGE_SIZE else None
+    return entries[start:start + HISTORY_PAGE_SIZE], next_cursor, len(entries)
+
+# LLM telemetry - one row per Cortex call, buffered locally and flushed asynchronously
+TELEMETRY_FLUSH_ROWS = 20
+TELEMETRY_FLUSH_SECONDS = 60
+TELEMETRY_LOCAL_EVENTS = 500
+TELEMETRY_SUMMARY_TTL_SECONDS = 30
+TELEMETRY_COLUMNS = ["event_time", "session_id", "model", "focus_area", "call_path", "cache_hit",
+                     "latency_ms", "prompt_tokens", "completion_tokens", "error", "snapshot_id"]
+
+def record_telemetry(model_name, focus_area, call_path, cache_hit, latency, prompt, response, error=None):
+    telemetry = st.session_state.telemetry
+    event = {
+        "event_time": time.time(),
+        "session_id": telemetry["session_id"],
+        "model": model_name,
+        "focus_area": focus_area,
+        "call_path": call_path,
+        "cache_hit": cache_hit,
+        "latency_ms": round(latency * 1000, 1),
+        "prompt_tokens": estimate_tokens(prompt),
+        "completion_tokens": estimate_tokens(response or ""),
+        "error": error,
+        "snapshot_id": current_data_snapshot()
+    }
+    telemetry["buffer"].append(event)
+    telemetry["events"] = (telemetry["events"] + [event])[-TELEMETRY_LOCAL_EVENTS:]
+    if len(telemetry["buffer"]) >= TELEMETRY_FLUSH_ROWS:
+        flush_telemetry()
+
+def flush_telemetry(force=False, block=False):
+    """Append buffered events to the telemetry table without waiting for the insert unless asked to"""
+    telemetry = st.session_state.telemetry
+    if not telemetry["buffer"]:
+        return
+    if not force and len(telemetry["buffer"]) < TELEMETRY_FLUSH_ROWS and time.time() - telemetry["flushed_at"] < TELEMETRY_FLUSH_SECONDS:
+        return
+    if telemetry["table_ready"] is None:
+        try:
+            session.sql(
+                f"CREATE TABLE IF NOT EXISTS {TELEMETRY_TABLE} (event_time TIMESTAMP_LTZ, session_id STRING, model STRING, "
+                f"focus_area STRING, call_path STRING, cache_hit BOOLEAN, latency_ms FLOAT, prompt_tokens INT, "
+                f"completion_tokens INT, error STRING, snapshot_id STRING)"
+            ).collect()
+            telemetry["table_ready"] = True
+        except Exception:
+            # No privileges to create tables - keep local events only
+            telemetry["table_ready"] = False
+    rows, telemetry["buffer"] = telemetry["buffer"], []
+    telemetry["flushed_at"] = time.time()
+    if not telemetry["table_ready"]:
+        return
+    values = ", ".join(["(" + ", ".join(["?"] * len(TELEMETRY_COLUMNS)) + ")"] * len(rows))
+    params = [row[col] for row in rows for col in TELEMETRY_COLUMNS]
+    insert = session.sql(
+        f"INSERT INTO {TELEMETRY_TABLE} ({', '.join(TELEMETRY_COLUMNS)}) "
+        f"SELECT TO_TIMESTAMP_LTZ(column1), {', '.join(f'column{i}' for i in range(2, len(TELEMETRY_COLUMNS) + 1))} FROM VALUES {values}",
+        params=params
+    )
+    try:
+        insert.collect() if block else insert.collect_nowait()
+    except Exception:
+        pass
+
+def load_telemetry_summary(group_column, days):
+    """p50/p95 latency of real calls and cache hit rate per model or focus area, cached for a short TTL"""
+    summaries = st.session_state.telemetry["summaries"]
+    cached = summaries.get((group_column, days))
+    if cached is not None and time.time() - cached[0] < TELEMETRY_SUMMARY_TTL_SECONDS:
+        return cached[1], "table"
+    # Submit buffered events without waiting; they show up in the summary after the next refresh
+    flush_telemetry(force=True)
+    query = (
+        f"SELECT {group_column}, COUNT(*) AS calls, AVG(IFF(cache_hit, 1, 0)) AS cache_hit_rate, "
+        f"APPROX_PERCENTILE(IFF(cache_hit, NULL, latency_ms), 0.5) AS p50_ms, "
+        f"APPROX_PERCENTILE(IFF(cache_hit, NULL, latency_ms), 0.95) AS p95_ms, "
+        f"COUNT_IF(error IS NOT NULL) AS errors, SUM(prompt_tokens) AS prompt_tokens, SUM(completion_tokens) AS completion_tokens "
+        f"FROM {TELEMETRY_TABLE} WHERE event_time >= DATEADD(day, ?, CURRENT_TIMESTAMP()) "
+        f"GROUP BY {group_column} ORDER BY calls DESC"
+    )
+    if st.session_state.telemetry["table_ready"]:
+        try:
+            summary = session.sql(query, params=[-days]).to_pandas()
+            summary.columns = [col.lower() for col in summary.columns]
+            summaries[(group_column, days)] = (time.time(), summary)
+            return summary, "table"
+        except Exception:
+            pass
+    # Fall back to this session's local events
+    events = pd.DataFrame(st.session_state.telemetry["events"], columns=TELEMETRY_COLUMNS)
+    if events.empty:
+        return pd.DataFrame(), "session"
+    events["real_latency_ms"] = events["latency_ms"].where(~events["cache_hit"].astype(bool))
+    grouped = events.groupby(group_column, dropna=False)
+    summary = pd.DataFrame({
+        "calls": grouped.size(),
+        "cache_hit_rate": grouped["cache_hit"].mean(),
+        "p50_ms": grouped["real_latency_ms"].quantile(0.5),
+        "p95_ms": grouped["real_latency_ms"].quantile(0.95),
+        "errors": grouped["error"].count(),
+        "prompt_tokens": grouped["prompt_tokens"].sum(),
+        "completion_tokens": grouped["completion_tokens"].sum()
+    }).reset_index().sort_values("calls", ascending=False)
+    return summary, "session"
+
+# Model routing - pick the cheapest adequate model and escalate only when a quality check fails
+AUTO_MODEL = "auto (routed cascade)"
+MODEL_TIERS = [
+    ["llama3.1-8b", "mistral-7b"],
+    ["snowflake-llama-3.3-70b", "llama3.1-70b", "mistral-large2"],
+    ["claude-4-sonnet", "openai-gpt-4.1"]
+]
+FOCUS_AREA_START_TIER = {"Financial Impact": 1, "Strategic Recommendations": 1}
+ROUTING_LATENCY_TARGET_SECONDS = 30
+CASCADE_MIN_WORDS = 250
+MODEL_STATS_WINDOW = 50
+
+def record_model_call(model_name, latency, prompt, response, focus_area=None, call_path="sql", cache_hit=False, error=None):
+    record_telemetry(model_name, focus_area, call_path, cache_hit, latency, prompt, response, error)
+    if cache_hit:
+        return
+    stats = st.session_state.model_stats.setdefault(model_name, {
+        "calls": 0, "failures": 0, "latencies": [], "prompt_tokens": 0, "completion_tokens": 0
+    })
+    stats["calls"] += 1
+    if not response:
+        stats["failures"] += 1
+    stats["latencies"] = (stats["latencies"] + [latency])[-MODEL_STATS_WINDOW:]
+    stats["prompt_tokens"] += estimate_tokens(prompt)
+    stats["completion_tokens"] += estimate_tokens(response or "")
+
+def model_latency(model_name):
+    """Median observed latency, or None before the model has been called"""
+    stats = st.session_state.model_stats.get(model_name)
+    if not stats or not stats["latencies"]:
+        return None
+    return float(np.median(stats["latencies"]))
+
+def route_models(focus_area):
+    """Cascade order for a request: one model per tier, starting at the cheapest adequate tier.
+    Prompt size does not move the start tier; compose_prompt fits each prompt to its model's budget."""
+    routed = []
+    for tier in MODEL_TIERS[FOCUS_AREA_START_TIER.get(focus_area, 0):]:
+        # Within a tier prefer models meeting the latency target, fastest observed first
+        within_target = [m for m in tier if (model_latency(m) or 0) <= ROUTING_LATENCY_TARGET_SECONDS] or tier
+        routed.append(sorted(within_target, key=lambda m: model_latency(m) or 0)[0])
+    return routed
+
+def resolve_model(model_name, focus_area):
+    return route_models(focus_area)[0] if model_name == AUTO_MODEL else model_name
+
+def passes_quality_check(response, prompt):
+    """Long enough, quotes numbers and covers at least half of the sections the prompt asked for"""
+    if not response or len(response.split()) < CASCADE_MIN_WORDS:
+        return False
+    if len(re.findall(r"\d", response)) < 5:
+        return False
+    sections = re.findall(r"^- ([A-Z][^(\n]+?) \(", prompt, re.M)
+    covered = sum(section.lower() in response.lower() for section in sections)
+    return not sections or covered * 2 >= len(sections)
+
+def run_model_cascade(build_prompt, focus_area):
+    """Call the routed models from smallest up until a response passes the quality check"""
+    response = None
+    for model in route_models(focus_area):
+        prompt = build_prompt(model)
+        response = call_cortex_model(prompt, model, focus_area=focus_area)
+        if passes_quality_check(response, prompt):
+            break
+    return response
+
+CORTEX_COMPLETE_QUERY = "SELECT SNOWFLAKE.CORTEX.COMPLETE(?, ?) AS response"
+
+# Resilient Cortex client - per-call deadline, retries with jitter and hedging against stragglers
+LLM_CALL_DEADLINE_SECONDS = 120
+LLM_MAX_RETRIES = 2
+LLM_RETRY_BASE_SECONDS = 1.0
+LLM_HEDGING = True
+HEDGE_MIN_SAMPLES = 5
+HEDGE_DEFAULT_DELAY_SECONDS = 45
+TRANSIENT_ERROR_MARKERS = ("timeout", "timed out", "throttl", "too many requests", "429", "503",
+                           "temporarily", "unavailable", "overloaded", "connection reset")
+ASYNC_POLL_SECONDS = 0.25
+STREAM_FIRST_CHUNK_SECONDS = 30
+
+def is_transient_error(error):
+    return any(marker in str(error).lower() for marker in TRANSIENT_ERROR_MARKERS)
+
+def hedge_delay(model_name):
+    """Observed p95 latency of the model, or a conservative default until enough calls are recorded"""
+    stats = st.session_state.model_stats.get(model_name)
+    if not stats or len(stats["latencies"]) < HEDGE_MIN_SAMPLES:
+        return HEDGE_DEFAULT_DELAY_SECONDS
+    return float(np.percentile(stats["latencies"], 95))
+
+def hedge_model(model_name):
+    """Fastest small-tier model other than the primary one"""
+    candidates = [m for m in MODEL_TIERS[0] if m != model_name]
+    return sorted(candidates, key=lambda m: model_latency(m) or 0)[0] if candidates else None
+
+def cancel_cortex_job(job):
+    try:
+        job.cancel()
+    except Exception:
+        pass
+
+def resilient_complete(prompt, model_name, focus_area=None, hedge=LLM_HEDGING):
+    """Run COMPLETE under a deadline and return (response, model) from whichever request answers first.
+    Transient errors are retried with jittered backoff; other errors and an expired deadline are raised."""
+    deadline = time.time() + LLM_CALL_DEADLINE_SECONDS
+    last_error = None
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        if attempt:
+            # Exponential backoff with full jitter, never sleeping past the deadline
+            time.sleep(min(random.uniform(0, LLM_RETRY_BASE_SECONDS * 2 ** attempt), max(deadline - time.time(), 0)))
+        if time.time() >= deadline:
+            break
+        jobs = {model_name: (session.sql(CORTEX_COMPLETE_QUERY, params=[model_name, prompt]).collect_nowait(), time.time())}
+        fallback = hedge_model(model_name) if hedge else None
+        hedge_at = time.time() + hedge_delay(model_name)
+        while jobs:
+            now = time.time()
+            if now >= deadline:
+                for model, (job, started) in jobs.items():
+                    cancel_cortex_job(job)
+                    record_model_call(model, now - started, prompt, None, focus_area, error="deadline exceeded")
+                raise TimeoutError(f"Cortex call exceeded the {LLM_CALL_DEADLINE_SECONDS}s deadline")
+            if fallback and fallback not in jobs and now >= hedge_at:
+                # The primary is slower than its p95 - race the same prompt on a faster model
+                jobs[fallback] = (session.sql(CORTEX_COMPLETE_QUERY, params=[fallback, prompt]).collect_nowait(), now)
+                fallback = None
+            for model, (job, started) in list(jobs.items()):
+                if not job.is_done():
+                    continue
+                del jobs[model]
+                call_path = "sql" if model == model_name else "hedge"
+                try:
+                    response = job.result()[0][0]
+                except Exception as e:
+                    last_error = e
+                    record_model_call(model, time.time() - started, prompt, None, focus_area, call_path, error=str(e))
+                    continue
+                record_model_call(model, time.time() - started, prompt, response, focus_area, call_path)
+                for other_job, _ in jobs.values():
+                    cancel_cortex_job(other_job)
+                return response, model
+            if jobs:
+                time.sleep(ASYNC_POLL_SECONDS)
+        if last_error is not None and not is_transient_error(last_error):
+            raise last_error
+    raise last_error or TimeoutError(f"Cortex call exceeded the {LLM_CALL_DEADLINE_SECONDS}s deadline")
+
+def call_cortex_model(prompt, model_name, use_cache=True, focus_area=None):
+    cache_key = llm_cache_key(prompt, model_name)
+    snapshot_id = current_data_snapshot()
+    if use_cache:
+        cached = llm_cache_get(cache_key, snapshot_id)
+        if cached is not None:
+            st.session_state.last_llm_cache_hit = True
+            st.session_state.last_model_used = model_name
+            record_model_call(model_name, 0.0, prompt, cached, focus_area, cache_hit=True)
+            return cached
+        cached = semantic_cache_get(prompt, model_name, focus_area)
+        if cached is not None:
+            st.session_state.last_llm_cache_hit = True
+            st.session_state.last_model_used = model_name
+            record_model_call(model_name, 0.0, prompt, cached, focus_area, "semantic", cache_hit=True)
+            return cached
+    st.session_state.last_llm_cache_hit = False
+    st.session_state.last_model_used = model_name
+    try:
+        response, answered_by = resilient_complete(prompt, model_name, focus_area)
+    except Exception as e:
+        st.error(f"❌ Cortex error: {str(e)}")
+        return None
+    st.session_state.last_model_used = answered_by
+    # A hedged answer came from a different model, so it is not cached under the requested one
+    if response and answered_by == model_name:
+        llm_cache_put(cache_key, model_name, snapshot_id, response)
+        semantic_cache_put(prompt, model_name, focus_area, snapshot_id, response)
+    return response
+
+def stream_complete(prompt, model_name):
+    """Yield COMPLETE's streamed chunks; TimeoutError when the first chunk takes over STREAM_FIRST_CHUNK_SECONDS
+    or the whole stream runs past the call deadline"""
+    started = time.time()
+    deadline = started + LLM_CALL_DEADLINE_SECONDS
+    first_chunk_deadline = min(started + STREAM_FIRST_CHUNK_SECONDS, deadline)
+    # The blocking reads run on a worker thread so a stalled stream cannot hold the script past its deadline
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        try:
+            stream = executor.submit(Complete, model_name, prompt, session=session, stream=True).result(timeout=max(first_chunk_deadline - time.time(), 0))
+            chunk = executor.submit(next, stream, None).result(timeout=max(first_chunk_deadline - time.time(), 0))
+        except FutureTimeoutError:
+            raise TimeoutError(f"Cortex stream sent nothing within {STREAM_FIRST_CHUNK_SECONDS}s")
+        while chunk is not None:
+            yield chunk
+            try:
+                chunk = executor.submit(next, stream, None).result(timeout=max(deadline - time.time(), 0))
+            except FutureTimeoutError:
+                raise TimeoutError(f"Cortex call exceeded the {LLM_CALL_DEADLINE_SECONDS}s deadline")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def stream_cortex_model(prompt, model_name, focus_area=None):
+    """Yield the completion as it is generated; cache hits and the SQL path are replayed in chunks.
+    A stream that fails or stalls before its first chunk is answered on the SQL path, which retries and hedges."""
+    cache_key = llm_cache_key(prompt, model_name)
+    snapshot_id = current_data_snapshot()
+    cached = llm_cache_get(cache_key, snapshot_id)
+    st.session_state.last_semantic_hit = None
+    if cached is None and Complete is not None:
+        # Without Complete the SQL path below checks the semantic cache itself
+        cached = semantic_cache_get(prompt, model_name, focus_area)
+    st.session_state.last_llm_cache_hit = cached is not None
+    st.session_state.last_model_used = model_name
+    if cached is None and Complete is not None:
+        chunks = []
+        call_started = time.time()
+        try:
+            for chunk in stream_complete(prompt, model_name):
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            record_model_call(model_name, time.time() - call_started, prompt, None, focus_area, "stream", error=str(e))
+            # Text already on screen cannot be taken back, so only a stream that never started is retried
+            if chunks or not (isinstance(e, TimeoutError) or is_transient_error(e)):
+                st.error(f"❌ Cortex error: {str(e)}")
+                return
+        else:
+            response = "".join(chunks)
+            record_model_call(model_name, time.time() - call_started, prompt, response, focus_area, "stream")
+            if response:
+                llm_cache_put(cache_key, model_name, snapshot_id, response)
+                semantic_cache_put(prompt, model_name, focus_area, snapshot_id, response)
+            return
+    if cached is not None:
+        record_model_call(model_name, 0.0, prompt, cached, focus_area, "stream", cache_hit=True)
+    response = cached if cached is not None else call_cortex_model(prompt, model_name, use_cache=Complete is None, focus_area=focus_area)
+    for piece in re.findall(r"\s*\S+", response or ""):
+        yield piece
+    
+# Agent execution engine - each displayed step runs real work and reports what it measured
+def agent_data_step(context):
+    data = context["data"]
+    return f"{len(data):,} records × {len(data.columns)} columns, profile shared across focus areas for this data snapshot"
+
+def agent_patterns_step(context):
+    prompt_profile = profile_prompt_sections(context["profile"], context["data"], VERTICAL["key_metrics"], VERTICAL["categorical_options"])
+    return (f"{len(prompt_profile['moments'])} metrics summarised, top values for {len(prompt_profile['top_categories'])} categories, "
+            f"{len(prompt_profile['top_correlations'])} strongest correlations")
+
+def agent_sketch_step(context):
+    sketch = get_table_sketch()
+    if sketch is None:
+        return "full-table sketch unavailable, using the sample only"
+    return f"full-table sketch of ~{sketch['rows']:,} records across {len(sketch['top_values'])} categories"
+
+def agent_prompt_step(context):
+    context["prompt"] = build_insights_prompt(context["data"], context["focus_area"], context["profile"], context["model_name"])
+    stats = st.session_state.last_prompt_stats
+    actions = f" ({', '.join(stats['actions'])})" if stats["actions"] else ""
+    return f"prompt of ~{stats['tokens']:,} tokens, budget {stats['budget']:,}{actions}"
+
+def agent_llm_step(context):
+    if context["model_name"] == AUTO_MODEL:
+        context["insights"] = run_model_cascade(
+            lambda model: build_insights_prompt(context["data"], context["focus_area"], context["profile"], model),
+            context["focus_area"]
+        )
+    else:
+        context["insights"] = call_cortex_model(context["prompt"], context["model_name"], focus_area=context["focus_area"])
+    if not context["insights"]:
+        return f"no answer from {st.session_state.last_model_used}"
+    source = " from the response cache" if st.session_state.last_llm_cache_hit else ""
+    return f"~{estimate_tokens(context['insights']):,} tokens from {st.session_state.last_model_used}{source}"
+
+def agent_report_step(context):
+    if not context.get("insights"):
+        return "no report"
+    context["insights"] = context["insights"].strip()
+    sections = len(re.findall(r"^(?:#+ |\*\*[^*\n]+\*\*:?\s*$)", context["insights"], re.M))
+    words = len(re.findall(r"\w+", context["insights"]))
+    return f"{words:,} words in {sections} sections"
+
+def run_agent_actions(actions):
+    def run(context):
+        return "; ".join(action(context) for action in actions)
+    return run
+
+def plan_agent_actions(step_count):
+    """Real work for each displayed step: the data in use first, the LLM call second to last, report assembly last"""
+    middle = [agent_patterns_step, agent_sketch_step, agent_prompt_step]
+    slots = max(step_count - 3, 1)
+    groups = [middle[i * len(middle) // slots:(i + 1) * len(middle) // slots] for i in range(slots)]
+    return [agent_data_step] + [run_agent_actions(group) for group in groups] + [agent_llm_step, agent_report_step]
+
+def get_focus_area_info(focus_area):
+    """Get business challenge and agent solution for each focus area"""
+    return VERTICAL["focus_info"].get(focus_area, {"challenge": "", "solution": ""})
+
+def generate_insights_with_agent_workflow(data, focus_area, model_name, progress_placeholder=None, profile=None):
+    """Generate insights using AI agent workflow - the vertical's agent_steps supply the step text"""
+    
+    try:
+        # Step details quote the dataset profile, memoized per data snapshot, so it is ready before the first step
+        if profile is None:
+            profile = get_dataset_profile(data)
+        
+        # Progress display for the steps as they run
+        session_key = f'{focus_area.lower().replace(" ", "_")}_completed_steps'
+        st.session_state[session_key] = []
+        
+        def update_progress(step_name, progress_percent, details, results):
+            """Update progress display with completed steps"""
+            if progress_placeholder:
+                with progress_placeholder.container():
+                    # Progress bar
+                    st.progress(progress_percent / 100)
+                    st.write(f"**{step_name} ({progress_percent}%)**")
+                    
+                    if details:
+                        st.markdown(f'<div class="agent-current">{details}</div>', unsafe_allow_html=True)
+                    
+                    if results:
+                        st.session_state[session_key].append((step_name, results))
+                        
+                    # Display completed steps
+                    for completed_step, completed_result in st.session_state[session_key]:
+                        st.markdown(f'<div class="agent-completed">✅ {completed_step}: {completed_result}</div>', unsafe_allow_html=True)
+
+        steps = VERTICAL["agent_steps"](data, focus_area, model_name, profile)
+
+        # Run each step's real work and report what it measured, reporting progress live
+        context = {"data": data, "focus_area": focus_area, "model_name": model_name, "profile": profile}
+        for (step_name, progress_percent, details), action in zip(steps, plan_agent_actions(len(steps))):
+            update_progress(step_name, progress_percent, details, None)
+            step_started = time.time()
+            results = action(context)
+            update_progress(step_name, progress_percent, None, f"{results} ({time.time() - step_started:.2f}s)")
+        
+        return context.get("insights")
+        
+    except Exception as e:
+        if progress_placeholder:
+            progress_placeholder.error(f"❌ Enhanced Agent Analysis failed: {str(e)}")
+        return f"Enhanced Agent Analysis failed: {str(e)}"
+
+def build_insights_prompt(data, focus_area, profile=None, model_name=None):
+    key_metrics = VERTICAL["key_metrics"]
+    categorical_options = VERTICAL["categorical_options"]
+
+    # Callers analysing several focus areas pass the shared dataset profile
+    if profile is None:
+        profile = get_dataset_profile(data)
+    prompt_profile = profile_prompt_sections(profile, data, key_metrics, categorical_options)
+    data_summary = format_profile_summary(prompt_profile)
+    table_sketch = get_table_sketch()
+    sketch_summary = format_sketch_summary(table_sketch, categorical_options) if table_sketch is not None else ""
+    correlation_info = format_correlation_info(prompt_profile, VERTICAL["correlation_heading"]) if VERTICAL["correlation_heading"] else ""
+
+    # Define specific instructions for each focus area
+    focus_area_instructions = VERTICAL["focus_instructions"]
+
+    # Get the specific instructions for the selected focus area
+    selected_focus_instructions = focus_area_instructions.get(focus_area, "")
+
+    analyst_domain = f" for {VERTICAL['analyst_domain']}" if VERTICAL['analyst_domain'] else ""
+    prompt_context = f"\n    - Frame all insights in the context of {VERTICAL['prompt_context']}" if VERTICAL['prompt_context'] else ""
+
+    guidelines = f'''
+    IMPORTANT GUIDELINES:
+    - Base all insights directly on the data provided
+    - Use specific metrics and numbers from the data in your analysis
+    - Maintain a professional, analytical tone
+    - Be concise but thorough in your analysis
+    - Focus specifically on {focus_area} as defined in the instructions
+    - Ensure your response is unique and tailored to this specific focus area
+    - Include a mix of observations, analysis, and actionable recommendations
+    - Use bullet points and clear section headers for readability{prompt_context}
+    '''
+
+    # Static solution context goes first so every prompt shares the same cacheable prefix
+    sections = [
+        ("solution", f"SOLUTION CONTEXT:\n{VERTICAL['solution_name']}\n\n{VERTICAL['solution_content']}", 2),
+        ("role", f"You are an expert data analyst specializing in {focus_area.lower()} analysis{analyst_domain}.", 0),
+        ("data_summary", f"DATA SUMMARY:\n{data_summary}", 0),
+        ("table_sketch", sketch_summary, 4),
+        ("correlations", correlation_info, 3),
+        ("instructions", f"ANALYSIS INSTRUCTIONS:\n{selected_focus_instructions}", 0),
+        ("guidelines", guidelines, 1)
+    ]
+
+    return compose_prompt(sections, model_name)
+
+def generate_insights(data, focus_area, model_name, profile=None):
+    if model_name == AUTO_MODEL:
+        return run_model_cascade(lambda model: build_insights_prompt(data, focus_area, profile, model), focus_area)
+    return call_cortex_model(build_insights_prompt(data, focus_area, profile, model_name), model_name, focus_area=focus_area)
+
+# Generate all focus areas - one Snowpark async job per Cortex call, collected as each finishes
+def submit_cortex_model(prompt, model_name, focus_area=None):
+    """Start a Cortex call without blocking; cached responses come back already resolved"""
+    call = {"cache_key": llm_cache_key(prompt, model_name), "snapshot_id": current_data_snapshot(), "prompt": prompt, "focus_area": focus_area,
+            "model": model_name, "job": None, "response": None, "cached": False, "started_at": time.time(), "attempt": 0, "retry_at": None}
+    cached = llm_cache_get(call["cache_key"], call["snapshot_id"])
+    if cached is not None:
+        call["response"], call["cached"] = cached, True
+        record_model_call(model_name, 0.0, prompt, cached, focus_area, "async", cache_hit=True)
+        return call
+    call["job"] = session.sql(CORTEX_COMPLETE_QUERY, params=[model_name, prompt]).collect_nowait()
+    return call
+
+def collect_cortex_model(call):
+    if call["job"] is not None:
+        job, call["job"] = call["job"], None
+        try:
+            call["response"] = job.result()[0][0]
+        except Exception as e:
+            record_model_call(call["model"], time.time() - call["started_at"], call["prompt"], None, call["focus_area"], "async", error=str(e))
+            raise
+        record_model_call(call["model"], time.time() - call["started_at"], call["prompt"], call["response"], call["focus_area"], "async")
+        if call["response"]:
+            llm_cache_put(call["cache_key"], call["model"], call["snapshot_id"], call["response"])
+    return call["response"]
+
+def schedule_cortex_retry(call, error):
+    """Queue a failed call for another attempt after a jittered backoff; False when the error is not transient or the retries are spent"""
+    call["attempt"] += 1
+    if call["attempt"] > LLM_MAX_RETRIES or not is_transient_error(error):
+        return False
+    call["retry_at"] = time.time() + random.uniform(0, LLM_RETRY_BASE_SECONDS * 2 ** call["attempt"])
+    return True
+
+def generate_all_insights(data, model_name, profile, on_result):
+    """Issue every focus area's Cortex call at once and report each result as soon as it lands.
+    Transient errors are retried with jittered backoff within each call's deadline."""
+    pending = {}
+    for area in focus_areas:
+        try:
+            area_model = resolve_model(model_name, area)
+            pending[area] = submit_cortex_model(build_insights_prompt(data, area, profile, area_model), area_model, area)
+        except Exception as e:
+            on_result(area, None, f"Cortex error: {str(e)}", 0.0, model_name)
+    while pending:
+        for area in [area for area, call in pending.items() if time.time() - call["started_at"] > LLM_CALL_DEADLINE_SECONDS]:
+            call = pending.pop(area)
+            cancel_cortex_job(call["job"])
+            record_model_call(call["model"], time.time() - call["started_at"], call["prompt"], None, area, "async", error="deadline exceeded")
+            on_result(area, None, f"Cortex call exceeded the {LLM_CALL_DEADLINE_SECONDS}s deadline", time.time() - call["started_at"], call["model"])
+        for call in pending.values():
+            if call["retry_at"] is not None and time.time() >= call["retry_at"]:
+                call["job"] = session.sql(CORTEX_COMPLETE_QUERY, params=[call["model"], call["prompt"]]).collect_nowait()
+                call["retry_at"] = None
+        finished = [area for area, call in pending.items() if call["retry_at"] is None and (call["job"] is None or call["job"].is_done())]
+        for area in finished:
+            call = pending[area]
+            try:
+                response = collect_cortex_model(call)
+            except Exception as e:
+                if schedule_cortex_retry(call, e):
+                    continue
+                del pending[area]
+                on_result(area, None, f"Cortex error: {str(e)}", time.time() - call["started_at"], call["model"])
+                continue
+            del pending[area]
+            on_result(area, response, None, time.time() - call["started_at"], call["model"])
+        if pending:
+            time.sleep(ASYNC_POLL_SECONDS)
+
+# Segment reports - many prompts answered by one set-based COMPLETE query
+SEGMENT_LIMIT = 8
+CORTEX_BATCH_SIZE = 50
+
+def call_cortex_model_batch(prompts, model_name, focus_area=None):
+    """Answer {key: prompt} with COMPLETE over a VALUES list, one query per batch of prompts"""
+    responses = {}
+    misses = {}
+    snapshot_id = current_data_snapshot()
+    for key, prompt in prompts.items():
+        cached = llm_cache_get(llm_cache_key(prompt, model_name), snapshot_id)
+        if cached is not None:
+            responses[key] = cached
+            record_model_call(model_name, 0.0, prompt, cached, focus_area, "batch", cache_hit=True)
+        else:
+            misses[key] = prompt
+
+    keys = list(misses)
+    for start in range(0, len(keys), CORTEX_BATCH_SIZE):
+        batch = keys[start:start + CORTEX_BATCH_SIZE]
+        values = ", ".join(["(?, ?)"] * len(batch))
+        query = f"SELECT column1 AS prompt_key, SNOWFLAKE.CORTEX.COMPLETE(?, column2) AS response FROM VALUES {values}"
+        params = [model_name]
+        for i, key in enumerate(batch):
+            params += [str(start + i), misses[key]]
+        batch_started = time.time()
+        try:
+            rows = session.sql(query, params=params).collect()
+        except Exception as e:
+            st.error(f"❌ Cortex error: {str(e)}")
+            continue
+        for prompt_key, response in rows:
+            key = keys[int(prompt_key)]
+            responses[key] = response
+            record_model_call(model_name, time.time() - batch_started, misses[key], response, focus_area, "batch")
+            if response:
+                llm_cache_put(llm_cache_key(misses[key], model_name), model_name, snapshot_id, response)
+    return responses
+
+def generate_segment_insights(data, focus_area, model_name, profile):
+    """One focus-area report per top value of the vertical's segment column, generated in a single batched query"""
+    segment_column = VERTICAL["segment_column"]
+    model_name = resolve_model(model_name, focus_area)
+    st.session_state.last_model_used = model_name
+    segments = list(profile["value_counts"][segment_column].head(SEGMENT_LIMIT).index)
+    prompts = {}
+    for segment in segments:
+        segment_data = data[data[segment_column] == segment]
+        segment_prompt = build_insights_prompt(segment_data, focus_area, build_dataset_profile(segment_data), model_name)
+        prompts[segment] = segment_prompt + f"\n\nSegment analysed: {segment_column} = {segment} ({len(segment_data)} records)"
+    responses = call_cortex_model_batch(prompts, model_name, focus_area)
+    return [(segment, responses.get(segment)) for segment in segments]
+
+# Chart data pipeline - aggregate in pandas so chart specs carry summary rows instead of every record
+def histogram_data(data, column, maxbins):
+    """Bin edges, midpoints and counts for a numeric column; values that do not parse as numbers are skipped"""
+    values = pd.to_numeric(data[column], errors="coerce").dropna()
+    if values.empty:
+        return pd.DataFrame(columns=["bin_start", "bin_end", "bin_mid", "count"])
+    counts, edges = np.histogram(values, bins=maxbins)
+    return pd.DataFrame({"bin_start": edges[:-1], "bin_end": edges[1:], "bin_mid": (edges[:-1] + edges[1:]) / 2, "count": counts})
+
+def boxplot_data(data, group_column, value_column):
+    """Quartiles per group with Tukey whiskers - the most extreme values within 1.5 IQR - and the rows outside them"""
+    values = data[[group_column]].assign(**{value_column: pd.to_numeric(data[value_column], errors="coerce")}).dropna()
+    stats = values.groupby(group_column)[value_column].quantile([0.25, 0.5, 0.75]).unstack()
+    stats.columns = ["q1", "median", "q3"]
+    iqr = stats["q3"] - stats["q1"]
+    bounds = values.join(pd.DataFrame({"low": stats["q1"] - 1.5 * iqr, "high": stats["q3"] + 1.5 * iqr}), on=group_column)
+    inside = bounds[(bounds[value_column] >= bounds["low"]) & (bounds[value_column] <= bounds["high"])]
+    stats["lower"] = inside.groupby(group_column)[value_column].min()
+    stats["upper"] = inside.groupby(group_column)[value_column].max()
+    outliers = bounds.loc[~bounds.index.isin(inside.index), [group_column, value_column]].rename(columns={value_column: "value"})
+    return stats.reset_index(), outliers.reset_index(drop=True)
+
+def boxplot_chart(stats, outliers, group_column, x_title, y_title):
+    """Whisker, box, median and outlier layers drawn from boxplot_data rows"""
+    base = alt.Chart(stats).encode(alt.X(f'{group_column}:N', title=x_title))
+    whiskers = base.mark_rule().encode(alt.Y('lower:Q', title=y_title), alt.Y2('upper:Q'))
+    boxes = base.mark_bar(size=14).encode(
+        alt.Y('q1:Q'), alt.Y2('q3:Q'),
+        color=alt.Color(f'{group_column}:N', legend=None),
+        tooltip=[f'{group_column}:N', alt.Tooltip('lower:Q', format='.2f'), alt.Tooltip('q1:Q', format='.2f'),
+                 alt.Tooltip('median:Q', format='.2f'), alt.Tooltip('q3:Q', format='.2f'), alt.Tooltip('upper:Q', format='.2f')]
+    )
+    medians = base.mark_tick(color='white', size=14).encode(alt.Y('median:Q'))
+    points = alt.Chart(outliers).mark_point(size=20).encode(
+        alt.X(f'{group_column}:N'), alt.Y('value:Q'),
+        color=alt.Color(f'{group_column}:N', legend=None),
+        tooltip=[f'{group_column}:N', alt.Tooltip('value:Q', format='.2f')]
+    )
+    return alt.layer(whiskers, boxes, medians, points)
+
+def grouped_mean_data(data, group_column, value_column):
+    return data.groupby(group_column)[value_column].mean().reset_index()
+
+# Downsampling - keep scatter and trend charts responsive on large tables
+SCATTER_POINT_LIMIT = 5000
+DENSITY_POINT_LIMIT = 50000
+LINE_POINT_LIMIT = 500
+DENSITY_BINS = 40
+
+def stratified_sample(data, strata_column, n, seed=42):
+    """About n rows keeping each stratum's share, with at least one row from every stratum"""
+    if len(data) <= n:
+        return data
+    if not strata_column or strata_column not in data.columns:
+        return data.sample(n=n, random_state=seed)
+    sample = data.groupby(strata_column, dropna=False).sample(frac=n / len(data), random_state=seed)
+    sample = pd.concat([sample, data.groupby(strata_column, dropna=False).head(1)])
+    return sample[~sample.index.duplicated()]
+
+def sample_points(data, strata_column=None, limit=SCATTER_POINT_LIMIT):
+    """Rows to draw as points and a note for the UI when they are a sample"""
+    if len(data) <= limit:
+        return data, None
+    sample = stratified_sample(data, strata_column, limit)
+    stratified = f", stratified by {strata_column.replace('_', ' ')}" if strata_column else ""
+    return sample, f"🔬 Showing a {len(sample):,}-point sample of {len(data):,} rows{stratified}"
+
+def scatter_rows(data, strata_column=None):
+    """Points for moderate tables; None above DENSITY_POINT_LIMIT, where a density grid replaces them"""
+    if len(data) > DENSITY_POINT_LIMIT:
+        return None, f"🔬 Showing point density for {len(data):,} rows"
+    return sample_points(data, strata_column)
+
+def density_chart(data, x, y, x_title, y_title, bins=DENSITY_BINS):
+    """2D histogram of two numeric columns drawn as a heatmap; rows where either value does not parse as a number are skipped"""
+    values = data[[x, y]].apply(pd.to_numeric, errors="coerce").dropna()
+    counts, x_edges, y_edges = np.histogram2d(values[x], values[y], bins=bins)
+    x_index, y_index = np.nonzero(counts)
+    grid = pd.DataFrame({
+        "x_start": x_edges[x_index], "x_end": x_edges[x_index + 1],
+        "y_start": y_edges[y_index], "y_end": y_edges[y_index + 1],
+        "count": counts[x_index, y_index].astype(int)
+    })
+    return alt.Chart(grid).mark_rect().encode(
+        alt.X('x_start:Q', bin='binned', title=x_title), alt.X2('x_end:Q'),
+        alt.Y('y_start:Q', bin='binned', title=y_title), alt.Y2('y_end:Q'),
+        color=alt.Color('count:Q', title='Rows', scale=alt.Scale(scheme='viridis', type='log')),
+        tooltip=[alt.Tooltip('count:Q', title='Rows')]
+    )
+
+def lttb(data, x, y, threshold=LINE_POINT_LIMIT):
+    """Largest-Triangle-Three-Buckets - the points that best preserve the shape of an ordered series"""
+    data = data.dropna(subset=[x, y]).sort_values(x)
+    n = len(data)
+    if n <= threshold or threshold < 3:
+        return data
+    x_values = data[x] if pd.api.types.is_numeric_dtype(data[x]) else pd.to_datetime(data[x]).astype('int64')
+    xs, ys = x_values.to_numpy(dtype=float), data[y].to_numpy(dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    keep = [0]
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = xs[end:next_end].mean(), ys[end:next_end].mean()
+        a = keep[-1]
+        area = np.abs((xs[a] - avg_x) * (ys[start:end] - ys[a]) - (xs[a] - xs[start:end]) * (avg_y - ys[a]))
+        keep.append(start + int(np.argmax(area)))
+    keep.append(n - 1)
+    return data.iloc[keep]
+
+# Chart spec cache - final Vega-Lite specs keyed by (data snapshot, chart id)
+def cached_chart_specs(snapshot_id, chart_notes):
+    """(chart id, spec) pairs already built for this snapshot, restoring their sampling notes into chart_notes"""
+    cached = [(chart_id, entry) for (entry_snapshot, chart_id), entry in st.session_state.data_cache.get("chart_specs", {}).items()
+              if entry_snapshot == snapshot_id]
+    chart_notes.update({chart_id: entry["note"] for chart_id, entry in cached if entry["note"]})
+    return [(chart_id, entry["spec"]) for chart_id, entry in cached]
+
+def store_chart_specs(snapshot_id, charts, chart_notes):
+    """Serialize finished charts once; specs for earlier snapshots are dropped"""
+    # Chart data is already aggregated or sampled, so Altair's 5,000-row guard does not apply
+    with alt.data_transformers.disable_max_rows():
+        st.session_state.data_cache["chart_specs"] = {
+            (snapshot_id, chart_id): {"spec": chart.to_dict(), "note": chart_notes.get(chart_id)} for chart_id, chart in charts
+        }
+    return cached_chart_specs(snapshot_id, chart_notes)
+
+def fixed_title_charts(charts):
+    """(title, chart) pairs with the title pushed down and extra top padding, so it is not clipped in Streamlit in Snowflake"""
+    title_padding = {"top": 28, "left": 6, "right": 6, "bottom": 6}
+    return [
+        (title, chart.properties(
+            title=alt.TitleParams(text=title or "", fontSize=16, fontWeight='bold', anchor='start', offset=14),
+            padding=title_padding
+        ).configure_title(anchor='start'))
+        for title, chart in charts
+    ]
+
+def metrics_chart_specs(create_charts, data, chart_notes, fixed_titles=False):
+    """{chart id: spec} for the Metrics tab; create_charts(data) runs only when the snapshot has no stored specs"""
+    snapshot_id = current_data_snapshot()
+    specs = cached_chart_specs(snapshot_id, chart_notes)
+    if not specs:
+        charts = create_charts(data)
+        specs = store_chart_specs(snapshot_id, fixed_title_charts(charts) if fixed_titles else charts, chart_notes)
+    return dict(specs)
+
+# App run - load the sample, then the shared tabs and the end-of-run bookkeeping
+def load_dataset():
+    """Sample and profile for this run; stops the app when the table is empty"""
+    data = load_data()
+    if data.empty:
+        st.error("No data found.")
+        st.stop()
+
+    dataset_profile = get_dataset_profile(data)
+    refresh_kpi_materialization()
+    data_version_watcher()
+    return data, dataset_profile
+
+def mark_first_paint(import_seconds, first_paint_seconds):
+    """Record the startup profile once per browser session; the app draws its header before the heavy imports"""
+    if 'startup_profile' not in st.session_state:
+        st.session_state.startup_profile = {"imports": import_seconds, "first_paint": first_paint_seconds, "full_run": None}
+
+def render_table_sketch():
+    """Full-table statistics from warehouse sketches, with their error bounds"""
+    table_sketch = get_table_sketch()
+    if table_sketch is not None:
+        with st.expander(f"🌐 Full-Table Statistics (approximate, {table_sketch['rows']:,} records)"):
+            if not table_sketch["quantiles"].empty:
+                st.dataframe(table_sketch["quantiles"].round(3), use_container_width=True)
+                st.caption("Quartiles are t-digest estimates (APPROX_PERCENTILE); min, max and mean are exact.")
+            for col, distinct in table_sketch["distinct"].items():
+                top = ", ".join(f"{value} ({count:,})" for value, count in table_sketch["top_values"].get(col, []))
+                st.write(f"**{col}**: ~{distinct:,} distinct (±{distinct * HLL_RELATIVE_ERROR:,.0f}) · top: {top}")
+            st.caption(
+                f"Distinct counts use HyperLogLog (typical relative error ±{HLL_RELATIVE_ERROR:.2%}). "
+                f"Top values use a space-saving sketch with {SKETCH_COUNTERS:,} counters, so each count "
+                f"is over-estimated by at most {table_sketch['top_k_error']:,.0f} records."
+            )
+
+def render_insights_tab(data, dataset_profile):
+    """AI Insights tab - agent runs, streaming, generate-all and segment reports"""
+    labels = VERTICAL["insights_labels"]
+    segment_column = VERTICAL["segment_column"]
+    st.subheader("✨ AI-Powered Insights with Agent Workflows")
+    st.markdown(f"**Experience behind-the-scenes AI agent processing for each {labels['intro']} focus area**")
+    
+    focus_area = st.radio("Focus Area", [
+        "Overall Performance", 
+        "Optimization Opportunities", 
+        "Financial Impact", 
+        "Strategic Recommendations"
+    ])
+    
+    # Show business challenge and solution
+    focus_info = get_focus_area_info(focus_area)
+    if focus_info["challenge"]:
+        st.markdown("#### Business Challenge")
+        st.info(focus_info["challenge"])
+        st.markdown("#### Agent Solution")
+        st.success(focus_info["solution"])
+    
+    st.markdown("**Select Snowflake Cortex Model for Analysis:**")
+    selected_model = st.selectbox("", [AUTO_MODEL] + MODELS, index=1, label_visibility="collapsed")
+    stream_output = st.checkbox("Stream the report as it is generated", value=False)
+    st.slider("Reuse answers to similar prompts above this similarity", 0.80, 1.00, step=0.01, key="semantic_cache_threshold",
+              help="Compared with earlier prompts for the same model and focus area. 1.00 turns the semantic cache off.")
+
+    # Agent control buttons and status
+    col1, col2, col3 = st.columns([2, 1, 1])
+    
+    agent_running_key = f"{focus_area}_agent_running"
+    if agent_running_key not in st.session_state:
+        st.session_state[agent_running_key] = False
+    
+    with col1:
+        if st.button("🚀 Start Agent"):
+            st.session_state[agent_running_key] = True
+            st.rerun()
+    
+    with col2:
+        if st.button("⏹ Stop Agent"):
+            st.session_state[agent_running_key] = False
+            st.rerun()
+    
+    with col3:
+        st.markdown("**Status**")
+        if st.session_state[agent_running_key]:
+            st.markdown('<div class="agent-status-active">✅ Active</div>', unsafe_allow_html=True)
+        else:
+            st.markdown("⏸ Ready")
+
+    # Generate all four focus areas concurrently, streaming each report into history as it lands
+    if st.button("⚡ Generate All Focus Areas"):
+        generate_all_started = time.time()
+        generate_all_results = st.container()
+
+        def show_focus_area_result(area, insights, error, elapsed, model):
+            with generate_all_results:
+                if error or not insights:
+                    st.error(f"❌ {area}: {error or 'no response'}")
+                    return
+                st.success(f"🎉 {area} completed in {elapsed:.1f}s with {model}")
+                with st.expander(f"📋 Generated {area} Report", expanded=False):
+                    st.markdown(insights)
+            record_insight({
+                "timestamp": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M"),
+                "focus": area,
+                "insights": insights,
+                "model": model
+            })
+
+        with st.spinner(f"Generating {len(focus_areas)} focus areas concurrently..."):
+            generate_all_insights(data, selected_model, dataset_profile, show_focus_area_result)
+        st.caption(f"All focus areas finished in {time.time() - generate_all_started:.1f}s")
+
+    # Segment reports - one batched Cortex query for every segment of the selected focus area
+    if segment_column in data.columns:
+        with st.expander(f"🧩 {focus_area} by {segment_column.replace('_', ' ').title()}"):
+            st.caption(f"Generates one report per top {SEGMENT_LIMIT} {segment_column} values in a single set-based COMPLETE query.")
+            if st.button("Generate Segment Reports"):
+                with st.spinner("Running batched Cortex query..."):
+                    segment_started = time.time()
+                    segment_reports = generate_segment_insights(data, focus_area, selected_model, dataset_profile)
+                st.caption(f"{len(segment_reports)} segment reports in {time.time() - segment_started:.1f}s")
+                for segment, segment_insights in segment_reports:
+                    if not segment_insights:
+                        st.error(f"❌ {segment}: no response")
+                        continue
+                    st.markdown(f"#### {segment}")
+                    st.markdown(segment_insights)
+                    record_insight({
+                        "timestamp": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M"),
+                        "focus": f"{focus_area} · {segment}",
+                        "insights": segment_insights,
+                        "model": st.session_state.last_model_used
+                    })
+
+    # Observed per-model latency and token usage - what the auto router ranks models by
+    if st.session_state.model_stats:
+        with st.expander("📈 Model Routing Stats"):
+            st.dataframe(pd.DataFrame([{
+                "Model": model,
+                "Calls": stats["calls"],
+                "Failures": stats["failures"],
+                "Median Latency (s)": round(model_latency(model), 2),
+                "Prompt Tokens": stats["prompt_tokens"],
+                "Completion Tokens": stats["completion_tokens"]
+            } for model, stats in st.session_state.model_stats.items()]), use_container_width=True, hide_index=True)
+            st.caption(f"{AUTO_MODEL} starts at the smallest adequate tier and escalates when a report is too short, lacks figures or misses the requested sections.")
+
+    # Progress placeholder
+    progress_placeholder = st.empty()
+    
+    # Run agent if active
+    # Streaming mode - render the report token by token while Cortex generates it
+    if st.session_state[agent_running_key] and stream_output:
+        with st.expander(f"📋 Generated {focus_area} Report", expanded=True):
+            stream_model = resolve_model(selected_model, focus_area)
+            st.caption(f"Streaming from {stream_model}")
+            insights = st.write_stream(stream_cortex_model(build_insights_prompt(data, focus_area, dataset_profile, stream_model), stream_model, focus_area))
+        if st.session_state.last_llm_cache_hit:
+            st.caption(cache_hit_caption())
+        if st.session_state.last_prompt_stats:
+            st.caption(prompt_stats_caption())
+        if insights:
+            record_insight({
+                "timestamp": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M"),
+                "focus": focus_area,
+                "insights": insights,
+                "model": st.session_state.last_model_used
+            })
+        st.session_state[agent_running_key] = False
+    elif st.session_state[agent_running_key]:
+        with st.spinner("Agent Running..."):
+            insights = generate_insights_with_agent_workflow(data, focus_area, selected_model, progress_placeholder, dataset_profile)
+            
+            if insights:
+                # Show completion message
+                st.success(f"🎉 {focus_area} Agent completed with real {labels['completed']} analysis!")
+                if st.session_state.last_llm_cache_hit:
+                    st.caption(cache_hit_caption())
+                if st.session_state.last_prompt_stats:
+                    st.caption(prompt_stats_caption())
+                
+                # Show report in expandable section
+                with st.expander(f"📋 Generated {focus_area} Report (Real {labels['report']})", expanded=True):
+                    st.markdown(f"""
+                    <div class="agent-report-header">
+                        <strong>{focus_area} Report - AI-Generated {labels['analysis']}</strong><br>
+                        <small>Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}</small><br>
+                        <small>Data Source: Live Snowflake {labels['source']}</small><br>
+                        <small>AI Model: {st.session_state.last_model_used}</small>
+                    </div>
+                    """, unsafe_allow_html=True)
+                    
+                    st.markdown(insights)
+                
+                # Save to history
+                timestamp = pd.Timestamp.now().strftime("%Y-%m-%d %H:%M")
+                record_insight({
+                    "timestamp": timestamp,
+                    "focus": focus_area,
+                    "insights": insights,
+                    "model": st.session_state.last_model_used
+                })
+                
+                # Stop the agent after completion
+                st.session_state[agent_running_key] = False
+
+def render_history_tab():
+    """Insights History tab - saved reports keyset-paged from the history table"""
+    st.subheader("📁 Insights History")
+    col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
+    with col1:
+        history_search = st.text_input("Search insights", placeholder="Words to find in past reports").strip()
+    with col2:
+        history_focus = st.selectbox("Focus area", [""] + focus_areas, format_func=lambda f: f or "(all)")
+    with col3:
+        history_model = st.selectbox("Model", [""] + MODELS, format_func=lambda m: m or "(all)")
+    with col4:
+        if st.button("🔄 Refresh", key="history_refresh", help="Show reports saved by other sessions"):
+            bump_history_version()
+
+    history_state = st.session_state.history_state
+    signature = (history_state["version"], history_search, history_focus, history_model)
+    if history_state["signature"] != signature:
+        history_state.update({"signature": signature, "page": 1, "cursors": {1: None}})
+
+    nav1, nav2, nav3, _ = st.columns([1, 1, 1, 5])
+    with nav1:
+        if st.button("⏮ First", key="history_first", disabled=history_state["page"] == 1):
+            history_state["page"] = 1
+    with nav2:
+        if st.button("◀ Previous", key="history_previous", disabled=history_state["page"] == 1):
+            history_state["page"] -= 1
+    with nav3:
+        if st.button("Next ▶", key="history_next", disabled=history_state["page"] + 1 not in history_state["cursors"]):
+            history_state["page"] += 1
+
+    page = history_state["page"]
+    history_entries, next_cursor, history_total = load_history_page(
+        history_search, history_focus, history_model, page, history_state["cursors"][page]
+    )
+    if next_cursor is not None and history_state["cursors"].get(page + 1) != next_cursor:
+        history_state["cursors"] = {p: c for p, c in history_state["cursors"].items() if p <= page}
+        history_state["cursors"][page + 1] = next_cursor
+    if history_entries:
+        # Only the current page is fetched and rendered
+        for item in history_entries:
+            with st.expander(f"{item['timestamp']} - {item['focus']} ({item['model']})", expanded=False):
+                st.markdown(item["insights"])
+        st.caption(f"Page {page} of {max(-(-history_total // HISTORY_PAGE_SIZE), page)} · {history_total:,} saved insights")
+    elif history_search or history_focus or history_model:
+        st.info("No saved insights match these filters.")
+    else:
+        st.info("No insights generated yet. Go to the AI Insights tab to generate some insights.")
+
+def render_explorer_tab(data):
+    """Data Explorer tab - keyset-paged rows of the source table"""
+    st.subheader("🔍 Data Explorer")
+    table_columns = get_table_columns()
+    key_column = find_key_column(table_columns)
+
+    if not key_column:
+        # No stable key to seek on - fall back to paging the loaded sample
+        rows_per_page = st.slider("Rows per page", 5, 50, 10)
+        page = st.number_input("Page", min_value=1, max_value=max(-(-len(data) // rows_per_page), 1), value=1, key="explorer_sample_page")
+        start = (page - 1) * rows_per_page
+        end = min(start + rows_per_page, len(data))
+        st.dataframe(data.iloc[start:end], use_container_width=True)
+        st.caption(f"Showing rows {start + 1}–{end} of {len(data)}")
+    else:
+        col1, col2, col3 = st.columns([3, 2, 1])
+        with col1:
+            selected_columns = st.multiselect("Columns", table_columns, default=table_columns, format_func=str.lower)
+        with col2:
+            sort_column = st.selectbox("Sort by", table_columns, index=table_columns.index(key_column), format_func=str.lower)
+            sort_descending = st.checkbox("Descending", value=False)
+        with col3:
+            rows_per_page = st.slider("Rows per page", 5, 50, 10)
+
+        col1, col2, col3 = st.columns([2, 1, 2])
+        with col1:
+            filter_column = st.selectbox("Filter column", [""] + table_columns, format_func=lambda col: col.lower() if col else "(no filter)")
+        with col2:
+            filter_operator = st.selectbox("Operator", EXPLORER_OPERATORS)
+        with col3:
+            filter_value = st.text_input("Value").strip()
+
+        try:
+            filter_clause = build_filter_clause(filter_column, filter_operator, filter_value)
+        except ValueError as e:
+            st.error(f"❌ {str(e)}")
+            return
+        # Projection always carries the sort and key columns so the next cursor can be read from the page
+        query_columns = list(dict.fromkeys((selected_columns or table_columns) + [sort_column, key_column]))
+        query_args = (query_columns, key_column, sort_column, sort_descending, filter_clause, rows_per_page)
+        signature = (tuple(query_columns), sort_column, sort_descending, filter_clause[0], tuple(filter_clause[1]), rows_per_page)
+
+        explorer_state = st.session_state.explorer_state
+        if explorer_state["signature"] != signature:
+            explorer_state.update({"signature": signature, "page": 1, "cursors": {1: None}})
+
+        nav1, nav2, nav3, _ = st.columns([1, 1, 1, 5])
+        with nav1:
+            if st.button("⏮ First", disabled=explorer_state["page"] == 1):
+                explorer_state["page"] = 1
+        with nav2:
+            if st.button("◀ Previous", disabled=explorer_state["page"] == 1):
+                explorer_state["page"] -= 1
+        with nav3:
+            if st.button("Next ▶", disabled=explorer_state["page"] + 1 not in explorer_state["cursors"]):
+                explorer_state["page"] += 1
+
+        page = explorer_state["page"]
+        warm_explorer_queries(signature, query_args, explorer_state["cursors"][page], filter_clause)
+        page_df = fetch_explorer_page(signature, query_args, explorer_state["cursors"][page])
+        has_next = len(page_df) > rows_per_page
+        page_df = page_df.head(rows_per_page)
+
+        if has_next:
+            last_row = page_df.iloc[-1]
+            next_cursor = (to_bind_value(last_row[sort_column]), to_bind_value(last_row[key_column]))
+            if explorer_state["cursors"].get(page + 1) != next_cursor:
+                explorer_state["cursors"] = {p: c for p, c in explorer_state["cursors"].items() if p <= page}
+                explorer_state["cursors"][page + 1] = next_cursor
+            prefetch_explorer_page(signature, query_args, next_cursor)
+
+        display_df = page_df[[col for col in page_df.columns if col in (selected_columns or table_columns)]]
+        display_df.columns = [col.lower() for col in display_df.columns]
+        st.dataframe(display_df, use_container_width=True)
+
+        start = (page - 1) * rows_per_page
+        total_rows = count_explorer_rows(filter_clause)
+        total_label = f"{total_rows:,}" if total_rows is not None else "?"
+        st.caption(f"Page {page} · showing rows {start + 1 if len(page_df) else 0}–{start + len(page_df)} of {total_label} (keyset on {key_column.lower()})")
+
+def render_ops_tab():
+    """Ops tab - app latency, startup profile and LLM telemetry"""
+    st.subheader("🛠 Ops")
+    st.markdown("**App Latency**")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Snowpark Sessions", len(session_pool["sessions"]))
+    with col2:
+        if session_pool["connect_seconds"] is None:
+            st.metric("Cold Start", "n/a")
+        else:
+            st.metric("Cold Start", f"{session_pool['connect_seconds'] + session_pool['warmup_seconds']:.1f}s",
+                      help=f"Connect {session_pool['connect_seconds']:.1f}s, warm-up {session_pool['warmup_seconds']:.1f}s")
+    with col3:
+        if st.session_state.run_latencies:
+            st.metric("Rerun p50 / p95", f"{np.percentile(st.session_state.run_latencies, 50):.2f}s / {np.percentile(st.session_state.run_latencies, 95):.2f}s")
+        else:
+            st.metric("Rerun p50 / p95", "n/a")
+    startup = st.session_state.startup_profile
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Imports", f"{startup['imports']:.2f}s")
+    with col2:
+        st.metric("First Paint", f"{startup['first_paint']:.2f}s")
+    with col3:
+        st.metric("First Full Run", f"{startup['full_run']:.2f}s" if startup["full_run"] is not None else "n/a")
+    st.markdown("**LLM Calls**")
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        ops_days = st.selectbox("Window", [1, 7, 30], index=1, format_func=lambda d: f"Last {d} day{'s' if d > 1 else ''}")
+    with col2:
+        if st.button("🔄 Refresh", key="telemetry_refresh", help="Reload the summary from the telemetry table"):
+            st.session_state.telemetry["summaries"].clear()
+    by_model, source = load_telemetry_summary("model", ops_days)
+    if by_model.empty:
+        st.info("No LLM calls recorded yet. Generate some insights to populate telemetry.")
+    else:
+        if source == "session":
+            st.caption(f"{TELEMETRY_TABLE} is not available - showing this session's calls only.")
+        total_calls = by_model["calls"].sum()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("LLM Calls", f"{total_calls:,}")
+        with col2:
+            st.metric("Cache Hit Rate", f"{(by_model['cache_hit_rate'] * by_model['calls']).sum() / total_calls:.0%}")
+        with col3:
+            st.metric("Errors", f"{int(by_model['errors'].sum()):,}")
+        st.markdown("**Latency by Model**")
+        st.dataframe(by_model.round(2), use_container_width=True, hide_index=True)
+        by_focus, _ = load_telemetry_summary("focus_area", ops_days)
+        st.markdown("**Latency by Focus Area**")
+        st.dataframe(by_focus.round(2), use_container_width=True, hide_index=True)
+        st.caption(f"p50/p95 exclude cache hits. Latency is measured client-side per Cortex call. "
+                   f"The summary is refreshed at most every {TELEMETRY_SUMMARY_TTL_SECONDS} seconds.")
+
+def finish_run(script_started, run_started):
+    """End-of-run bookkeeping: flush telemetry, record the first full run and this run's latency"""
+    flush_telemetry()
+
+    # Startup profile - the first run of each browser session
+    if st.session_state.startup_profile["full_run"] is None:
+        st.session_state.startup_profile["full_run"] = time.perf_counter() - script_started
+
+    # Rerun latency - wall time of this script run, kept for the Ops tab
+    st.session_state.run_latencies = (st.session_state.run_latencies + [time.time() - run_started])[-RUN_LATENCY_WINDOW:]
@@ -0,0 +1,890 @@
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import pytest
+import streamlit as st
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import solution_engine as engine
+
+
+@pytest.fixture(autouse=True)
+def session_state():
+    st.session_state.data_cache = {}
+    st.session_state.numeric_table_columns = {"age", "weight"}
+    yield
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+
+
+def sample_frame(ids, epochs, weights, breeds):
+    return pd.DataFrame({
+        "record_id": ids,
+        "last_updated_epoch": epochs,
+        "weight": weights,
+        "breed": breeds,
+    })
+
+
+# Delta loading
+
+def test_merge_delta_replaces_changed_rows_and_appends_new_ones():
+    frame = sample_frame(["a", "b", "c"], [1.0, 2.0, 3.0], [10.0, 20.0, 30.0], ["x", "y", "x"])
+    delta = sample_frame(["b", "d"], [4.0, 5.0], [25.0, 40.0], ["y", "z"])
+
+    merged, removed, added = engine.merge_delta(frame, delta)
+
+    assert sorted(merged["record_id"]) == ["a", "b", "c", "d"]
+    assert merged.set_index("record_id").loc["b", "weight"] == 25.0
+    assert list(removed["record_id"]) == ["b"]
+    assert list(added["record_id"]) == ["b", "d"]
+
+
+def test_merge_delta_keeps_last_duplicate_key():
+    frame = sample_frame(["a"], [1.0], [10.0], ["x"])
+    delta = sample_frame(["b", "b"], [2.0, 3.0], [20.0, 21.0], ["y", "y"])
+
+    merged, _, added = engine.merge_delta(frame, delta)
+
+    assert len(merged) == 2
+    assert list(added["weight"]) == [21.0]
+
+
+class FakeDeltaSession:
+    def __init__(self, delta):
+        self.delta = delta
+        self.calls = []
+
+    def sql(self, query, params=None):
+        self.calls.append((query, params))
+        return type("Query", (), {"to_pandas": lambda _: self.delta.rename(columns=str.upper)})()
+
+
+def test_fetch_delta_reads_from_the_watermark_inclusive_and_keeps_the_newest_row_per_key(monkeypatch):
+    monkeypatch.setattr(engine, "table_name", "AGR_RECORDS")
+    fake = FakeDeltaSession(sample_frame(["c", "e", "e"], [3.0, 3.0, 4.0], [30.0, 50.0, 51.0], ["x", "z", "z"]))
+    monkeypatch.setattr(engine, "session", fake)
+
+    delta = engine.fetch_delta(3.0)
+
+    assert fake.calls == [("SELECT * FROM AGR_RECORDS WHERE last_updated_epoch >= ? "
+                           "ORDER BY last_updated_epoch, record_id LIMIT 5001", [3.0])]
+    assert list(delta["record_id"]) == ["c", "e"]
+    assert list(delta["weight"]) == [30.0, 51.0]
+
+
+def test_merge_delta_absorbs_rows_reread_at_the_watermark():
+    frame = sample_frame(["a", "b", "c"], [1.0, 2.0, 3.0], [10.0, 20.0, 30.0], ["x", "y", "x"])
+    # c is read again because it sits on the watermark; e was committed later with the same watermark
+    delta = sample_frame(["c", "e"], [3.0, 3.0], [30.0, 50.0], ["x", "z"])
+
+    merged, removed, added = engine.merge_delta(frame, delta)
+
+    assert sorted(merged["record_id"]) == ["a", "b", "c", "e"]
+    assert merged["record_id"].is_unique
+    assert list(removed["record_id"]) == ["c"]
+    assert list(added["record_id"]) == ["c", "e"]
+
+
+def test_merge_delta_evicts_least_recently_updated_rows(monkeypatch):
+    monkeypatch.setattr(engine, "DATA_SAMPLE_ROWS", 3)
+    frame = sample_frame(["a", "b", "c"], [1.0, 2.0, 3.0], [10.0, 20.0, 30.0], ["x", "y", "x"])
+    delta = sample_frame(["d", "e"], [4.0, 5.0], [40.0, 50.0], ["z", "z"])
+
+    merged, removed, _ = engine.merge_delta(frame, delta)
+
+    assert sorted(merged["record_id"]) == ["c", "d", "e"]
+    assert sorted(removed["record_id"]) == ["a", "b"]
+
+
+def test_update_dataset_profile_matches_a_rebuilt_profile():
+    frame = sample_frame(["a", "b", "c", "d"], [1.0, 2.0, 3.0, 4.0], [10.0, 20.0, 20.0, 30.0], ["x", "y", "x", "y"])
+    delta = sample_frame(["b", "e"], [5.0, 6.0], [35.0, 5.0], ["z", "x"])
+    merged, removed, added = engine.merge_delta(frame, delta)
+
+    updated = engine.update_dataset_profile(engine.build_dataset_profile(frame), merged, removed, added)
+    rebuilt = engine.build_dataset_profile(merged)
+
+    assert updated["records"] == rebuilt["records"]
+    np.testing.assert_allclose(updated["sorted"]["weight"], rebuilt["sorted"]["weight"])
+    assert updated["means"]["weight"] == pytest.approx(rebuilt["means"]["weight"])
+    assert updated["value_counts"]["breed"].to_dict() == rebuilt["value_counts"]["breed"].to_dict()
+    assert updated["distinct"]["breed"] == rebuilt["distinct"]["breed"]
+    pd.testing.assert_frame_equal(updated["describe"], rebuilt["describe"], check_dtype=False)
+
+
+def test_describe_sorted_matches_pandas_describe():
+    frame = pd.DataFrame({"weight": [3.0, 1.0, 4.0, 1.0, 5.0, 9.0]})
+    profile = engine.build_dataset_profile(frame)
+
+    stats = engine.describe_sorted(profile, ["weight"])
+
+    pd.testing.assert_frame_equal(stats, frame.describe(), check_dtype=False)
+
+
+def test_describe_sorted_reports_zero_count_for_missing_column():
+    profile = {"sorted": {}}
+
+    stats = engine.describe_sorted(profile, ["weight"])
+
+    assert stats.loc["count", "weight"] == 0
+    assert stats["weight"].iloc[1:].isna().all()
+
+
+# Data Explorer SQL
+
+def test_build_keyset_clause_first_page_has_no_predicate():
+    assert engine.build_keyset_clause("weight", "record_id", False, None) == ("", [])
+
+
+def test_build_keyset_clause_on_key_column():
+    clause, params = engine.build_keyset_clause("record_id", "record_id", True, (None, "r9"))
+
+    assert clause == '"record_id" < ?'
+    assert params == ["r9"]
+
+
+def test_build_keyset_clause_seeks_past_sort_value_then_key():
+    clause, params = engine.build_keyset_clause("weight", "record_id", False, (12.5, "r3"))
+
+    assert clause == '("weight" > ? OR ("weight" = ? AND "record_id" > ?) OR "weight" IS NULL)'
+    assert params == [12.5, 12.5, "r3"]
+
+
+def test_build_keyset_clause_inside_null_block():
+    clause, params = engine.build_keyset_clause("weight", "record_id", False, (None, "r3"))
+
+    assert clause == '("weight" IS NULL AND "record_id" > ?)'
+    assert params == ["r3"]
+
+
+def test_build_filter_clause_without_value_is_empty():
+    assert engine.build_filter_clause("weight", ">", "") == ("", [])
+    assert engine.build_filter_clause(None, ">", "5") == ("", [])
+
+
+def test_build_filter_clause_casts_numeric_columns():
+    assert engine.build_filter_clause("weight", ">=", "12.5") == ('"weight" >= ?', [12.5])
+    assert engine.build_filter_clause("age", "=", "3") == ('"age" = ?', [3])
+
+
+def test_build_filter_clause_parses_exponents_and_negative_numbers():
+    assert engine.build_filter_clause("weight", "<", "1e3") == ('"weight" < ?', [1000.0])
+    assert engine.build_filter_clause("age", ">", "-2") == ('"age" > ?', [-2])
+
+
+def test_build_filter_clause_rejects_values_that_are_not_numbers():
+    for value in ["heavy", "12,5", "nan"]:
+        with pytest.raises(ValueError, match="weight is numeric"):
+            engine.build_filter_clause("weight", ">=", value)
+
+
+def test_build_filter_clause_keeps_text_columns_as_strings():
+    assert engine.build_filter_clause("breed", "=", "42") == ('"breed" = ?', ["42"])
+
+
+def test_build_filter_clause_contains_is_case_insensitive():
+    clause, params = engine.build_filter_clause("breed", "contains", "Angus")
+
+    assert clause == 'CONTAINS(LOWER(TO_VARCHAR("breed")), LOWER(?))'
+    assert params == ["Angus"]
+
+
+def test_kpi_sql_count_equal_escapes_the_value():
+    assert engine.kpi_sql("trial_status", "count_equal", "Active") == "COUNT_IF(trial_status = 'Active')"
+    assert engine.kpi_sql("owner", "count_equal", "O'Brien") == "COUNT_IF(owner = 'O''Brien')"
+    assert engine.kpi_sql("path", "count_equal", "a\\') OR 1=1 --") == "COUNT_IF(path = 'a\\\\'') OR 1=1 --')"
+
+
+# Prompt assembly
+
+def test_compose_prompt_within_budget_keeps_every_section():
+    sections = [("solution", "Solution text.", 0), ("data", "Data summary.", 1), ("notes", "Extra notes.", 2)]
+
+    prompt = engine.compose_prompt(sections, None)
+
+    assert prompt == "Solution text.\n\nData summary.\n\nExtra notes."
+    assert st.session_state.last_prompt_stats["actions"] == []
+
+
+def insights_sections(summary_rows=48):
+    """Sections laid out as build_insights_prompt does; 48 summary rows gives a typical prompt of about 1,900 tokens"""
+    paragraph = "Herd Guardian:\nTracks herd health daily. " + "It links sensors to records. " * 30 + "\n- Alerts\n- Trends\n- Reports\n- Exports"
+    return [
+        ("solution", paragraph + "\n\n" + paragraph.replace("Herd Guardian", "Feed Planner"), 2),
+        ("role", "You are an expert data analyst.", 0),
+        ("data_summary", "DATA SUMMARY:\n" + "- weight (avg: 412.00, min: 180.00, max: 690.00)\n" * summary_rows, 0),
+        ("table_sketch", "Full table:\n" + "- breed (~12 distinct): Angus: ~4,210\n" * 32, 4),
+        ("correlations", "Correlations:\n" + "- weight vs feed_intake: 0.81\n" * 13, 3),
+        ("instructions", "ANALYSIS INSTRUCTIONS:\n" + "Rank the herds by risk. " * 50, 0),
+        ("guidelines", "Use bullet points. " * 20, 1),
+    ]
+
+
+def test_model_budgets_leave_room_for_the_report_within_the_context_window():
+    for model, context in engine.MODEL_CONTEXT_TOKENS.items():
+        assert engine.PROMPT_TOKEN_BUDGETS[model] + engine.RESPONSE_TOKEN_RESERVE <= context
+    assert max(engine.PROMPT_TOKEN_BUDGETS.values()) <= engine.DEFAULT_PROMPT_TOKEN_BUDGET
+
+
+def test_typical_insights_prompt_fits_every_model_budget():
+    for model in engine.MODELS:
+        engine.compose_prompt(insights_sections(), model)
+
+        assert st.session_state.last_prompt_stats["actions"] == [], model
+
+
+def test_compose_prompt_over_budget_drops_highest_priority_sections_first():
+    prompt = engine.compose_prompt(insights_sections(summary_rows=120), "snowflake-arctic")
+
+    stats = st.session_state.last_prompt_stats
+    assert stats["actions"] == ["dropped table_sketch", "dropped correlations", "summarized solution"]
+    assert stats["tokens"] <= stats["budget"] == engine.PROMPT_TOKEN_BUDGETS["snowflake-arctic"]
+    assert "Full table:" not in prompt and "Correlations:" not in prompt
+    # Kept sections stay in their original order, with the solution summarized to headings, first sentences and two bullets
+    assert prompt.startswith("Herd Guardian:\nTracks herd health daily.\n- Alerts\n- Trends\n\nFeed Planner:")
+    order = [prompt.index(marker) for marker in ["Herd Guardian:", "You are an expert", "DATA SUMMARY:", "ANALYSIS INSTRUCTIONS:", "Use bullet points."]]
+    assert order == sorted(order)
+
+
+def test_compose_prompt_never_drops_priority_zero_sections():
+    prompt = engine.compose_prompt(insights_sections(summary_rows=160), "snowflake-arctic")
+
+    assert st.session_state.last_prompt_stats["actions"] == [
+        "dropped table_sketch", "dropped correlations", "summarized solution", "dropped solution", "dropped guidelines"
+    ]
+    assert prompt.startswith("You are an expert data analyst.\n\nDATA SUMMARY:")
+    assert prompt.endswith("Rank the herds by risk.")
+
+
+def test_compose_prompt_compacts_markdown():
+    prompt = engine.compose_prompt([("data", "**Bold**\n---\n\n\n\nNext", 0)], None)
+
+    assert prompt == "Bold\n\nNext"
+
+
+# Agent workflow
+
+def test_plan_agent_actions_matches_step_count_and_runs_middle_work_once(monkeypatch):
+    calls = []
+    for name in ["agent_patterns_step", "agent_sketch_step", "agent_prompt_step"]:
+        monkeypatch.setattr(engine, name, lambda context, name=name: calls.append(name) or name)
+
+    for step_count in [4, 5, 6, 8]:
+        actions = engine.plan_agent_actions(step_count)
+        assert len(actions) == max(step_count, 4)
+        assert actions[0] is engine.agent_data_step
+        assert actions[-2] is engine.agent_llm_step
+        assert actions[-1] is engine.agent_report_step
+
+        calls.clear()
+        results = [action({}) for action in actions[1:-2]]
+        assert calls == ["agent_patterns_step", "agent_sketch_step", "agent_prompt_step"]
+        assert "; ".join(result for result in results if result) == "; ".join(calls)
+
+
+def test_agent_steps_report_measured_results(monkeypatch):
+    monkeypatch.setattr(engine, "estimate_tokens", lambda text: 250)
+    st.session_state.last_prompt_stats = {"tokens": 1180, "budget": 1200, "actions": ["dropped table_sketch"]}
+    st.session_state.last_model_used = "llama3.1-8b"
+    st.session_state.last_llm_cache_hit = False
+    monkeypatch.setattr(engine, "build_insights_prompt", lambda *args: "prompt")
+    monkeypatch.setattr(engine, "call_cortex_model", lambda *args, **kwargs: "  ## Findings\nHerd weight rose 4%\n## Actions\nVaccinate  ")
+    context = {"data": None, "focus_area": "Overall Performance", "model_name": "llama3.1-8b", "profile": None}
+
+    assert engine.agent_prompt_step(context) == "prompt of ~1,180 tokens, budget 1,200 (dropped table_sketch)"
+    assert engine.agent_llm_step(context) == "~250 tokens from llama3.1-8b"
+    assert engine.agent_report_step(context) == "7 words in 2 sections"
+    assert context["insights"].startswith("## Findings")
+
+
+# Model cascade
+
+QUALITY_PROMPT = "Cover:\n- Herd Health (summary)\n- Feed Costs (trends)\n"
+
+
+def test_passes_quality_check_accepts_long_numeric_answer_covering_sections():
+    response = " ".join(["word"] * engine.CASCADE_MIN_WORDS) + " Herd Health 1 2 3 4 5"
+
+    assert engine.passes_quality_check(response, QUALITY_PROMPT)
+
+
+def test_passes_quality_check_rejects_short_answer():
+    assert not engine.passes_quality_check("Herd Health 1 2 3 4 5", QUALITY_PROMPT)
+    assert not engine.passes_quality_check(None, QUALITY_PROMPT)
+
+
+def test_passes_quality_check_rejects_answer_without_numbers():
+    response = " ".join(["word"] * engine.CASCADE_MIN_WORDS) + " Herd Health Feed Costs"
+
+    assert not engine.passes_quality_check(response, QUALITY_PROMPT)
+
+
+def test_passes_quality_check_rejects_answer_missing_sections():
+    prompt = QUALITY_PROMPT + "- Breeding (rates)\n"
+    response = " ".join(["word"] * engine.CASCADE_MIN_WORDS) + " Herd Health 1 2 3 4 5"
+
+    assert not engine.passes_quality_check(response, prompt)
+
+
+def cascade_calls(monkeypatch, focus_area, responses):
+    """Run the cascade on a typical insights prompt and return the models it called"""
+    st.session_state.model_stats = {}
+    called = []
+
+    def fake_call(prompt, model, focus_area=None):
+        called.append(model)
+        return responses.pop(0)
+
+    monkeypatch.setattr(engine, "call_cortex_model", fake_call)
+    engine.run_model_cascade(lambda model: engine.compose_prompt(insights_sections(), model), focus_area)
+    return called
+
+
+def test_cascade_starts_a_typical_prompt_at_the_smallest_tier(monkeypatch):
+    passing = " ".join(["word"] * engine.CASCADE_MIN_WORDS) + " 1 2 3 4 5"
+
+    called = cascade_calls(monkeypatch, "Overall Performance", [passing])
+
+    assert called[0] in engine.MODEL_TIERS[0]
+    assert called[0] == engine.resolve_model(engine.AUTO_MODEL, "Overall Performance")
+
+
+def test_cascade_escalates_one_tier_at_a_time_and_follows_focus_area_start_tier(monkeypatch):
+    called = cascade_calls(monkeypatch, "Overall Performance", ["too short"] * 3)
+    financial = cascade_calls(monkeypatch, "Financial Impact", ["too short"] * 2)
+
+    assert len(called) == len(engine.MODEL_TIERS)
+    assert all(model in tier for tier, model in zip(engine.MODEL_TIERS, called))
+    assert financial == called[1:]
+    assert financial[0] == engine.resolve_model(engine.AUTO_MODEL, "Financial Impact")
+
+
+# Resilient Cortex calls
+
+class FakeJob:
+    def __init__(self, outcome):
+        self.outcome = outcome
+
+    def is_done(self):
+        return True
+
+    def result(self):
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return [(self.outcome,)]
+
+    def cancel(self):
+        pass
+
+
+class FakeCortexSession:
+    """Answers each COMPLETE with the next queued outcome for its prompt"""
+
+    def __init__(self, outcomes):
+        self.outcomes = outcomes
+        self.prompts = []
+
+    def sql(self, query, params=None):
+        self.prompts.append(params[1])
+        return type("Query", (), {"collect_nowait": lambda _: FakeJob(self.outcomes[params[1]].pop(0))})()
+
+
+@pytest.fixture
+def quiet_cortex(monkeypatch):
+    monkeypatch.setattr(engine, "current_data_snapshot", lambda: "snapshot")
+    monkeypatch.setattr(engine, "llm_cache_get", lambda key, snapshot_id: None)
+    monkeypatch.setattr(engine, "llm_cache_put", lambda *args: None)
+    monkeypatch.setattr(engine, "semantic_cache_get", lambda *args: None)
+    monkeypatch.setattr(engine, "record_model_call", lambda *args, **kwargs: None)
+    monkeypatch.setattr(engine, "LLM_RETRY_BASE_SECONDS", 0.0)
+    monkeypatch.setattr(engine, "ASYNC_POLL_SECONDS", 0.0)
+
+
+def test_generate_all_insights_retries_transient_errors(monkeypatch, quiet_cortex):
+    monkeypatch.setattr(engine, "focus_areas", ["Herd Health", "Feed Costs"])
+    monkeypatch.setattr(engine, "resolve_model", lambda model_name, area: model_name)
+    monkeypatch.setattr(engine, "build_insights_prompt", lambda data, area, profile, model: area)
+    fake = FakeCortexSession({
+        "Herd Health": [RuntimeError("429 Too Many Requests"), "healthy herd"],
+        "Feed Costs": [RuntimeError("SQL compilation error")],
+    })
+    monkeypatch.setattr(engine, "session", fake)
+    results = {}
+
+    engine.generate_all_insights(None, "mistral-large2", None, lambda area, text, error, elapsed, model: results.update({area: (text, error)}))
+
+    assert results == {"Herd Health": ("healthy herd", None), "Feed Costs": (None, "Cortex error: SQL compilation error")}
+    assert fake.prompts == ["Herd Health", "Feed Costs", "Herd Health"]
+
+
+def test_stream_cortex_model_answers_a_stalled_stream_on_the_sql_path(monkeypatch, quiet_cortex):
+    def stalled_stream(model_name, prompt, session=None, stream=False):
+        time.sleep(0.5)
+        yield "too late"
+
+    monkeypatch.setattr(engine, "Complete", stalled_stream)
+    monkeypatch.setattr(engine, "STREAM_FIRST_CHUNK_SECONDS", 0.05)
+    monkeypatch.setattr(engine, "call_cortex_model", lambda prompt, model_name, use_cache=True, focus_area=None: "answer from sql")
+
+    chunks = list(engine.stream_cortex_model("prompt", "mistral-large2"))
+
+    assert "".join(chunks) == "answer from sql"
+
+
+def test_stream_cortex_model_does_not_retry_after_text_was_shown(monkeypatch, quiet_cortex):
+    def broken_stream(model_name, prompt, session=None, stream=False):
+        yield "First"
+        raise RuntimeError("503 Service Unavailable")
+
+    errors = []
+    monkeypatch.setattr(engine, "Complete", broken_stream)
+    monkeypatch.setattr(engine, "call_cortex_model", lambda *args, **kwargs: pytest.fail("retried after text was shown"))
+    monkeypatch.setattr(engine.st, "error", errors.append)
+
+    chunks = list(engine.stream_cortex_model("prompt", "mistral-large2"))
+
+    assert chunks == ["First"]
+    assert errors == ["❌ Cortex error: 503 Service Unavailable"]
+
+
+# Semantic cache
+
+SEMANTIC_PROMPT = ("SOLUTION CONTEXT:\nHerd monitoring\n\nDATA SUMMARY:\nRecords analyzed: 1000\n- weight (avg: 412.00)"
+                   "\n\nANALYSIS INSTRUCTIONS:\nFocus on herd health")
+
+
+class FakeEmbedSession:
+    def __init__(self):
+        self.embedded = []
+
+    def sql(self, query, params=None):
+        self.embedded.append(params[1])
+        return type("Query", (), {"collect": lambda _: [([0.5, 0.25],)]})()
+
+
+def test_semantic_cache_text_keeps_only_the_data_part():
+    assert engine.semantic_cache_text(SEMANTIC_PROMPT) == "Records analyzed: 1000\n- weight (avg: 412.00)"
+    assert engine.semantic_cache_text("free-form prompt") == "free-form prompt"
+
+
+def local_embedding(text):
+    """Deterministic stand-in for EMBED_TEXT_768: a hashed bag of words in 768 dimensions"""
+    vector = np.zeros(768)
+    for word in re.findall(r"\w+", text.lower()):
+        vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % 768] += 1
+    return vector.tolist()
+
+
+class LocalVectorSession:
+    """Semantic cache table kept in memory; embeddings, cosine similarity and age filtering are computed locally"""
+
+    def __init__(self):
+        self.rows = []
+
+    def sql(self, query, params=None):
+        if "EMBED_TEXT_768" in query:
+            return self.result([(local_embedding(params[1]),)])
+        if query.startswith("INSERT INTO"):
+            model, focus_area, embedding, response, snapshot_id = params
+            self.rows.append({"model": model, "focus_area": focus_area, "embedding": np.array(json.loads(embedding)),
+                              "response": response, "snapshot_id": snapshot_id, "created_at": time.time()})
+        if query.startswith("SELECT c.response"):
+            embedding, model, focus_area, max_age = np.array(json.loads(params[0])), params[1], params[2], -params[3]
+            matches = []
+            for row in self.rows:
+                age = time.time() - row["created_at"]
+                if row["model"] == model and row["focus_area"] == focus_area and age <= max_age:
+                    similarity = embedding @ row["embedding"] / (np.linalg.norm(embedding) * np.linalg.norm(row["embedding"]))
+                    matches.append((row["response"], similarity, int(age), row["snapshot_id"]))
+            return self.result(sorted(matches, key=lambda match: -match[1])[:1])
+        return self.result([])
+
+    @staticmethod
+    def result(rows):
+        return type("Query", (), {"collect": lambda _: rows, "collect_nowait": lambda _: rows})()
+
+
+def semantic_prompt(summary):
+    return "SOLUTION CONTEXT:\nHerd monitoring\n\nDATA SUMMARY:\n" + "\n".join(summary) + "\n\nANALYSIS INSTRUCTIONS:\nFocus on herd health"
+
+
+HERD_SUMMARY = [
+    "Records analyzed: 1000",
+    "- weight (avg: 412.00, min: 180.00, max: 690.00)",
+    "- feed_intake (avg: 20.50, min: 8.10, max: 31.70)",
+    "- health_risk (avg: 0.31, min: 0.02, max: 0.97)",
+    "- breed: Angus 420, Hereford 310, Jersey 270",
+    "- vaccination_status: Up-to-date 610, Overdue 250, Not vaccinated 140",
+]
+# One count moved by a record - about 0.99 similar to HERD_SUMMARY with the local embedding
+NEAR_HERD_SUMMARY = HERD_SUMMARY[:5] + ["- vaccination_status: Up-to-date 610, Overdue 250, Not vaccinated 141"]
+# Every figure moved - about 0.79 similar
+SHIFTED_HERD_SUMMARY = [
+    "Records analyzed: 1000",
+    "- weight (avg: 455.00, min: 201.00, max: 712.00)",
+    "- feed_intake (avg: 23.90, min: 9.40, max: 33.10)",
+    "- health_risk (avg: 0.44, min: 0.05, max: 0.99)",
+    "- breed: Angus 380, Hereford 350, Jersey 270",
+    "- vaccination_status: Up-to-date 540, Overdue 300, Not vaccinated 160",
+]
+
+
+@pytest.fixture
+def local_semantic_cache(monkeypatch):
+    monkeypatch.setattr(engine, "session", LocalVectorSession())
+    monkeypatch.setattr(engine, "SEMANTIC_CACHE_TABLE", "AGR_RECORDS_LLM_SEMANTIC_CACHE")
+    snapshot = ["v1"]
+    monkeypatch.setattr(engine, "current_data_snapshot", lambda: snapshot[0])
+    st.session_state.semantic_embeddings = engine.OrderedDict()
+    st.session_state.semantic_cache_threshold = engine.SEMANTIC_CACHE_THRESHOLD
+    st.session_state.semantic_cache_table_ready = None
+    st.session_state.last_semantic_hit = None
+    return snapshot
+
+
+def test_semantic_cache_reuses_the_answer_to_a_near_identical_prompt(local_semantic_cache):
+    engine.semantic_cache_put(semantic_prompt(HERD_SUMMARY), "mistral-7b", "Herd Health", "v1", "cached report")
+
+    response = engine.semantic_cache_get(semantic_prompt(NEAR_HERD_SUMMARY), "mistral-7b", "Herd Health")
+
+    hit = st.session_state.last_semantic_hit
+    assert response == "cached report"
+    assert engine.SEMANTIC_CACHE_THRESHOLD <= hit["similarity"] < 1.0
+    assert hit["same_snapshot"]
+    assert "on the current data snapshot" in engine.cache_hit_caption()
+
+
+def test_semantic_cache_misses_below_the_threshold_and_for_other_models(local_semantic_cache):
+    engine.semantic_cache_put(semantic_prompt(HERD_SUMMARY), "mistral-7b", "Herd Health", "v1", "cached report")
+
+    assert engine.semantic_cache_get(semantic_prompt(SHIFTED_HERD_SUMMARY), "mistral-7b", "Herd Health") is None
+    assert st.session_state.last_semantic_hit is None
+    assert engine.semantic_cache_get(semantic_prompt(HERD_SUMMARY), "llama3.1-8b", "Herd Health") is None
+    assert engine.semantic_cache_get(semantic_prompt(HERD_SUMMARY), "mistral-7b", "Feed Costs") is None
+
+    st.session_state.semantic_cache_threshold = 0.995
+    assert engine.semantic_cache_get(semantic_prompt(NEAR_HERD_SUMMARY), "mistral-7b", "Herd Health") is None
+
+
+def test_semantic_cache_flags_an_answer_from_an_earlier_snapshot(local_semantic_cache):
+    engine.semantic_cache_put(semantic_prompt(HERD_SUMMARY), "mistral-7b", "Herd Health", "v1", "cached report")
+    local_semantic_cache[0] = "v2"
+
+    response = engine.semantic_cache_get(semantic_prompt(HERD_SUMMARY), "mistral-7b", "Herd Health")
+
+    assert response == "cached report"
+    assert not st.session_state.last_semantic_hit["same_snapshot"]
+    assert "on an earlier data snapshot" in engine.cache_hit_caption()
+
+
+def test_semantic_cache_skips_answers_older_than_the_max_age(local_semantic_cache):
+    engine.semantic_cache_put(semantic_prompt(HERD_SUMMARY), "mistral-7b", "Herd Health", "v1", "cached report")
+    engine.session.rows[0]["created_at"] -= engine.SEMANTIC_CACHE_MAX_AGE_SECONDS + 1
+
+    assert engine.semantic_cache_get(semantic_prompt(HERD_SUMMARY), "mistral-7b", "Herd Health") is None
+
+
+def test_semantic_embedding_embeds_each_data_part_once(monkeypatch):
+    fake = FakeEmbedSession()
+    monkeypatch.setattr(engine, "session", fake)
+    st.session_state.semantic_embeddings = engine.OrderedDict()
+
+    first = engine.semantic_embedding(SEMANTIC_PROMPT)
+    second = engine.semantic_embedding(SEMANTIC_PROMPT.replace("herd health", "feed costs"))
+
+    assert first == second == "[0.5, 0.25]"
+    assert fake.embedded == ["Records analyzed: 1000\n- weight (avg: 412.00)"]
+
+
+# Chart data
+
+def test_lttb_keeps_endpoints_and_extremes():
+    x = np.arange(1000)
+    y = np.sin(x / 50.0)
+    y[500] = 10.0
+    data = pd.DataFrame({"x": x, "y": y}).sample(frac=1, random_state=1)
+
+    reduced = engine.lttb(data, "x", "y", threshold=100)
+
+    assert len(reduced) == 100
+    assert reduced["x"].iloc[0] == 0
+    assert reduced["x"].iloc[-1] == 999
+    assert reduced["x"].is_monotonic_increasing
+    assert 500 in set(reduced["x"])
+
+
+def test_lttb_returns_short_series_unchanged():
+    data = pd.DataFrame({"x": [3, 1, 2], "y": [1.0, 2.0, None]})
+
+    reduced = engine.lttb(data, "x", "y", threshold=10)
+
+    assert list(reduced["x"]) == [1, 3]
+
+
+def test_stratified_sample_keeps_every_stratum():
+    data = pd.DataFrame({"breed": ["common"] * 990 + ["rare"] * 10, "weight": np.arange(1000.0)})
+
+    sample = engine.stratified_sample(data, "breed", 100)
+
+    assert len(sample) == pytest.approx(100, abs=2)
+    assert set(sample["breed"]) == {"common", "rare"}
+    assert not sample.index.duplicated().any()
+
+
+def test_stratified_sample_small_frame_is_unchanged():
+    data = pd.DataFrame({"breed": ["a", "b"], "weight": [1.0, 2.0]})
+
+    assert engine.stratified_sample(data, "breed", 10) is data
+
+
+def large_frame(rows):
+    """Synthetic table at the scale where the downsampling limits apply"""
+    rng = np.random.default_rng(7)
+    return pd.DataFrame({
+        "breed": rng.choice(["Angus", "Hereford", "Jersey"], rows),
+        "weight": rng.normal(400, 60, rows),
+        "feed_intake": rng.normal(20, 4, rows),
+    })
+
+
+def test_sample_points_keeps_small_tables_whole():
+    data = large_frame(engine.SCATTER_POINT_LIMIT)
+
+    points, note = engine.sample_points(data, "breed")
+
+    assert len(points) == len(data)
+    assert note is None
+
+
+def test_sample_points_samples_a_large_table_by_stratum():
+    data = large_frame(engine.SCATTER_POINT_LIMIT + 1000)
+
+    points, note = engine.sample_points(data, "breed")
+
+    assert abs(len(points) - engine.SCATTER_POINT_LIMIT) <= 3
+    assert set(points["breed"]) == set(data["breed"])
+    assert note == f"🔬 Showing a {len(points):,}-point sample of {len(data):,} rows, stratified by breed"
+
+
+def test_scatter_rows_switches_from_sampled_points_to_density():
+    points, note = engine.scatter_rows(large_frame(engine.DENSITY_POINT_LIMIT), "breed")
+    assert len(points) <= engine.SCATTER_POINT_LIMIT + 3
+    assert note.startswith("🔬 Showing a ")
+
+    points, note = engine.scatter_rows(large_frame(engine.DENSITY_POINT_LIMIT + 1), "breed")
+    assert points is None
+    assert note == f"🔬 Showing point density for {engine.DENSITY_POINT_LIMIT + 1:,} rows"
+
+
+def density_counts(chart):
+    spec = chart.to_dict()
+    return spec["datasets"][spec["data"]["name"]]
+
+
+def test_density_chart_counts_every_row():
+    data = large_frame(engine.DENSITY_POINT_LIMIT + 1)
+
+    grid = density_counts(engine.density_chart(data, "weight", "feed_intake", "Weight", "Feed Intake"))
+
+    assert sum(row["count"] for row in grid) == len(data)
+    assert len(grid) <= engine.DENSITY_BINS ** 2
+
+
+def test_density_chart_skips_values_that_are_not_numbers():
+    data = pd.DataFrame({"weight": ["410", "n/a", "395.5", None], "feed_intake": [20.0, 21.0, "", 19.5]}, dtype=object)
+
+    grid = density_counts(engine.density_chart(data, "weight", "feed_intake", "Weight", "Feed Intake"))
+
+    assert sum(row["count"] for row in grid) == 1
+
+
+def test_lttb_downsamples_a_long_daily_trend():
+    dates = pd.date_range("2020-01-01", periods=engine.LINE_POINT_LIMIT * 4, freq="D")
+    trend = pd.DataFrame({"log_date": dates.astype(str), "downtime_hours": np.sin(np.arange(len(dates)) / 20)})
+
+    points = engine.lttb(trend, "log_date", "downtime_hours")
+
+    assert len(points) == engine.LINE_POINT_LIMIT
+    assert points["log_date"].iloc[0] == trend["log_date"].iloc[0]
+    assert points["log_date"].iloc[-1] == trend["log_date"].iloc[-1]
+
+
+def weight_histogram_charts(calls):
+    def create_charts(data):
+        calls.append(len(data))
+        return [("Weight Distribution", alt.Chart(engine.histogram_data(data, "weight", 10)).mark_bar().encode(x="bin_start:Q", y="count:Q"))]
+    return create_charts
+
+
+def test_metrics_chart_specs_builds_charts_once_per_snapshot(monkeypatch):
+    snapshot = ["v1"]
+    monkeypatch.setattr(engine, "current_data_snapshot", lambda: snapshot[0])
+    calls, data = [], large_frame(100)
+
+    first_notes, second_notes = {"Weight Distribution": "🔬 sampled"}, {}
+    first = engine.metrics_chart_specs(weight_histogram_charts(calls), data, first_notes)
+    second = engine.metrics_chart_specs(weight_histogram_charts(calls), data, second_notes)
+    snapshot[0] = "v2"
+    engine.metrics_chart_specs(weight_histogram_charts(calls), data, {})
+
+    assert calls == [100, 100]
+    assert list(first) == list(second) == ["Weight Distribution"]
+    assert second == first
+    assert second_notes == {"Weight Distribution": "🔬 sampled"}
+
+
+def test_metrics_chart_specs_fixed_titles_add_headroom(monkeypatch):
+    monkeypatch.setattr(engine, "current_data_snapshot", lambda: "v1")
+
+    spec = engine.metrics_chart_specs(weight_histogram_charts([]), large_frame(100), {}, fixed_titles=True)["Weight Distribution"]
+
+    assert spec["title"]["text"] == "Weight Distribution"
+    assert spec["title"]["offset"] == 14
+    assert spec["padding"]["top"] == 28
+    assert spec["config"]["title"]["anchor"] == "start"
+
+
+def test_boxplot_data_quartiles_and_tukey_whiskers():
+    data = pd.DataFrame({"group": ["a"] * 9, "value": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 100.0]})
+
+    stats, outliers = engine.boxplot_data(data, "group", "value")
+    stats = stats.set_index("group")
+
+    assert stats.loc["a", "q1"] == 3.0
+    assert stats.loc["a", "median"] == 5.0
+    assert stats.loc["a", "q3"] == 7.0
+    assert stats.loc["a", "lower"] == 1.0
+    assert stats.loc["a", "upper"] == 8.0
+    assert outliers.to_dict("records") == [{"group": "a", "value": 100.0}]
+
+
+def test_boxplot_chart_draws_outliers_as_their_own_layer():
+    data = pd.DataFrame({"group": ["a"] * 9, "value": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 100.0]})
+
+    spec = engine.boxplot_chart(*engine.boxplot_data(data, "group", "value"), "group", "Group", "Value").to_dict()
+
+    marks = [layer["mark"]["type"] for layer in spec["layer"]]
+    assert marks == ["rule", "bar", "tick", "point"]
+    assert [row["value"] for row in spec["datasets"][spec["layer"][3]["data"]["name"]]] == [100.0]
+
+
+def test_histogram_data_counts_every_value():
+    data = pd.DataFrame({"weight": [1.0, 2.0, 2.5, 3.0, None]})
+
+    bins = engine.histogram_data(data, "weight", 2)
+
+    assert bins["count"].sum() == 4
+    assert list(bins["bin_start"]) == [1.0, 2.0]
+    assert list(bins["bin_mid"]) == [1.5, 2.5]
+
+
+def test_histogram_data_skips_values_that_are_not_numbers():
+    data = pd.DataFrame({"weight": ["1.0", "2", "n/a", "3.0", ""]}, dtype=object)
+
+    bins = engine.histogram_data(data, "weight", 2)
+
+    assert bins["count"].sum() == 3
+    assert list(bins["bin_start"]) == [1.0, 2.0]
+
+
+def test_histogram_data_empty_column():
+    bins = engine.histogram_data(pd.DataFrame({"weight": [None, None]}), "weight", 10)
+
+    assert bins.empty
+    assert list(bins.columns) == ["bin_start", "bin_end", "bin_mid", "count"]
+
+
+# Insights history
+
+def test_build_history_keyset_clause_seeks_before_cursor():
+    assert engine.build_history_keyset_clause(None) == ("", [])
+
+    clause, params = engine.build_history_keyset_clause((1700000000000000000, 42))
+
+    assert clause == ("(created_at < TO_TIMESTAMP_LTZ(?, 9) OR (created_at = TO_TIMESTAMP_LTZ(?, 9) "
+                      "AND HASH(focus, model, insights) < ?))")
+    assert params == [1700000000000000000, 1700000000000000000, 42]
+
+
+# Session warm-up
+
+def test_session_warmup_queries_match_the_probe_and_watermark(monkeypatch):
+    monkeypatch.setattr(engine, "table_name", "AGR_RECORDS")
+    columns = {"record_id", "last_updated_epoch", "_fivetran_synced"}
+
+    queries = engine.session_warmup_queries(columns)
+
+    assert queries == [
+        "SELECT * FROM AGR_RECORDS LIMIT 1000",
+        "SELECT DATE_PART(epoch_millisecond, MAX(_fivetran_synced))::FLOAT, COUNT(*) FROM AGR_RECORDS",
+        "SELECT MAX(last_updated_epoch)::FLOAT FROM AGR_RECORDS",
+    ]
+
+
+def test_session_warmup_queries_skip_the_watermark_without_its_column(monkeypatch):
+    monkeypatch.setattr(engine, "table_name", "AGR_RECORDS")
+
+    queries = engine.session_warmup_queries({"record_id"})
+
+    assert queries == ["SELECT * FROM AGR_RECORDS LIMIT 1000", "SELECT 0::FLOAT, COUNT(*) FROM AGR_RECORDS"]
+
+
+class FakePoolSession:
+    """Records the queries a pooled session runs; its table schema has a watermark column"""
+
+    opened = []
+
+    def __init__(self):
+        self.queries = []
+        FakePoolSession.opened.append(self)
+
+    def table(self, name):
+        field = type("Field", (), {"name": '"LAST_UPDATED_EPOCH"'})()
+        return type("Table", (), {"schema": type("Schema", (), {"fields": [field]})()})()
+
+    def sql(self, query):
+        self.queries.append(query)
+        return type("Query", (), {"collect": lambda _: []})()
+
+
+@pytest.fixture
+def fake_snowpark(monkeypatch):
+    builder = type("Builder", (), {"configs": lambda self, config: self, "create": lambda self: FakePoolSession()})()
+    snowpark = type(sys)("snowflake.snowpark")
+    snowpark.Session = type("Session", (), {"builder": builder})
+    monkeypatch.setitem(sys.modules, "snowflake.snowpark", snowpark)
+    monkeypatch.setattr(st, "secrets", {"connections": {"snowflake": {}}})
+    FakePoolSession.opened = []
+    engine.open_session_pool.clear()
+    yield
+    engine.open_session_pool.clear()
+
+
+def test_open_session_pool_is_cached_per_table_and_size(monkeypatch, fake_snowpark):
+    monkeypatch.setattr(engine, "table_name", "AGR_RECORDS")
+    agr = engine.open_session_pool("AGR_RECORDS", 3)
+    assert engine.open_session_pool("AGR_RECORDS", 3) is agr
+
+    monkeypatch.setattr(engine, "table_name", "HED_RECORDS")
+    hed = engine.open_session_pool("HED_RECORDS", 3)
+
+    assert hed is not agr
+    assert len(agr["sessions"]) == len(hed["sessions"]) == 3
+    assert len(FakePoolSession.opened) == 6
+    assert [session.queries for session in agr["sessions"]] == [
+        ["SELECT * FROM AGR_RECORDS LIMIT 1000"],
+        ["SELECT MAX(last_updated_epoch)::FLOAT, COUNT(*) FROM AGR_RECORDS"],
+        ["SELECT MAX(last_updated_epoch)::FLOAT FROM AGR_RECORDS"],
+    ]
+    assert all("HED_RECORDS" in query for pooled in hed["sessions"] for query in pooled.queries)
+    assert len(engine.open_session_pool("HED_RECORDS", 2)["sessions"]) == 2
+